@@ -7,7 +7,6 @@ import time
 from typing import Any
 
 exectime_internal: float = 0.0
-exectime_external: float = 0.0
 time_start: float = time.time()
 
 ON_LINUX: bool = platform.system() == "Linux"
@@ -24,8 +23,28 @@ DEFAULT_CONFIG: dict[str, Any] = {
     "commit_begin": "",  # Start of commit range (empty = include all commits).
     "commit_end": "HEAD",  # End of commit range (default: HEAD).
     "linear_linestats": 1,  # Enable linear history for line statistics (1 = enabled, 0 = disabled).
+    "incremental_filecounts": 1,  # File counts over time from one tree-diff walk (1) or per-commit ls-tree (0).
+    "snapshot": 1,  # Save the refined statistics to gitstats.snapshot for re-rendering with --from-snapshot (1) or not (0).
+    "incremental_collection": 1,  # Fold only commits added since the last run into the cached statistics (1) or re-walk the whole history (0).
+    "cache_backend": "sqlite",  # Storage of gitstats.cache: indexed SQLite file ("sqlite") or one JSON document ("json").
+    "object_reader": "cli",  # Read blobs and trees via the git CLI ("cli") or in-process from packfiles ("python").
+    "shared_cache": 0,  # Share blob line counts between all repositories and output directories on the machine (1) or not (0).
+    "shared_cache_dir": "",  # Directory of the shared cache (default: $XDG_CACHE_HOME/gitstats, i.e. ~/.cache/gitstats).
+    "shared_cache_max_entries": 5000000,  # Blob line counts kept in the shared cache; the least recently used are evicted.
+    "churn_counters": 0,  # Estimate the churn of the most changed files in this many counters (Space-Saving) instead of counting every file (0 = exact).
     "project_name": "",  # Project name to display (default: repository directory name).
     "processes": 8,  # Number of parallel processes to use when gathering data.
+    "render_processes": 0,  # Number of processes rendering report pages concurrently (0 = one per CPU, 1 = sequential).
+    "incremental_pages": 1,  # Leave report pages and assets whose inputs did not change since the last run untouched (1) or rewrite them all (0).
+    "shared_assets": "",  # Multi-repo runs: copy the static assets into every report (empty), hard-link them to the root's copies ("link") or load them from the root ("reference").
+    "jobs": 1,  # Multi-repo runs: number of repositories analyzed at once, each in its own process.
+    "repo_timeout": 0,  # Multi-repo runs: seconds after which a repository's analysis is stopped and reported as failed (0 = no limit).
+    "inline_chart_data_max": 16384,  # Chart data up to this many bytes is inlined in the page; larger data goes to data/*.js files (-1 = always inline).
+    "chart_max_points": 500,  # Line charts are downsampled to at most this many points, keeping peaks and dips (0 = all points).
+    "table_page_size": 500,  # Tables with more rows (tags, Author of Month/Year, other authors) are shipped as JSON and shown this many rows per page, building only the rows in view (0 = plain HTML tables).
+    "minify_html": 0,  # Strip comments and collapse whitespace in the generated HTML pages (1) or not (0).
+    "precompress": 0,  # Write .gz (and .br, with the brotli module) copies of the pages, scripts and stylesheets for static servers (1) or not (0).
+    "profile": 0,  # Time every git command and phase, writing profile.json and a Run diagnostics page into the report (1) or not (0); also --profile.
     "start_date": "",  # Starting date for commits, passed as --since to Git (optional).
     "end_date": "",  # Ending date for commits, passed as --until to Git (optional). Format: YYYY-MM-DD.
     "authors": "",  # Comma-separated list of authors to filter commits (empty = include all authors).
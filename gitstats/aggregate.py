@@ -16,11 +16,16 @@ import json
 import logging
 import os
 import re
-import shutil
 from typing import Any
 
 from gitstats import load_config
-from gitstats.report_creator import _classify_eras
+from gitstats.report_creator import (
+    _classify_eras,
+    _copy_assets,
+    _load_manifest,
+    _save_manifest,
+    report_assets,
+)
 from gitstats.utils import format_int, get_version
 
 logger = logging.getLogger("gitstats")
@@ -191,23 +196,23 @@ class AggregateReportCreator:
         """Copy the shared static assets into the output root.
 
         Asset names are hard-coded; each destination is resolved and checked
-        to stay under the output root before writing.
+        to stay under the output root before writing. Assets unchanged since
+        the last run are left untouched. With ``shared_assets`` the root also
+        holds the assets of the repository reports, which use them from there.
         """
-        basedir = os.path.dirname(os.path.abspath(__file__))
-        base = os.path.abspath(path)
-        for file in (
-            load_config()["style"],
-            "sortable.js",
-            "arrow-up.gif",
-            "arrow-down.gif",
-            "arrow-none.gif",
-        ):
-            src = os.path.join(basedir, file)
-            target = os.path.abspath(os.path.join(base, os.path.basename(file)))
-            if os.path.commonpath([base, target]) != base:
-                raise ValueError(f"Refusing to write outside report directory: {file}")
-            if os.path.exists(src):
-                shutil.copyfile(src, target)
+        manifest = _load_manifest(path)
+        if load_config()["shared_assets"]:
+            files = report_assets()
+        else:
+            files = (
+                load_config()["style"],
+                "sortable.js",
+                "arrow-up.gif",
+                "arrow-down.gif",
+                "arrow-none.gif",
+            )
+        assets = _copy_assets(path, files, manifest.get("assets", {}))
+        _save_manifest(path, {"assets": assets})
 
     @staticmethod
     def _open_portfolio_file(path: str) -> Any:
@@ -0,0 +1,392 @@
+"""
+Persistent cache backends for GitStats.
+
+The collector's cache maps a table name (``files_in_tree``,
+``lines_in_blob``, ``history``) to a table of JSON values by string key.
+:class:`SQLiteCache` keeps the tables in an indexed SQLite file that is
+opened lazily and queried per key, with writes batched into transactions.
+:class:`JsonCache` is the original single JSON document, read and written
+as a whole. A JSON cache is migrated once when opened with the SQLite
+backend.
+
+:class:`SharedBlobCache` holds blob line counts for all repositories and
+output directories on the machine, under :func:`default_shared_cache_dir`.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import ItemsView, Iterator, Mapping, MutableMapping
+from typing import Any
+
+logger = logging.getLogger("gitstats")
+
+CACHE_BACKENDS = ("sqlite", "json")
+
+_SQLITE_MAGIC = b"SQLite format 3\0"
+_BATCH_SIZE = 10000
+_MISSING = object()
+# blob ids per query; stays below SQLite's limit on bound parameters
+_QUERY_CHUNK = 500
+# how stale a shared entry's last use may get before a lookup refreshes it
+_TOUCH_INTERVAL = 24 * 60 * 60
+
+
+def default_shared_cache_dir() -> str:
+    """``$XDG_CACHE_HOME/gitstats``, or ``~/.cache/gitstats`` when it is not set."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "gitstats")
+
+
+def open_cache(path: str, backend: str = "sqlite") -> "JsonCache | SQLiteCache":
+    """Open the cache file at ``path`` with ``backend`` (see :data:`CACHE_BACKENDS`)."""
+    if backend == "json":
+        return JsonCache(path)
+    if backend != "sqlite":
+        raise ValueError(f"Unknown cache backend '{backend}'")
+    if os.path.exists(path) and not _is_sqlite(path):
+        _migrate_json(path)
+    return SQLiteCache(path)
+
+
+def _is_sqlite(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(len(_SQLITE_MAGIC)) == _SQLITE_MAGIC
+
+
+def _migrate_json(path: str) -> None:
+    """Replace the JSON cache at ``path`` with an SQLite cache holding the same tables."""
+    legacy = JsonCache(path)
+    logger.info("Migrating cache to SQLite...")
+    tempfile = path + ".tmp"
+    if os.path.exists(tempfile):
+        os.remove(tempfile)
+    cache = SQLiteCache(tempfile)
+    try:
+        for name, table in legacy.items():
+            if isinstance(table, dict):
+                cache[name] = table
+        cache.commit()
+    finally:
+        cache.close()
+    os.replace(tempfile, path)
+
+
+class JsonCache(dict):
+    """The whole cache as one JSON document, loaded on open and rewritten on commit."""
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except ValueError:
+            # Corrupted or legacy pickle cache - start fresh
+            logger.warning("Warning: cache is corrupted, starting fresh")
+            return
+        if isinstance(data, dict):
+            self.update(data)
+
+    def commit(self) -> None:
+        tempfile = self.path + ".tmp"
+        with open(tempfile, "w", encoding="utf-8") as f:
+            json.dump(self, f)
+        os.replace(tempfile, self.path)
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteCache(MutableMapping):
+    """Cache tables stored as rows of an SQLite file, read and written per key.
+
+    The file is opened on first use. Writes are buffered and flushed in
+    batches, each batch in one transaction, so a crash loses at most the
+    unflushed entries and never leaves a partial batch behind. Replacing a
+    whole table (``cache[name] = {...}``) is a single transaction as well.
+    Safe to share between threads.
+    """
+
+    def __init__(self, path: str, batch_size: int = _BATCH_SIZE) -> None:
+        self.path = path
+        self._batch_size = batch_size
+        self._conn: sqlite3.Connection | None = None
+        self._pending: dict[str, dict[str, str]] = {}
+        self._pending_count = 0
+        self._lock = threading.RLock()
+
+    def __repr__(self) -> str:
+        return f"SQLiteCache({self.path!r})"
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "name TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                    "PRIMARY KEY (name, key)) WITHOUT ROWID"
+                )
+        return self._conn
+
+    # ── tables ───────────────────────────────────────────────────────────
+
+    def __getitem__(self, name: str) -> "_Table":
+        if name not in self:
+            raise KeyError(name)
+        return _Table(self, name)
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        with self._lock:
+            if self._pending.get(name):
+                return True
+            row = (
+                self._connection()
+                .execute("SELECT 1 FROM entries WHERE name = ? LIMIT 1", (name,))
+                .fetchone()
+            )
+            return row is not None
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            self._flush()
+            rows = self._connection().execute("SELECT DISTINCT name FROM entries").fetchall()
+        return iter([name for (name,) in rows])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setitem__(self, name: str, table: Mapping[str, Any]) -> None:
+        rows = [(name, key, json.dumps(value)) for key, value in table.items()]
+        with self._lock:
+            self._pending_count -= len(self._pending.pop(name, {}))
+            with self._connection() as conn:
+                conn.execute("DELETE FROM entries WHERE name = ?", (name,))
+                conn.executemany("INSERT INTO entries VALUES (?, ?, ?)", rows)
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self:
+            raise KeyError(name)
+        self[name] = {}
+
+    def setdefault(self, name: str, default: Mapping[str, Any] | None = None) -> "_Table":
+        """Return table ``name``, filled with ``default`` if it is empty."""
+        if default and name not in self:
+            self[name] = default
+        return _Table(self, name)
+
+    # ── entries ──────────────────────────────────────────────────────────
+
+    def _get(self, name: str, key: str) -> Any:
+        with self._lock:
+            value = self._pending.get(name, {}).get(key)
+            if value is None:
+                row = (
+                    self._connection()
+                    .execute("SELECT value FROM entries WHERE name = ? AND key = ?", (name, key))
+                    .fetchone()
+                )
+                if row is None:
+                    return _MISSING
+                value = row[0]
+        return json.loads(value)
+
+    def _set(self, name: str, key: str, value: Any) -> None:
+        with self._lock:
+            pending = self._pending.setdefault(name, {})
+            if key not in pending:
+                self._pending_count += 1
+            pending[key] = json.dumps(value)
+            if self._pending_count >= self._batch_size:
+                self._flush()
+
+    def _delete(self, name: str, key: str) -> None:
+        with self._lock:
+            self._flush()
+            with self._connection() as conn:
+                deleted = conn.execute(
+                    "DELETE FROM entries WHERE name = ? AND key = ?", (name, key)
+                ).rowcount
+        if not deleted:
+            raise KeyError(key)
+
+    def _rows(self, name: str) -> list[tuple[str, str]]:
+        with self._lock:
+            self._flush()
+            return (
+                self._connection()
+                .execute("SELECT key, value FROM entries WHERE name = ?", (name,))
+                .fetchall()
+            )
+
+    def _count(self, name: str) -> int:
+        with self._lock:
+            self._flush()
+            return (
+                self._connection()
+                .execute("SELECT COUNT(*) FROM entries WHERE name = ?", (name,))
+                .fetchone()[0]
+            )
+
+    def _flush(self) -> None:
+        """Write all buffered entries in one transaction."""
+        if not self._pending_count:
+            return
+        rows = [
+            (name, key, value)
+            for name, entries in self._pending.items()
+            for key, value in entries.items()
+        ]
+        with self._connection() as conn:
+            conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", rows)
+        self._pending.clear()
+        self._pending_count = 0
+
+    def commit(self) -> None:
+        """Write everything still buffered, creating the file if needed."""
+        with self._lock:
+            self._connection()
+            self._flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class _Table(MutableMapping):
+    """One table of an :class:`SQLiteCache`; entries are looked up one query each."""
+
+    def __init__(self, cache: SQLiteCache, name: str) -> None:
+        self._cache = cache
+        self._name = name
+
+    def __repr__(self) -> str:
+        return f"<cache table {self._name!r} of {self._cache!r}>"
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._cache._get(self._name, key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._cache._get(self._name, key) is not _MISSING
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._cache._set(self._name, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self._cache._delete(self._name, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([key for key, _ in self._cache._rows(self._name)])
+
+    def __len__(self) -> int:
+        return self._cache._count(self._name)
+
+    def items(self) -> ItemsView[str, Any]:
+        """All entries, read in one query."""
+        return {key: json.loads(value) for key, value in self._cache._rows(self._name)}.items()
+
+
+class SharedBlobCache:
+    """Line counts of blobs, shared by every repository and output directory.
+
+    Entries are keyed by blob id and the version of the line counting rules,
+    so counts made under other rules are never reused; they age out instead.
+    Several processes may read and write at once (SQLite in WAL mode with a
+    busy timeout). Once more than ``max_entries`` counts are stored, the
+    least recently used ones are evicted. Errors are logged and treated as
+    cache misses, since the cache is only an optimization.
+    """
+
+    def __init__(self, path: str, rule: int, max_entries: int) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._rule = rule
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS blob_lines ("
+                "blob TEXT NOT NULL, rule INTEGER NOT NULL, lines INTEGER NOT NULL, "
+                "used INTEGER NOT NULL, PRIMARY KEY (blob, rule)) WITHOUT ROWID"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS blob_lines_used ON blob_lines (used)")
+
+    def __repr__(self) -> str:
+        return f"SharedBlobCache({self.path!r})"
+
+    def get_many(self, blob_ids: list[str]) -> dict[str, int]:
+        """Line counts of the known ``blob_ids``, which count as used now."""
+        found: dict[str, int] = {}
+        stale: list[str] = []
+        now = int(time.time())
+        try:
+            with self._lock:
+                for start in range(0, len(blob_ids), _QUERY_CHUNK):
+                    chunk = blob_ids[start : start + _QUERY_CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        "SELECT blob, lines, used FROM blob_lines "
+                        f"WHERE rule = ? AND blob IN ({marks})",
+                        (self._rule, *chunk),
+                    )
+                    for blob, lines, used in rows:
+                        found[blob] = lines
+                        if used < now - _TOUCH_INTERVAL:
+                            stale.append(blob)
+                # only refresh entries not used for a while, so that lookups
+                # rarely need the write lock
+                if stale:
+                    with self._conn:
+                        self._conn.executemany(
+                            "UPDATE blob_lines SET used = ? WHERE blob = ? AND rule = ?",
+                            ((now, blob, self._rule) for blob in stale),
+                        )
+        except sqlite3.Error as e:
+            logger.warning(f"Shared blob cache lookup failed ({e})")
+        return found
+
+    def put_many(self, counts: dict[str, int]) -> None:
+        """Store line counts by blob id, evicting the least recently used beyond the cap."""
+        if not counts:
+            return
+        now = int(time.time())
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO blob_lines VALUES (?, ?, ?, ?)",
+                    ((blob, self._rule, lines, now) for blob, lines in counts.items()),
+                )
+                excess = (
+                    self._conn.execute("SELECT COUNT(*) FROM blob_lines").fetchone()[0]
+                    - self._max_entries
+                )
+                if excess > 0:
+                    self._conn.execute(
+                        "DELETE FROM blob_lines WHERE (blob, rule) IN "
+                        "(SELECT blob, rule FROM blob_lines ORDER BY used LIMIT ?)",
+                        (excess,),
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"Shared blob cache update failed ({e})")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
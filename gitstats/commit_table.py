@@ -0,0 +1,200 @@
+"""
+Columnar per-commit table for GitStats.
+
+The history walk appends one row per commit to a :class:`CommitTable`:
+``array``-backed columns of timestamps, local calendar days and hours,
+interned author, domain and timezone ids and diff sizes, a few dozen bytes
+per commit instead of the dicts and tuples each commit used to leave behind.
+The collection phases then aggregate whole columns with the helpers below.
+They use NumPy when it is installed (``pip install gitstats[fast]``) and
+plain Python otherwise; both give the same results, in the same order.
+"""
+
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import Any, cast
+
+from gitstats.timebuckets import local_day
+
+try:
+    import numpy as np  # type: ignore[import-not-found]
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+# row flags
+MERGE = 1
+MAINLINE = 2  # on the first-parent chain (only tracked with linear_linestats)
+
+
+class CommitTable:
+    """Per-commit columns of the walked history, in walk order (newest first)."""
+
+    def __init__(self) -> None:
+        self.stamps = array("q")
+        self.days = array("i")  # local proleptic Gregorian ordinal, see date.toordinal()
+        self.hours = array("b")  # local hour
+        self.authors = array("i")  # index into author_names
+        self.domains = array("i")  # index into domain_names
+        self.timezones = array("i")  # index into timezone_names
+        self.files = array("i")
+        self.inserted = array("q")
+        self.deleted = array("q")
+        self.flags = array("B")
+        # interned values, in order of first appearance
+        self.author_names: list[str] = []
+        self.domain_names: list[str] = []
+        self.timezone_names: list[str] = []
+        self._author_ids: dict[str, int] = {}
+        self._domain_ids: dict[str, int] = {}
+        self._timezone_ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.stamps)
+
+    def append(
+        self,
+        stamp: int,
+        author: str,
+        domain: str,
+        timezone: str,
+        files: int,
+        inserted: int,
+        deleted: int,
+        flags: int = 0,
+    ) -> None:
+        day, hour = local_day(stamp)
+        self.stamps.append(stamp)
+        self.days.append(day)
+        self.hours.append(hour)
+        self.authors.append(_intern(author, self.author_names, self._author_ids))
+        self.domains.append(_intern(domain, self.domain_names, self._domain_ids))
+        self.timezones.append(_intern(timezone, self.timezone_names, self._timezone_ids))
+        self.files.append(files)
+        self.inserted.append(inserted)
+        self.deleted.append(deleted)
+        self.flags.append(flags)
+
+    def rows(self, flag: int = 0, oldest_first: bool = False) -> list[int]:
+        """Indexes of the rows carrying ``flag`` (all rows for 0)."""
+        indexes: Iterable[int] = range(len(self.stamps))
+        if oldest_first:
+            indexes = range(len(self.stamps) - 1, -1, -1)
+        if not flag:
+            return list(indexes)
+        flags = self.flags
+        return [i for i in indexes if flags[i] & flag]
+
+
+def _intern(value: str, values: list[str], ids: dict[str, int]) -> int:
+    index = ids.get(value)
+    if index is None:
+        index = ids[value] = len(values)
+        values.append(value)
+    return index
+
+
+def _as_numpy(values: Sequence[int]) -> Any:
+    if isinstance(values, array):
+        return np.frombuffer(values, dtype=values.typecode) if len(values) else np.zeros(0, "q")
+    return np.asarray(values, dtype="q")
+
+
+def take(values: Sequence[int], rows: list[int]) -> list[int]:
+    """The ``rows`` of a column, in that order."""
+    if np is not None:
+        return _as_numpy(values)[np.asarray(rows, dtype="q")].tolist()
+    return [values[i] for i in rows]
+
+
+def pair_keys(major: Sequence[int], minor: Sequence[int], minor_count: int) -> Sequence[int]:
+    """Combine two id columns into one, ``major * minor_count + minor``, for grouping."""
+    if np is not None:
+        return _as_numpy(major).astype("q") * minor_count + _as_numpy(minor)
+    return [a * minor_count + b for a, b in zip(major, minor)]
+
+
+def recode(values: Sequence[int], mapping: dict[int, int]) -> Sequence[int]:
+    """Map every value of a column through ``mapping``, e.g. days to months."""
+    if np is not None:
+        unique, inverse = np.unique(_as_numpy(values), return_inverse=True)
+        codes = np.asarray([mapping[value] for value in unique.tolist()], dtype="q")
+        # an ndarray, which reads like the sequence the other columns are
+        return cast(Sequence[int], codes[inverse])
+    return [mapping[value] for value in values]
+
+
+def group_counts(keys: Sequence[int]) -> dict[int, int]:
+    """Number of rows per key, keys in order of first appearance."""
+    return group_sums(keys, None)
+
+
+def group_sums(keys: Sequence[int], values: Sequence[int] | None) -> dict[int, int]:
+    """Sum of ``values`` (or number of rows) per key, keys in order of first appearance."""
+    if np is not None:
+        keys_np = _as_numpy(keys)
+        unique, first, inverse = np.unique(keys_np, return_index=True, return_inverse=True)
+        if values is None:
+            totals = np.bincount(inverse, minlength=len(unique))
+        else:
+            totals = np.bincount(inverse, weights=_as_numpy(values), minlength=len(unique)).astype(
+                "q"
+            )
+        order = np.argsort(first, kind="stable")
+        return dict(zip(unique[order].tolist(), totals[order].tolist()))
+    result: dict[int, int] = {}
+    if values is None:
+        for key in keys:
+            result[key] = result.get(key, 0) + 1
+    else:
+        for key, value in zip(keys, values):
+            result[key] = result.get(key, 0) + value
+    return result
+
+
+def group_extremes(
+    keys: Sequence[int], values: Sequence[int], groups: int
+) -> tuple[list[int | None], list[int | None], list[int | None]]:
+    """Minimum, maximum and last of ``values`` per key ``0 .. groups - 1``.
+
+    Groups without rows get None.
+    """
+    if np is not None:
+        keys_np = _as_numpy(keys)
+        values_np = _as_numpy(values).astype("q")
+        present = np.bincount(keys_np, minlength=groups) > 0
+        lowest = np.full(groups, np.iinfo("q").max, dtype="q")
+        highest = np.full(groups, np.iinfo("q").min, dtype="q")
+        last = np.full(groups, -1, dtype="q")
+        np.minimum.at(lowest, keys_np, values_np)
+        np.maximum.at(highest, keys_np, values_np)
+        np.maximum.at(last, keys_np, np.arange(len(keys_np), dtype="q"))
+        return (
+            [int(v) if p else None for v, p in zip(lowest, present)],
+            [int(v) if p else None for v, p in zip(highest, present)],
+            [int(values_np[i]) if p else None for i, p in zip(last, present)],
+        )
+    lows: list[int | None] = [None] * groups
+    highs: list[int | None] = [None] * groups
+    lasts: list[int | None] = [None] * groups
+    for key, value in zip(keys, values):
+        low = lows[key]
+        if low is None or value < low:
+            lows[key] = value
+        high = highs[key]
+        if high is None or value > high:
+            highs[key] = value
+        lasts[key] = value
+    return lows, highs, lasts
+
+
+def running_totals(added: Sequence[int], removed: Sequence[int], start: int = 0) -> list[int]:
+    """``start`` plus the cumulative sums of ``added`` minus ``removed``."""
+    if np is not None:
+        changes = _as_numpy(added) - _as_numpy(removed)
+        return (np.cumsum(changes, dtype="q") + start).tolist()
+    totals = []
+    total = start
+    for plus, minus in zip(added, removed):
+        total += plus - minus
+        totals.append(total)
+    return totals
@@ -0,0 +1,62 @@
+"""
+Shape-preserving downsampling of chart series for GitStats.
+
+Line charts plot one point per commit or per day, far more than a chart is
+wide on a long history. :func:`lttb_indices` picks the points to keep with
+Largest-Triangle-Three-Buckets: the series is cut into equal buckets and each
+bucket keeps the point spanning the largest triangle with the point kept
+before it and the average of the next bucket, so peaks and dips survive
+where picking every n-th point would step over them. Several series sharing
+their x axis are sampled at the same indices, choosing by the sum of their
+triangles.
+"""
+
+from collections.abc import Sequence
+
+
+def lttb_indices(series: Sequence[Sequence[float]], threshold: int) -> list[int]:
+    """Indices of at most ``threshold`` points to keep from equally long ``series``.
+
+    The first and last points are always kept. Returns every index when the
+    series are no longer than ``threshold`` or ``threshold`` is 0.
+    """
+    n = len(series[0]) if series else 0
+    if threshold <= 0 or n <= threshold:
+        return list(range(n))
+    if threshold < 3:
+        return [0, n - 1][:threshold]
+
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * every) + 1
+        end = int((bucket + 1) * every) + 1
+        next_end = min(int((bucket + 2) * every) + 1, n)
+        # x is the point's index: the charts space their labels evenly
+        avg_x = (end + next_end - 1) / 2
+        dx = a - avg_x
+        # per series: (value at a, average of the next bucket - value at a)
+        anchors = [(s[a], sum(s[end:next_end]) / (next_end - end) - s[a]) for s in series]
+        best = start
+        best_area = -1.0
+        for j in range(start, end):
+            dj = a - j
+            area = 0.0
+            for s, (ay, dy) in zip(series, anchors):
+                area += abs(dx * (s[j] - ay) - dj * dy)
+            if area > best_area:
+                best_area = area
+                best = j
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def downsample(
+    labels: Sequence[str], series: Sequence[Sequence[float]], threshold: int
+) -> tuple[list[str], list[list[float]]]:
+    """``labels`` and ``series`` reduced to the points :func:`lttb_indices` keeps."""
+    indices = lttb_indices(series, threshold)
+    return [labels[i] for i in indices], [[s[i] for i in indices] for s in series]
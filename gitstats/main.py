@@ -4,16 +4,29 @@
 # GPLv2 / GPLv3
 import argparse
 import datetime
+import gzip
 import json
 import logging
+import multiprocessing
+import multiprocessing.connection
+import multiprocessing.pool
 import os
 import re
+import shutil
+import signal
 import sys
+import tempfile
 import time
+from collections import deque
+from collections.abc import Iterator, Mapping, MutableMapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import partial
 from multiprocessing import Pool
+from multiprocessing.connection import Connection
 from typing import Any
 
-from gitstats import exectime_external, load_config, time_start
+from gitstats import load_config, profiling, time_start
 from gitstats.aggregate import (
     AggregateReportCreator,
     _slugify_repo,
@@ -21,15 +34,42 @@ from gitstats.aggregate import (
     write_repo_summary,
 )
 from gitstats.ai_summarizer import AISummarizer
+from gitstats.cache import JsonCache, SharedBlobCache, SQLiteCache, open_cache
+from gitstats.commit_table import (
+    MAINLINE,
+    MERGE,
+    CommitTable,
+    group_counts,
+    group_extremes,
+    group_sums,
+    pair_keys,
+    recode,
+    running_totals,
+    take,
+)
+from gitstats.path_table import PathCounts, PathTable
+from gitstats.publish import publish
 from gitstats.report_creator import HTMLReportCreator, get_keys_sorted_by_value_key
+from gitstats.schedule import (
+    RepoSchedule,
+    estimate_repo,
+    load_portfolio_summary,
+    write_portfolio_summary,
+)
+from gitstats.timebuckets import date_label, day_keys, stamp_keys
+from gitstats.topk import SpaceSaving, top_k
 from gitstats.utils import (
+    LINE_COUNT_VERSION,
     get_commit_range,
     get_log_range,
     get_num_of_files_from_rev,
-    get_num_of_lines_in_blob,
+    get_num_of_lines_in_blobs,
+    get_object_store,
     get_pipe_output,
-    get_stat_summary_counts,
+    get_shared_blob_cache,
     get_version,
+    iter_pipe_lines,
+    shared_blob_cache_for_run,
     should_exclude_file,
 )
 
@@ -55,21 +95,58 @@ def configure_logging(verbose: bool = False, quiet: bool = False) -> None:
     )
 
 
-def parallel_map_with_fallback(func, items):
+@contextmanager
+def worker_pool() -> Iterator[multiprocessing.pool.Pool | None]:
+    """A pool of ``processes`` forked workers for :func:`parallel_map_with_fallback`.
+
+    Create it before starting any threads: a process forked while another
+    thread holds a lock (a pipe reader, a cache, logging) inherits the lock
+    held, with no thread left to release it. Yields None where processes
+    cannot be forked.
+    """
+    pool = None
+    if "fork" in multiprocessing.get_all_start_methods():
+        try:
+            pool = multiprocessing.get_context("fork").Pool(processes=conf["processes"])
+        except OSError as e:
+            logger.warning(
+                f"Multiprocessing not available ({e}), falling back to sequential processing"
+            )
+    try:
+        yield pool
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+def parallel_map_with_fallback(func, items, pool: multiprocessing.pool.Pool | None = None):
     """Apply a function to items using multiprocessing, with sequential fallback.
 
     Args:
         func: Function to apply to each item
         items: Iterable of items to process
+        pool: Workers of :func:`worker_pool` to run on; by default a pool
+            is created for this call, which must then not run on a thread
 
     Returns:
         List of results from applying func to each item
     """
     try:
-        pool = Pool(processes=conf["processes"])
-        results = pool.map(func, items)
-        pool.terminate()
-        pool.join()
+        own_pool = pool is None
+        if pool is None:
+            pool = Pool(processes=conf["processes"])
+        # workers send their command timings back with each result
+        outcomes = pool.map(
+            partial(profiling.run_in_worker, func, profiling.current_phase()), items
+        )
+        if own_pool:
+            pool.terminate()
+            pool.join()
+        results = []
+        for result, records in outcomes:
+            profiling.merge_worker_records(records)
+            results.append(result)
         return results
     except OSError as e:
         # Fallback to sequential processing if multiprocessing fails
@@ -80,6 +157,55 @@ def parallel_map_with_fallback(func, items):
         return [func(item) for item in items]
 
 
+def run_phases(
+    phases: dict[str, tuple[Any, tuple[str, ...]]], workers: int, label: str = ""
+) -> dict[str, Any]:
+    """Run dependent phases on a thread pool, each as soon as its dependencies finish.
+
+    Args:
+        phases: Maps a phase name to ``(func, dependencies)``; ``func`` is
+            called with the results of its dependencies, in order
+        workers: Maximum number of phases running at once
+        label: Prefix of the phase names recorded by the profiler
+
+    Returns:
+        Dict of phase name to the result of its ``func``
+
+    Raises:
+        ValueError: If some dependencies can never be satisfied
+    """
+    results: dict[str, Any] = {}
+    pending = dict(phases)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        running: dict[Any, str] = {}
+        while pending or running:
+            for name, (func, dependencies) in list(pending.items()):
+                if all(dependency in results for dependency in dependencies):
+                    args = [results[dependency] for dependency in dependencies]
+                    running[executor.submit(_run_phase, label + name, func, *args)] = name
+                    del pending[name]
+            if not running:
+                raise ValueError(f"Unsatisfiable phase dependencies: {sorted(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                # re-raises the first failure once running phases are done
+                results[running.pop(future)] = future.result()
+    return results
+
+
+def _run_phase(name: str, func, *args: Any) -> Any:
+    with profiling.phase(name):
+        return func(*args)
+
+
+def _batched(items: list, batches: int) -> list[list]:
+    """Split ``items`` into at most ``batches`` contiguous, similarly sized lists."""
+    if not items:
+        return []
+    size = -(-len(items) // max(1, batches))  # ceiling division
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
 def _sample_evenly(items: list[str], k: int) -> list[str]:
     """Pick up to ``k`` items spread evenly across the list, order preserved."""
     if len(items) <= k:
@@ -88,6 +214,22 @@ def _sample_evenly(items: list[str], k: int) -> list[str]:
     return [items[int(i * step)] for i in range(k)]
 
 
+def _renamed_path(path: str) -> str:
+    """Return the post-rename path of a ``--numstat`` entry.
+
+    Renames are printed as ``old => new`` or, when the paths share a prefix or
+    suffix, as ``dir/{old => new}/file``; other paths are returned unchanged.
+    """
+    if " => " not in path:
+        return path
+    start = path.find("{")
+    end = path.find("}", start + 1)
+    if start != -1 and end != -1 and " => " in path[start:end]:
+        new = path[start + 1 : end].split(" => ", 1)[1]
+        return (path[:start] + new + path[end + 1 :]).replace("//", "/").lstrip("/")
+    return path.split(" => ", 1)[1]
+
+
 def _merge_period_aliases(
     period_authors: dict[str, int], name_to_canonical: dict[str, str]
 ) -> None:
@@ -101,12 +243,162 @@ def _merge_period_aliases(
             period_authors[canonical] = period_authors.get(canonical, 0) + period_authors.pop(alias)
 
 
+# ── incremental collection ───────────────────────────────────────────────
+
+_HISTORY_VERSION = 2
+
+# Settings that decide which commits are walked and how they are counted;
+# cached statistics collected with other values are not extended.
+_HISTORY_SETTINGS = (
+    "commit_begin",
+    "commit_end",
+    "start_date",
+    "end_date",
+    "authors",
+    "linear_linestats",
+    "ai_enabled",
+    "churn_counters",
+)
+
+# Collector attributes accumulated over the walked commits. They are cached
+# after collection and restored on the next run, so that only the commits
+# added since are walked and folded into them.
+_HISTORY_STATE = (
+    "activity_by_hour_of_day",
+    "activity_by_day_of_week",
+    "activity_by_month_of_year",
+    "activity_by_hour_of_week",
+    "activity_by_hour_of_day_busiest",
+    "activity_by_hour_of_week_busiest",
+    "activity_by_year_week",
+    "activity_by_year_week_peak",
+    "authors",
+    "total_commits",
+    "domains",
+    "author_of_month",
+    "author_of_year",
+    "commits_by_month",
+    "commits_by_year",
+    "lines_added_by_month",
+    "lines_added_by_year",
+    "lines_removed_by_month",
+    "lines_removed_by_year",
+    "first_commit_stamp",
+    "last_commit_stamp",
+    "last_active_day",
+    "active_days",
+    "total_lines",
+    "total_lines_added",
+    "total_lines_removed",
+    "commits_by_timezone",
+    "files_by_stamp",
+    "changes_by_date",
+    "changes_by_date_by_author",
+    "paths",
+    "file_churn",
+    "author_files",
+)
+
+
+# ── snapshots ────────────────────────────────────────────────────────────
+
+# Bump when the collector attributes the report creators read change, so an
+# older snapshot is refused instead of rendered wrongly
+_SNAPSHOT_VERSION = 2
+
+# Collector attributes left out of the snapshot: the cache belongs to the
+# collection and AI summaries are regenerated (from their own cache)
+_SNAPSHOT_SKIP = ("cache", "analyzed_tips", "ai_summaries")
+# collector attributes left out of the -f json dump
+_JSON_SKIP = ("paths", "analyzed_tips")
+
+
+class _HistoryChangedError(Exception):
+    """The cached statistics cannot be extended; the full history must be walked."""
+
+
+def _history_settings() -> dict[str, Any]:
+    return {key: conf[key] for key in _HISTORY_SETTINGS}
+
+
+def _encode_state(value: Any) -> Any:
+    """Make collector state JSON-safe, keeping sets, timedeltas, integer dict keys and paths."""
+    if isinstance(value, PathTable):
+        return {"__path_table__": [value.parents.tolist(), value.names]}
+    if isinstance(value, PathCounts):
+        return {"__path_counts__": [value.ids.tolist(), value.counts.tolist()]}
+    if isinstance(value, set):
+        return {"__set__": sorted(value)}
+    if isinstance(value, datetime.timedelta):
+        return {"__timedelta__": [value.days, value.seconds, value.microseconds]}
+    if isinstance(value, dict):
+        if value and all(isinstance(key, int) for key in value):
+            return {"__int_keys__": [[key, _encode_state(item)] for key, item in value.items()]}
+        return {key: _encode_state(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_state(item) for item in value]
+    return value
+
+
+def _decode_state(value: Any, paths: PathTable | None = None) -> Any:
+    """Inverse of :func:`_encode_state`; path counts are restored over ``paths``."""
+    if isinstance(value, dict):
+        if len(value) == 1 and isinstance(value.get("__set__"), list):
+            return set(value["__set__"])
+        if len(value) == 1 and isinstance(value.get("__int_keys__"), list):
+            return {int(key): _decode_state(item, paths) for key, item in value["__int_keys__"]}
+        if len(value) == 1 and isinstance(value.get("__timedelta__"), list):
+            return datetime.timedelta(*value["__timedelta__"])
+        if len(value) == 1 and isinstance(value.get("__path_table__"), list):
+            return PathTable(*value["__path_table__"])
+        if len(value) == 1 and isinstance(value.get("__path_counts__"), list):
+            if paths is None:
+                raise ValueError("Path counts without the path table they refer to")
+            return PathCounts(paths, *value["__path_counts__"])
+        return {key: _decode_state(item, paths) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode_state(item, paths) for item in value]
+    return value
+
+
+def _no_history() -> dict[str, Any]:
+    """What the collection phases know about analyzed commits on a full walk: nothing."""
+    return {
+        "commits": {},
+        "email_to_latest": {},
+        "author_to_email": {},
+        "identities": {},
+        "subjects_by_year": {},
+    }
+
+
+def _fold_walk(analyzed: dict[str, Any], walk: dict[str, Any]) -> dict[str, Any]:
+    """Extend the walk of the new commits with what is known about the analyzed ones.
+
+    New commits come first in a full date-order walk, so where both name
+    the same email or author the new walk wins, as it would there.
+    """
+    walk["commits"] = {**walk["commits"], **analyzed["commits"]}
+    email_to_latest = walk["email_to_latest"]
+    for mail, (stamp, author) in analyzed["email_to_latest"].items():
+        if mail not in email_to_latest or stamp > email_to_latest[mail][0]:
+            email_to_latest[mail] = (stamp, author)
+    for author, mail in analyzed["author_to_email"].items():
+        walk["author_to_email"].setdefault(author, mail)
+    for year, subjects in analyzed["subjects_by_year"].items():
+        walk["subjects_by_year"].setdefault(year, []).extend(subjects)
+    return walk
+
+
 class DataCollector:
     """Manages data collection from a revision control repository."""
 
     def __init__(self) -> None:
         self.stamp_created: float = time.time()
-        self.cache: dict[str, Any] = {}
+        # in memory until saved, then the JsonCache or SQLiteCache of the output directory
+        self.cache: MutableMapping[str, Any] = {}
+        # tip commits whose history the restored statistics already cover
+        self.analyzed_tips: list[str] = []
         self.total_authors: int = 0
         self.activity_by_hour_of_day: dict[int, int] = {}  # hour -> commits
         self.activity_by_day_of_week: dict[int, int] = {}  # day -> commits
@@ -164,11 +456,14 @@ class DataCollector:
         self.changes_by_date: dict[int, dict[str, int]] = {}  # stamp -> { files, ins, del }
         self.changes_by_date_by_author: dict[int, dict[str, dict[str, int]]] = {}
 
+        # every file path seen, interned once for the path counts below
+        self.paths = PathTable()
+
         # file churn: number of commits that touched each file path
-        self.file_churn: dict[str, int] = {}  # filepath -> commit count
+        self.file_churn = PathCounts(self.paths)  # filepath -> commit count
 
         # code ownership: author -> file path -> number of commits touching it
-        self.author_files: dict[str, dict[str, int]] = {}
+        self.author_files: dict[str, PathCounts] = {}
 
         # evenly sampled commit subjects per year (collected only when AI
         # features are enabled; they ground the AI chronicle narration)
@@ -195,13 +490,7 @@ class DataCollector:
         if not os.path.exists(cachefile):
             return
         logger.info("Loading cache...")
-        try:
-            with open(cachefile, encoding="utf-8") as f:
-                self.cache = json.load(f)
-        except ValueError:
-            # Corrupted or legacy pickle cache - start fresh
-            logger.warning("Warning: cache is corrupted, starting fresh")
-            self.cache = {}
+        self.cache = open_cache(cachefile, conf["cache_backend"])
 
     def get_stamp_created(self) -> float:
         return self.stamp_created
@@ -209,276 +498,627 @@ class DataCollector:
     # Save cacheable data
     def save_cache(self, cachefile: str) -> None:
         logger.info("Saving cache...")
-        tempfile = cachefile + ".tmp"
-        with open(tempfile, "w", encoding="utf-8") as f:
-            json.dump(self.cache, f)
+        cache = self.cache
+        if not isinstance(cache, (JsonCache, SQLiteCache)) or cache.path != cachefile:
+            # a cache built in memory, e.g. on the first run
+            cache = open_cache(cachefile, conf["cache_backend"])
+            for name, table in self.cache.items():
+                cache[name] = table
+            self.cache = cache
+        cache.commit()
+
+    ##
+    # Save the refined statistics, enough to render the report without the repository
+    def save_snapshot(self, snapshotfile: str) -> None:
+        logger.info("Saving snapshot...")
+        snapshot = {
+            "version": _SNAPSHOT_VERSION,
+            "gitstats_version": get_version(),
+            "state": {
+                name: _encode_state(value)
+                for name, value in self.__dict__.items()
+                if name not in _SNAPSHOT_SKIP
+            },
+        }
+        tmpfile = snapshotfile + ".tmp"
+        with gzip.open(tmpfile, "wt", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmpfile, snapshotfile)
+
+    # Restore the statistics saved by save_snapshot
+    def load_snapshot(self, snapshotfile: str) -> None:
+        logger.info(f"Loading snapshot: {snapshotfile}")
         try:
-            os.remove(cachefile)
-        except OSError:
-            pass
-        os.rename(tempfile, cachefile)
+            with gzip.open(snapshotfile, "rt", encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            raise RuntimeError(f"No snapshot at {snapshotfile}; run without --from-snapshot first")
+        except (OSError, ValueError) as e:
+            raise RuntimeError(f"Cannot read snapshot {snapshotfile}: {e}")
+        if snapshot.get("version") != _SNAPSHOT_VERSION:
+            raise RuntimeError(
+                f"Snapshot {snapshotfile} was written by gitstats "
+                f"{snapshot.get('gitstats_version')} in an incompatible format; "
+                "run without --from-snapshot to collect again"
+            )
+        state = snapshot["state"]
+        paths = _decode_state(state["paths"])
+        for name, value in state.items():
+            setattr(self, name, paths if name == "paths" else _decode_state(value, paths))
 
 
 class GitDataCollector(DataCollector):
     def collect(self, repo_dir):
         """Collect all statistics from the repository.
 
-        Each phase below owns one slice of the data model; the only value
-        passed between them is the author-alias mapping, which later phases
-        need to attribute work to canonical identities.
+        The commit history is walked once (:meth:`_walk_history`) and every
+        commit is fed to each phase's accumulator in that same pass. The phases
+        below then finish what needs the whole history first: the author-alias
+        mapping, and the replays that need oldest-first order or canonical
+        author identities.
+
+        Phases run on a thread pool as soon as their inputs are ready (see
+        :func:`run_phases`), so git processes and parsing overlap. Phases
+        that run concurrently never write the same attribute; the alias
+        mapping rewrites ``authors``, the per-period author counts and
+        ``tags``, so it waits for the activity statistics and the tags, and
+        the per-author line statistics wait for it. The worker processes
+        that count files and blob lines are forked once, before the phase
+        threads start (see :func:`worker_pool`).
+
+        With ``incremental_collection`` the statistics of the last run are
+        restored from the cache and only the commits added since its tip are
+        walked and folded into them (see :meth:`_resume_history`). Rewritten
+        history or a changed author identity makes this fall back to walking
+        the full history.
         """
         DataCollector.collect(self, repo_dir)
 
-        self.total_authors += int(
-            get_pipe_output(["git shortlog -s {}".format(get_log_range("HEAD", False)), "wc -l"])
+        tip = get_pipe_output(
+            ["git rev-parse --verify -q {}".format(get_commit_range("HEAD", end_only=True))],
+            quiet=True,
         )
-
-        self._collect_tags()
-        email_to_latest, author_to_email = self._collect_commit_stats()
-        name_to_canonical = self._merge_author_aliases(email_to_latest, author_to_email)
-        self._collect_files_by_stamp()
-        self._collect_extensions()
-        self._collect_line_stats()
-        self._collect_per_author_line_stats(name_to_canonical)
-        self._collect_file_churn_and_ownership(name_to_canonical)
+        analyzed = self._resume_history(tip)
+        # the workers are forked before the phase threads start
+        with worker_pool() as pool:
+            try:
+                results = self._run_collection(analyzed, pool)
+            except _HistoryChangedError as e:
+                logger.info(f"{e}, walking the full history")
+                self._reset_collected()
+                results = self._run_collection(_no_history(), pool)
+        # counting is done: keep the path counts as bare arrays
+        self.file_churn.compact()
+        for files in self.author_files.values():
+            files.compact()
+        if tip and conf["incremental_collection"]:
+            self._save_history(tip, results["walk"], results["aliases"])
+
+    def _run_collection(
+        self, analyzed: dict[str, Any], pool: multiprocessing.pool.Pool | None = None
+    ) -> dict[str, Any]:
+        """Run the collection phases over the commits not covered by ``analyzed``.
+
+        Phases that count in worker processes use ``pool`` (see :func:`worker_pool`).
+        """
+        phases = {
+            "walk": (lambda: _fold_walk(analyzed, self._walk_history()), ()),
+            "extensions": (lambda: self._collect_extensions(pool), ()),
+            "activity": (lambda walk: self._collect_activity(walk["table"]), ("walk",)),
+            "tags": (lambda walk: self._collect_tags(walk["commits"]), ("walk",)),
+            "aliases": (
+                lambda walk, _activity, _tags: self._merge_author_aliases(
+                    walk["email_to_latest"], walk["author_to_email"], analyzed["identities"]
+                ),
+                ("walk", "activity", "tags"),
+            ),
+            "files": (lambda walk: self._collect_files_by_stamp(walk["revs"], pool), ("walk",)),
+            "lines": (lambda walk: self._collect_line_stats(walk["table"]), ("walk",)),
+            "author_lines": (
+                lambda walk, name_to_canonical: self._collect_per_author_line_stats(
+                    walk["table"], name_to_canonical
+                ),
+                ("walk", "aliases"),
+            ),
+        }
         if conf["ai_enabled"]:
-            self._collect_commit_subjects()
+            phases["subjects"] = (
+                lambda walk: self._collect_commit_subjects(walk["subjects_by_year"]),
+                ("walk",),
+            )
+        return run_phases(phases, min(len(phases), conf["processes"]), label="collect:")
+
+    # ── incremental collection ───────────────────────────────────────────
+
+    def _resume_history(self, tip: str) -> dict[str, Any]:
+        """Restore the statistics cached by the last run if ``tip`` extends its history.
+
+        On success the collector holds the cached statistics, ``analyzed_tips``
+        lists the commits they cover up to, and the returned dict holds what
+        the phases need to know about the analyzed commits. Otherwise nothing
+        is restored and the full history is walked.
+
+        Totals come out as with a full walk. The running series
+        (``changes_by_date``, ``changes_by_date_by_author``) continue after
+        the restored ones, so a merged branch whose commits are dated before
+        the last run lands at the end of the series rather than in between.
+        """
+        if not tip or not conf["incremental_collection"]:
+            return _no_history()
+        # read each field once; the cache backend decodes on every access
+        history = dict(self.cache.get("history") or {})
+        if not history:
+            return _no_history()
+        if str(conf["commit_begin"]).isdigit():
+            # "the last N commits" drops old commits as new ones arrive
+            return _no_history()
+        if (
+            history.get("version") != _HISTORY_VERSION
+            or history.get("settings") != _history_settings()
+        ):
+            logger.info(
+                "Cached statistics were collected with other settings, walking the full history"
+            )
+            return _no_history()
+        if not self._extends_history(history["tips"], tip):
+            logger.info("History was rewritten since the last run, walking the full history")
+            return _no_history()
+
+        state = history["state"]
+        paths = _decode_state(state["paths"])
+        for name in _HISTORY_STATE:
+            setattr(self, name, paths if name == "paths" else _decode_state(state[name], paths))
+        self.analyzed_tips = list(history["tips"])
+        logger.info(f"Resuming from {len(history['commits'])} analyzed commits")
+        return {
+            "commits": history["commits"],
+            "email_to_latest": history["email_to_latest"],
+            "author_to_email": history["author_to_email"],
+            "identities": history["identities"],
+            "subjects_by_year": _decode_state(history["subjects_by_year"]),
+        }
+
+    def _extends_history(self, tips: list[str], tip: str) -> bool:
+        """Whether ``tip`` only adds commits on top of the analyzed ``tips``."""
+        for analyzed_tip in tips:
+            # prints nothing, not 0, when the old tip no longer exists
+            count = get_pipe_output(
+                [f"git rev-list --count {analyzed_tip} --not {tip}"], quiet=True
+            )
+            if count != "0":
+                return False
+        if conf["linear_linestats"]:
+            # the line statistics resume along the mainline, so the new
+            # first-parent chain has to lead back to an analyzed tip
+            oldest = ""
+            for oldest in iter_pipe_lines(
+                "git rev-list --first-parent --parents {} --not {}".format(tip, " ".join(tips)),
+                quiet=True,
+            ):
+                pass
+            parents = oldest.split(" ")[1:]
+            if oldest and (not parents or parents[0] not in tips):
+                return False
+        return True
+
+    def _since_analyzed(self, revisions: str) -> str:
+        """``revisions`` without the commits the restored statistics already cover."""
+        if not self.analyzed_tips:
+            return revisions
+        return "{} --not {}".format(revisions, " ".join(self.analyzed_tips))
+
+    def _reset_collected(self) -> None:
+        """Forget all collected statistics, keeping the object caches."""
+        cache, stamp_created = self.cache, self.stamp_created
+        DataCollector.__init__(self)
+        self.cache, self.stamp_created = cache, stamp_created
+
+    def _save_history(
+        self, tip: str, walk: dict[str, Any], name_to_canonical: dict[str, str]
+    ) -> None:
+        """Cache the collected statistics so the next run only walks newer commits.
+
+        Must run before :meth:`refine`, which derives from them in place.
+        """
+        self.cache["history"] = {
+            "version": _HISTORY_VERSION,
+            "settings": _history_settings(),
+            "tips": [tip],
+            "commits": walk["commits"],
+            "email_to_latest": walk["email_to_latest"],
+            "author_to_email": walk["author_to_email"],
+            # every analyzed author name -> its canonical identity
+            "identities": {**{name: name for name in self.authors}, **name_to_canonical},
+            "subjects_by_year": _encode_state(walk["subjects_by_year"]),
+            "state": {name: _encode_state(getattr(self, name)) for name in _HISTORY_STATE},
+        }
 
     # ── collection phases ────────────────────────────────────────────────
 
-    def _collect_tags(self) -> None:
+    def _collect_tags(self, commits: dict[str, str]) -> None:
         """Populate ``tags`` with each tag's date, commit count and authors.
 
-        Only tags whose commit is reachable within the configured commit range
-        are included.
+        ``commits`` maps every commit walked within the configured range and
+        filters to its author. Only tags pointing at one of them are included.
+        Tag dates come from a single ``for-each-ref`` call, and each commit is
+        attributed to the first tag (oldest first) that contains it in one
+        topologically ordered ``rev-list`` walk.
         """
-        log_range = get_log_range("HEAD", False)
-        tag_commits = get_pipe_output([f"git rev-list {log_range}"]).strip().split("\n")
-        tag_commits_set = set(tag_commits) if tag_commits[0] else set()
-
-        lines = get_pipe_output(["git show-ref --tags"]).split("\n")
-        for line in lines:
-            if len(line) == 0:
+        # "<object> <author stamp> <refname>"; the stamp is empty unless the ref points at a commit
+        for line in iter_pipe_lines(
+            'git for-each-ref --format="%(objectname) %(authordate:unix) %(refname)" refs/tags'
+        ):
+            parts = line.split(" ", 2)
+            if len(parts) != 3:
                 continue
-            (hash, tag) = line.split(" ")
+            (hash, stamp_str, tag) = parts
 
             # Only include tags whose commit is in our range
-            if hash not in tag_commits_set:
+            if hash not in commits:
                 continue
 
             tag = tag.replace("refs/tags/", "")
-            output = get_pipe_output([f'git log "{hash}" --pretty=format:"%at %aN" -n 1'])
-            if len(output) > 0:
-                parts = output.split(" ")
+            try:
+                stamp = int(stamp_str)
+            except ValueError:
                 stamp = 0
-                try:
-                    stamp = int(parts[0])
-                except ValueError:
-                    stamp = 0
-                self.tags[tag] = {
-                    "stamp": stamp,
-                    "hash": hash,
-                    "date": datetime.datetime.fromtimestamp(stamp).strftime("%Y-%m-%d"),
-                    "commits": 0,
-                    "authors": {},
-                }
+            self.tags[tag] = {
+                "stamp": stamp,
+                "hash": hash,
+                "date": date_label(stamp),
+                "commits": 0,
+                "authors": {},
+            }
+        if not self.tags:
+            return
 
-        # collect info on tags, starting from latest
-        # Only collect statistics for commits within our range
-        tags_sorted_by_date_desc = [
-            el[1]
-            for el in sorted([(el[1]["date"], el[0]) for el in self.tags.items()], reverse=True)
-        ]
-        prev = None
-        for tag in reversed(tags_sorted_by_date_desc):
-            # Modify command to only include commits within our range
-            cmd = f'git shortlog -s "{tag}"'
-            if prev is not None:
-                cmd += f' "^{prev}"'
-            # Intersect with our commit range and apply filters
-            cmd += f" {log_range}"
-            output = get_pipe_output([cmd])
-            if len(output) == 0:
+        # Tags oldest first; commit -> index of the first tag containing it.
+        # Children come before their parents in topological order, so a
+        # commit's index is final by the time it is read and passed on.
+        tags_by_date = sorted(self.tags, key=lambda tag: (self.tags[tag]["date"], tag))
+        first_tag: dict[str, int] = {}
+        for index, tag in enumerate(tags_by_date):
+            first_tag.setdefault(self.tags[tag]["hash"], index)
+        for line in iter_pipe_lines(
+            "git rev-list --topo-order --parents {}".format(get_commit_range("HEAD"))
+        ):
+            commit, *parents = line.split(" ")
+            if commit not in first_tag:
                 continue
-            prev = tag
-            for line in output.split("\n"):
-                if len(line.strip()) == 0:
-                    continue
-                parts = re.split(r"\s+", line, 2)
-                if len(parts) < 3:
-                    continue
-                commits = int(parts[1])
-                author = parts[2]
-                self.tags[tag]["commits"] += commits
-                self.tags[tag]["authors"][author] = commits
+            index = first_tag[commit]
+            for parent in parents:
+                if first_tag.get(parent, len(tags_by_date)) > index:
+                    first_tag[parent] = index
+            if commit in commits:
+                tag_info = self.tags[tags_by_date[index]]
+                author = commits[commit]
+                tag_info["commits"] += 1
+                tag_info["authors"][author] = tag_info["authors"].get(author, 0) + 1
+
+        # authors by name, as `git shortlog` lists them
+        for tag_info in self.tags.values():
+            tag_info["authors"] = dict(sorted(tag_info["authors"].items()))
+
+    def _walk_history(self) -> dict[str, Any]:
+        """Walk the commit history once, feeding every collection phase.
+
+        A single ``git log --numstat`` pass in date order (children before
+        parents) replaces separate rev-list, shortstat, name-only and subject
+        traversals. Every commit becomes a row of a columnar
+        :class:`~gitstats.commit_table.CommitTable`, which the activity and
+        line statistics phases aggregate afterwards; only the identity
+        mappings and file churn are updated per commit right away. Merges
+        keep their diff against the first parent only on the mainline of the
+        linear line statistics. Commits the restored statistics already cover
+        (``analyzed_tips``) are skipped.
+
+        Returns a dict with:
+            commits: author of every walked commit, by hash;
+            revs: ``(stamp, tree)`` of every walked commit;
+            email_to_latest, author_to_email: the identity mappings for
+                :meth:`_merge_author_aliases`;
+            table: the walked commits as a :class:`CommitTable`, newest
+                first;
+            subjects_by_year: year -> commit subjects, newest first (only
+                filled when AI features are enabled);
+            churn: the :class:`~gitstats.topk.SpaceSaving` counters of the
+                file churn with ``churn_counters``, else None.
+        """
+        log_range = get_log_range("HEAD", False)
+        # Outputs "COMMIT\0<hash>\0<parents>\0<tree>\0<stamp>\0<date> <time> <timezone>\0<author>\0<mail>[\0<subject>]"
+        # followed by one "<inserted>\t<deleted>\t<path>" line per changed file
+        fields = "%H%x00%P%x00%T%x00%at%x00%ai%x00%aN%x00%aE"
+        if conf["ai_enabled"]:
+            fields += "%x00%s"
+        cmd = 'git log --date-order --numstat --diff-merges=first-parent --format="COMMIT%x00{}" {}'
+        cmd = cmd.format(fields, self._since_analyzed(log_range))
+
+        walk: dict[str, Any] = {
+            "commits": {},
+            "revs": [],
+            "email_to_latest": {},  # email -> (stamp, author_name)
+            "author_to_email": {},  # author_name -> primary email
+            "table": CommitTable(),
+            "subjects_by_year": {},
+            # Line statistics follow the first-parent chain when linear. Without
+            # date/author filters the chain is followed during the walk itself,
+            # starting at the first commit shown; filters may hide chain
+            # members, so then the chain is listed up front instead.
+            "first_parents": None,
+            "next_first_parent": None,
+            "churn": None,
+        }
+        if conf["churn_counters"]:
+            # approximate churn: only the heaviest files keep a counter
+            walk["churn"] = SpaceSaving(conf["churn_counters"])
+            for node, count in self.file_churn.id_items():
+                walk["churn"].add(node, count)
+        if conf["linear_linestats"] and log_range != get_commit_range("HEAD"):
+            walk["first_parents"] = set(
+                iter_pipe_lines(f"git rev-list --first-parent {self._since_analyzed(log_range)}")
+            )
 
-    def _collect_commit_stats(self) -> tuple[dict[str, tuple[int, str]], dict[str, str]]:
-        """Walk every commit, accumulating activity, domain and author stats.
+        header: list[str] | None = None
+        numstat: list[str] = []
+        for line in iter_pipe_lines(cmd):
+            if line.startswith("COMMIT\0"):
+                if header is not None:
+                    self._record_walked_commit(walk, header, numstat)
+                header = line.split("\0")[1:]
+                numstat = []
+            elif line and header is not None:
+                numstat.append(line)
+        if header is not None:
+            self._record_walked_commit(walk, header, numstat)
+        if walk["churn"] is not None:
+            counters = walk["churn"].counts
+            self.file_churn = PathCounts(self.paths, counters.keys(), counters.values())
+        return walk
+
+    def _record_walked_commit(
+        self, walk: dict[str, Any], header: list[str], numstat: list[str]
+    ) -> None:
+        """Dispatch one commit of :meth:`_walk_history` to every accumulator."""
+        if len(header) < 7:
+            logger.warning(f'Unexpected commit header "{header}"')
+            return
+        commit, parents, tree, stamp_str, date, author, mail = header[:7]
+        try:
+            stamp = int(stamp_str)
+        except ValueError:
+            stamp = 0
+        parent_list = parents.split()
+        is_merge = len(parent_list) > 1
+
+        files, inserted, deleted = 0, 0, 0
+        paths = []
+        for line in numstat:
+            parts = line.split("\t", 2)
+            if len(parts) != 3:
+                logger.warning(f'Unexpected line "{line}"')
+                continue
+            files += 1
+            # binary files show "-" instead of line counts
+            if parts[0].isdigit():
+                inserted += int(parts[0])
+            if parts[1].isdigit():
+                deleted += int(parts[1])
+            paths.append(_renamed_path(parts[2]))
+
+        walk["commits"][commit] = author
+        walk["revs"].append((stamp, tree))
+        self._record_identity(stamp, author, mail, walk["email_to_latest"], walk["author_to_email"])
+
+        flags = MERGE if is_merge else 0
+        if conf["linear_linestats"]:
+            if walk["first_parents"] is not None:
+                on_mainline = commit in walk["first_parents"]
+            else:
+                on_mainline = walk["next_first_parent"] in (None, commit)
+                if on_mainline:
+                    # "" marks the end of the chain at a root commit
+                    walk["next_first_parent"] = parent_list[0] if parent_list else ""
+            if on_mainline:
+                flags |= MAINLINE
+        # A merge counts as a commit for its author, but its first-parent diff
+        # only counts along the mainline, as with `git log --first-parent -m`.
+        if is_merge and not flags & MAINLINE:
+            files, inserted, deleted = 0, 0, 0
+        elif not is_merge:
+            self._record_file_changes(author, paths, walk["churn"])
+        domain = mail.rsplit("@", 1)[1] if "@" in mail else "?"
+        timezone = date.rsplit(" ", 1)[-1]
+        walk["table"].append(stamp, author, domain, timezone, files, inserted, deleted, flags)
+
+        if len(header) > 7:
+            subject = header[7].strip()
+            if subject:
+                year = stamp_keys(stamp)[2]
+                walk["subjects_by_year"].setdefault(year, []).append(subject[:100])
 
-        Returns the two mappings needed to resolve author identities:
+    def _record_identity(
+        self,
+        stamp: int,
+        author: str,
+        mail: str,
+        email_to_latest: dict[str, tuple[int, str]],
+        author_to_email: dict[str, str],
+    ) -> None:
+        """Track the mappings needed to resolve author identities for a single commit:
         ``email -> (latest stamp, author name)`` and ``author name -> email``.
         """
-        # Outputs "<stamp> <date> <time> <timezone> <author> '<' <mail> '>'"
-        lines = get_pipe_output(
-            [
-                'git rev-list --pretty=format:"%at %ai %aN <%aE>" {}'.format(
-                    get_log_range("HEAD", False)
-                ),
-                "grep -v ^commit",
-            ]
-        ).split("\n")
-        # Track email<->author mappings to automatically merge identities that share an email
-        email_to_latest: dict[str, tuple[int, str]] = {}  # email -> (stamp, author_name)
-        author_to_email: dict[str, str] = {}  # author_name -> primary email
-        for line in lines:
-            # Skip empty lines (happens when there are no commits in the date range)
-            if not line.strip():
-                continue
-            parts = line.split(" ", 4)
-            # Skip lines that don't have enough parts
-            if len(parts) < 5:
-                continue
-            author = ""
-            try:
-                stamp = int(parts[0])
-            except ValueError:
-                stamp = 0
-            timezone = parts[3]
-            author, mail = parts[4].split("<", 1)
-            author = author.rstrip()
-            mail = mail.rstrip(">")
-            domain = "?"
-            if mail.find("@") != -1:
-                domain = mail.rsplit("@", 1)[1]
-            date = datetime.datetime.fromtimestamp(float(stamp))
-
-            # Track email<->author mapping to later resolve identity aliases
-            if mail and (mail not in email_to_latest or int(stamp) > email_to_latest[mail][0]):
-                email_to_latest[mail] = (stamp, author)
-            if mail and author not in author_to_email:
-                author_to_email[author] = mail
-
-            # First and last commit stamp (may be in any order because of cherry-picking and patches)
-            if stamp > self.last_commit_stamp:
-                self.last_commit_stamp = stamp
-            if self.first_commit_stamp == 0 or stamp < self.first_commit_stamp:
-                self.first_commit_stamp = stamp
-
-            self._record_activity(date)
-
-            # domain stats
-            if domain not in self.domains:
-                self.domains[domain] = {}
-            # commits
-            self.domains[domain]["commits"] = self.domains[domain].get("commits", 0) + 1
-
-            self._record_author_commit(author, stamp, date)
-
-            # timezone
-            self.commits_by_timezone[timezone] = self.commits_by_timezone.get(timezone, 0) + 1
-
-        return email_to_latest, author_to_email
-
-    def _record_activity(self, date: datetime.datetime) -> None:
-        """Accumulate the time-of-commit histograms for a single commit."""
-        # hour
-        hour = date.hour
-        self.activity_by_hour_of_day[hour] = self.activity_by_hour_of_day.get(hour, 0) + 1
-        # most active hour?
-        if self.activity_by_hour_of_day[hour] > self.activity_by_hour_of_day_busiest:
-            self.activity_by_hour_of_day_busiest = self.activity_by_hour_of_day[hour]
-
-        # day of week
-        day = date.weekday()
-        self.activity_by_day_of_week[day] = self.activity_by_day_of_week.get(day, 0) + 1
+        if mail and (mail not in email_to_latest or stamp > email_to_latest[mail][0]):
+            email_to_latest[mail] = (stamp, author)
+        if mail and author not in author_to_email:
+            author_to_email[author] = mail
+
+    def _record_file_changes(
+        self, author: str, paths: list[str], churn: SpaceSaving | None = None
+    ) -> None:
+        """Accumulate file churn and per-author file edits for a single commit.
+
+        ``file_churn`` counts the commits touching each file, or ``churn``
+        estimates the counts of the most changed ones, and ``author_files``
+        which files each author touches, for code ownership.
+        Authors are recorded as walked; :meth:`_merge_author_aliases` folds
+        aliases into their canonical identity.
+        """
+        if not paths:
+            return
+        intern = self.paths.intern
+        counts = self.file_churn if churn is None else churn
+        author_map = None
+        if author:
+            author_map = self.author_files.get(author)
+            if author_map is None:
+                author_map = self.author_files[author] = PathCounts(self.paths)
+        for path in paths:
+            node = intern(path)
+            counts.add(node)
+            if author_map is not None:
+                author_map.add(node)
+
+    def _collect_activity(self, table: CommitTable) -> None:
+        """Compute activity, period, domain, timezone and author statistics.
+
+        Works on whole columns of the walked commits: rows are counted per
+        local day (and hour) first, so the calendar keys are derived once per
+        day instead of once per commit. Keys appear in walk order and counts
+        add to any restored statistics, as if the commits had been recorded
+        one by one.
+        """
+        if not len(table):
+            return
+        # First and last commit stamp (may be in any order because of cherry-picking and patches)
+        stamps = table.stamps
+        first, last = min(stamps), max(stamps)
+        if last > self.last_commit_stamp:
+            self.last_commit_stamp = last
+        if self.first_commit_stamp == 0 or first < self.first_commit_stamp:
+            self.first_commit_stamp = first
+
+        day_counts = group_counts(table.days)
+        calendar = {day: day_keys(day) for day in day_counts}
+
+        # hour of day
+        for hour, commits in group_counts(table.hours).items():
+            self.activity_by_hour_of_day[hour] = self.activity_by_hour_of_day.get(hour, 0) + commits
+            # most active hour?
+            self.activity_by_hour_of_day_busiest = max(
+                self.activity_by_hour_of_day_busiest, self.activity_by_hour_of_day[hour]
+            )
+
+        # day of week, month of year, yearly/weekly activity, commits per period
+        for day, commits in day_counts.items():
+            weekday, month, year, yyw, yymm, yymmdd = calendar[day]
+            self.activity_by_day_of_week[weekday] = (
+                self.activity_by_day_of_week.get(weekday, 0) + commits
+            )
+            self.activity_by_month_of_year[month] = (
+                self.activity_by_month_of_year.get(month, 0) + commits
+            )
+            self.activity_by_year_week[yyw] = self.activity_by_year_week.get(yyw, 0) + commits
+            self.activity_by_year_week_peak = max(
+                self.activity_by_year_week_peak, self.activity_by_year_week[yyw]
+            )
+            self.commits_by_month[yymm] = self.commits_by_month.get(yymm, 0) + commits
+            self.commits_by_year[year] = self.commits_by_year.get(year, 0) + commits
+            # project: active days
+            self.active_days.add(yymmdd)
+        # the walk ends on the oldest day; a resumed run only walked the new commits
+        oldest_day = calendar[table.days[-1]][5]
+        if self.last_active_day is None or oldest_day < self.last_active_day:
+            self.last_active_day = oldest_day
 
         # hour of week
-        if day not in self.activity_by_hour_of_week:
-            self.activity_by_hour_of_week[day] = {}
-        self.activity_by_hour_of_week[day][hour] = (
-            self.activity_by_hour_of_week[day].get(hour, 0) + 1
-        )
-        # most active hour?
-        if self.activity_by_hour_of_week[day][hour] > self.activity_by_hour_of_week_busiest:
-            self.activity_by_hour_of_week_busiest = self.activity_by_hour_of_week[day][hour]
-
-        # month of year
-        month = date.month
-        self.activity_by_month_of_year[month] = self.activity_by_month_of_year.get(month, 0) + 1
-
-        # yearly/weekly activity
-        yyw = date.strftime("%Y-%W")
-        self.activity_by_year_week[yyw] = self.activity_by_year_week.get(yyw, 0) + 1
-        if self.activity_by_year_week_peak < self.activity_by_year_week[yyw]:
-            self.activity_by_year_week_peak = self.activity_by_year_week[yyw]
-
-    def _record_author_commit(self, author: str, stamp: int, date: datetime.datetime) -> None:
-        """Accumulate per-author and per-period stats for a single commit."""
+        for key, commits in group_counts(pair_keys(table.days, table.hours, 24)).items():
+            day, hour = divmod(key, 24)
+            by_hour = self.activity_by_hour_of_week.setdefault(calendar[day][0], {})
+            by_hour[hour] = by_hour.get(hour, 0) + commits
+            # most active hour?
+            self.activity_by_hour_of_week_busiest = max(
+                self.activity_by_hour_of_week_busiest, by_hour[hour]
+            )
+
         # author stats
-        if author not in self.authors:
-            self.authors[author] = {}
-        # commits, note again that commits may be in any date order because of cherry-picking and patches
-        if "last_commit_stamp" not in self.authors[author]:
-            self.authors[author]["last_commit_stamp"] = stamp
-        if stamp > self.authors[author]["last_commit_stamp"]:
-            self.authors[author]["last_commit_stamp"] = stamp
-        if "first_commit_stamp" not in self.authors[author]:
-            self.authors[author]["first_commit_stamp"] = stamp
-        if stamp < self.authors[author]["first_commit_stamp"]:
-            self.authors[author]["first_commit_stamp"] = stamp
+        names = table.author_names
+        lowest, highest, _ = group_extremes(table.authors, stamps, len(names))
+        _, _, last_days = group_extremes(table.authors, table.days, len(names))
+        for index, name in enumerate(names):
+            author = self.authors.setdefault(name, {})
+            if "last_commit_stamp" not in author or highest[index] > author["last_commit_stamp"]:
+                author["last_commit_stamp"] = highest[index]
+            if "first_commit_stamp" not in author or lowest[index] < author["first_commit_stamp"]:
+                author["first_commit_stamp"] = lowest[index]
+            last_day = last_days[index]
+            if last_day is not None:
+                active_day = calendar[last_day][5]
+                if "last_active_day" not in author or active_day < author["last_active_day"]:
+                    author["last_active_day"] = active_day
+            author.setdefault("active_days", set())
 
         # author of the month/year
-        yymm = date.strftime("%Y-%m")
-        if yymm in self.author_of_month:
-            self.author_of_month[yymm][author] = self.author_of_month[yymm].get(author, 0) + 1
-        else:
-            self.author_of_month[yymm] = {}
-            self.author_of_month[yymm][author] = 1
-        self.commits_by_month[yymm] = self.commits_by_month.get(yymm, 0) + 1
-
-        yy = date.year
-        if yy in self.author_of_year:
-            self.author_of_year[yy][author] = self.author_of_year[yy].get(author, 0) + 1
-        else:
-            self.author_of_year[yy] = {}
-            self.author_of_year[yy][author] = 1
-        self.commits_by_year[yy] = self.commits_by_year.get(yy, 0) + 1
+        month_of_day = {day: keys[2] * 100 + keys[1] for day, keys in calendar.items()}
+        months = recode(table.days, month_of_day)
+        month_labels = {keys[2] * 100 + keys[1]: keys[4] for keys in calendar.values()}
+        for key, commits in group_counts(pair_keys(months, table.authors, len(names))).items():
+            month, index = divmod(key, len(names))
+            name = names[index]
+            month_authors = self.author_of_month.setdefault(month_labels[month], {})
+            month_authors[name] = month_authors.get(name, 0) + commits
+            year_authors = self.author_of_year.setdefault(month // 100, {})
+            year_authors[name] = year_authors.get(name, 0) + commits
 
         # authors: active days
-        yymmdd = date.strftime("%Y-%m-%d")
-        if "last_active_day" not in self.authors[author]:
-            self.authors[author]["last_active_day"] = yymmdd
-            self.authors[author]["active_days"] = set([yymmdd])
-        elif yymmdd != self.authors[author]["last_active_day"]:
-            self.authors[author]["last_active_day"] = yymmdd
-            self.authors[author]["active_days"].add(yymmdd)
-
-        # project: active days
-        if yymmdd != self.last_active_day:
-            self.last_active_day = yymmdd
-            self.active_days.add(yymmdd)
+        active_days = [self.authors[name]["active_days"] for name in names]
+        for key in group_counts(pair_keys(table.days, table.authors, len(names))):
+            day, index = divmod(key, len(names))
+            active_days[index].add(calendar[day][5])
+
+        # domain stats
+        for index, commits in group_counts(table.domains).items():
+            domain = self.domains.setdefault(table.domain_names[index], {})
+            domain["commits"] = domain.get("commits", 0) + commits
+
+        # timezone
+        for index, commits in group_counts(table.timezones).items():
+            timezone = table.timezone_names[index]
+            self.commits_by_timezone[timezone] = self.commits_by_timezone.get(timezone, 0) + commits
 
     def _merge_author_aliases(
         self,
         email_to_latest: dict[str, tuple[int, str]],
         author_to_email: dict[str, str],
+        analyzed_identities: dict[str, str] | None = None,
     ) -> dict[str, str]:
         """Fold authors that share an email into one canonical identity.
 
-        Merges the alias entries in ``authors``, the per-period author dicts and
-        the tag author dicts, then returns the ``alias -> canonical`` mapping so
+        Merges the alias entries in ``authors``, the per-period author dicts,
+        the tag author dicts and ``author_files``, then returns the ``alias -> canonical`` mapping so
         later phases can attribute their data to the same identities.
+
+        ``analyzed_identities`` maps the author names of restored statistics
+        to the identity they were merged into; if any of them now resolves
+        differently the statistics cannot be extended and
+        :class:`_HistoryChangedError` is raised before anything is merged.
         """
+        analyzed_identities = analyzed_identities or {}
         # Build canonical name mapping: merge authors that share the same email
         # (same person who committed with different name/email configurations)
         email_to_canonical = {email: name for email, (_, name) in email_to_latest.items()}
         name_to_canonical: dict[str, str] = {}
-        for name in self.authors.keys():
+        names = [*self.authors, *(name for name in analyzed_identities if name not in self.authors)]
+        for name in names:
             email = author_to_email.get(name)
             if email:
                 canonical = email_to_canonical.get(email, name)
                 if canonical != name:
                     name_to_canonical[name] = canonical
+        for name, canonical in analyzed_identities.items():
+            if name_to_canonical.get(name, name) != canonical:
+                raise _HistoryChangedError(
+                    f'The identity of author "{name}" changed since the last run'
+                )
 
         # Merge aliased author entries into their canonical entries
         for alias, canonical in name_to_canonical.items():
@@ -520,68 +1160,132 @@ class GitDataCollector(DataCollector):
                 merged_authors[resolved] = merged_authors.get(resolved, 0) + commits
             self.tags[tag]["authors"] = merged_authors
 
+        # Merge aliases in per-author file edit counts
+        for alias, canonical in name_to_canonical.items():
+            if alias not in self.author_files:
+                continue
+            alias_files = self.author_files.pop(alias)
+            self.author_files.setdefault(canonical, PathCounts(self.paths)).update(alias_files)
+
         # Update total_authors to reflect merged identities
         self.total_authors = len(self.authors)
 
         return name_to_canonical
 
-    def _collect_files_by_stamp(self) -> None:
-        """Record the file count of every revision, using the blob cache."""
-        # outputs "<stamp> <files>" for each revision
-        revlines = (
-            get_pipe_output(
-                [
-                    'git rev-list --pretty=format:"%at %T" {}'.format(get_log_range("HEAD", False)),
-                    "grep -v ^commit",
-                ]
-            )
-            .strip()
-            .split("\n")
-        )
+    def _collect_files_by_stamp(
+        self, revs: list[tuple[int, str]], pool: multiprocessing.pool.Pool | None = None
+    ) -> None:
+        """Record the file count of every revision, using the blob cache.
+
+        ``revs`` holds ``(stamp, tree)`` for every walked commit; revisions
+        missing from the cache are counted on ``pool``.
+        """
+        files_in_tree = self.cache.setdefault("files_in_tree", {})
+        if conf["incremental_filecounts"]:
+            if any(rev not in files_in_tree for _, rev in revs):
+                self._count_files_from_tree_diffs()
+
         lines = []
         revs_to_read = []
         time_rev_count = []
         # Look up rev in cache and take info from cache if found
         # If not append rev to list of rev to read from repo
-        for revline in revlines:
-            time, rev = revline.split(" ")
-            # if cache empty then add time and rev to list of new rev's
-            # otherwise try to read needed info from cache
-            if "files_in_tree" not in list(self.cache.keys()):
-                revs_to_read.append((time, rev))
-                continue
-            if rev in list(self.cache["files_in_tree"].keys()):
-                lines.append("%d %d" % (int(time), self.cache["files_in_tree"][rev]))
+        for stamp, rev in revs:
+            count = files_in_tree.get(rev)
+            if count is None:
+                revs_to_read.append((stamp, rev))
             else:
-                revs_to_read.append((time, rev))
+                lines.append("%d %d" % (int(stamp), count))
 
-        # Read revisions from repo
-        time_rev_count = parallel_map_with_fallback(get_num_of_files_from_rev, revs_to_read)
+        # Read revisions from repo. The in-process object reader remembers
+        # subtree counts across revisions, so it runs here, not in workers.
+        if get_object_store() is not None:
+            time_rev_count = [get_num_of_files_from_rev(time_rev) for time_rev in revs_to_read]
+        else:
+            time_rev_count = parallel_map_with_fallback(
+                get_num_of_files_from_rev, revs_to_read, pool
+            )
 
         # Update cache with new revisions and append then to general list
-        for time, rev, count in time_rev_count:
-            if "files_in_tree" not in self.cache:
-                self.cache["files_in_tree"] = {}
-            self.cache["files_in_tree"][rev] = count
-            lines.append("%d %d" % (int(time), count))
+        for stamp, rev, count in time_rev_count:
+            files_in_tree[rev] = count
+            lines.append("%d %d" % (int(stamp), count))
 
         self.total_commits += len(lines)
         for line in lines:
             parts = line.split(" ")
             if len(parts) != 2:
                 continue
-            (stamp, files) = parts[0:2]
+            (line_stamp, files) = parts[0:2]
             try:
-                self.files_by_stamp[int(stamp)] = int(files)
+                self.files_by_stamp[int(line_stamp)] = int(files)
             except ValueError:
                 logger.warning(f'Failed to parse line "{line}"')
 
-    def _collect_extensions(self) -> None:
-        """Count files, total size and lines per file extension at HEAD."""
+    def _count_files_from_tree_diffs(self) -> None:
+        """Fill ``cache["files_in_tree"]`` from a single tree-diff walk.
+
+        Instead of listing the full tree of every commit, the history is walked
+        once oldest-first with ``--raw`` and each commit's file count is its
+        first parent's count plus the files it added minus the files it
+        deleted. Root commits are diffed against the empty tree. A commit whose
+        parent lies outside the walked range (e.g. with ``commit_begin``) is
+        counted once with ``ls-tree`` and its descendants build on that.
+        """
+        files_in_tree = self.cache.setdefault("files_in_tree", {})
+        # Date and author filters are left out on purpose: every parent must be
+        # walked for the counts to chain, and a tree's file count does not
+        # depend on who committed it or when.
+        cmd = 'git log --reverse --topo-order --root --raw --no-renames --diff-merges=first-parent --format="COMMIT %H %T %P" {}'.format(
+            self._since_analyzed(get_commit_range("HEAD"))
+        )
+        files_by_commit: dict[str, int] = {}
+
+        def record(commit: str, tree: str, parent: str | None, delta: int) -> None:
+            if parent is None:
+                count = delta
+            elif parent in files_by_commit:
+                count = files_by_commit[parent] + delta
+            elif tree in files_in_tree:
+                count = files_in_tree[tree]
+            else:
+                count = get_num_of_files_from_rev((0, tree))[2]
+            files_by_commit[commit] = count
+            files_in_tree[tree] = count
+
+        current: tuple[str, str, str | None] | None = None
+        delta = 0
+        for line in iter_pipe_lines(cmd):
+            if line.startswith("COMMIT "):
+                if current is not None:
+                    record(*current, delta)
+                parts = line.split(" ")
+                if len(parts) < 3:
+                    current = None
+                    continue
+                parent = parts[3] if len(parts) > 3 and parts[3] else None
+                current = (parts[1], parts[2], parent)
+                delta = 0
+            elif line.startswith(":"):
+                # ":<old mode> <new mode> <old blob> <new blob> <status>\t<path>"
+                status = line.split("\t", 1)[0].rsplit(" ", 1)[-1]
+                if status.startswith("A"):
+                    delta += 1
+                elif status.startswith("D"):
+                    delta -= 1
+        if current is not None:
+            record(*current, delta)
+
+    def _collect_extensions(self, pool: multiprocessing.pool.Pool | None = None) -> None:
+        """Count files, total size and lines per file extension at HEAD.
+
+        Blobs missing from the caches are counted on ``pool``.
+        """
         # extensions and size of files
-        lines = get_pipe_output(
-            ["git ls-tree -r -l -z {}".format(get_commit_range("HEAD", end_only=True))]
-        ).split("\000")
+        lines = iter_pipe_lines(
+            "git ls-tree -r -l -z {}".format(get_commit_range("HEAD", end_only=True)), sep=b"\0"
+        )
+        lines_in_blob = self.cache.setdefault("lines_in_blob", {})
         blobs_to_read = []
         for line in lines:
             if len(line) == 0:
@@ -612,239 +1316,135 @@ class GitDataCollector(DataCollector):
             if ext not in self.extensions:
                 self.extensions[ext] = {"files": 0, "lines": 0}
             self.extensions[ext]["files"] += 1
-            # if cache empty then add ext and blob id to list of new blob's
-            # otherwise try to read needed info from cache
-            if "lines_in_blob" not in list(self.cache.keys()):
+            # read the line count from the cache, or queue the blob to count it
+            linecount = lines_in_blob.get(blob_id)
+            if linecount is None:
                 blobs_to_read.append((ext, blob_id))
-                continue
-            if blob_id in list(self.cache["lines_in_blob"].keys()):
-                self.extensions[ext]["lines"] += self.cache["lines_in_blob"][blob_id]
             else:
-                blobs_to_read.append((ext, blob_id))
-
-        # Get info about line count for new blob's that wasn't found in cache
-        ext_blob_linecount = parallel_map_with_fallback(get_num_of_lines_in_blob, blobs_to_read)
+                self.extensions[ext]["lines"] += linecount
+
+        # Blobs new to this report may have been counted for another
+        # repository or output directory already
+        shared = get_shared_blob_cache()
+        if shared is not None and blobs_to_read:
+            known = shared.get_many([blob_id for _, blob_id in blobs_to_read])
+            for ext, blob_id in blobs_to_read:
+                if blob_id in known:
+                    lines_in_blob[blob_id] = known[blob_id]
+                    self.extensions[ext]["lines"] += known[blob_id]
+            blobs_to_read = [item for item in blobs_to_read if item[1] not in known]
+
+        # Get info about line count for new blob's that wasn't found in cache.
+        # Each task is a batch of blobs read through one `git cat-file --batch`
+        # process; a few batches per worker keep the load balanced.
+        batch_results = parallel_map_with_fallback(
+            get_num_of_lines_in_blobs, _batched(blobs_to_read, conf["processes"] * 4), pool
+        )
 
         # Update cache and write down info about number of number of lines
-        for ext, blob_id, linecount in ext_blob_linecount:
-            if "lines_in_blob" not in self.cache:
-                self.cache["lines_in_blob"] = {}
-            self.cache["lines_in_blob"][blob_id] = linecount
-            self.extensions[ext]["lines"] += self.cache["lines_in_blob"][blob_id]
-
-    def _collect_line_stats(self) -> None:
+        counted = {}
+        for ext, blob_id, linecount in (item for batch in batch_results for item in batch):
+            lines_in_blob[blob_id] = linecount
+            counted[blob_id] = linecount
+            self.extensions[ext]["lines"] += linecount
+        if shared is not None:
+            shared.put_many(counted)
+
+    def _collect_line_stats(self, table: CommitTable) -> None:
         """Record lines added/removed over time (``changes_by_date``).
 
-        Computed on a linear history when ``linear_linestats`` is enabled, since
+        The walked commits are replayed oldest first to keep a running line
+        total, which resumes from restored statistics. With
+        ``linear_linestats`` only the first-parent chain counts, since
         lines-of-code over time is better measured along the mainline.
         """
-        # line statistics
-        # outputs:
-        #  N files changed, N insertions (+), N deletions(-)
-        # <stamp> <author>
-        self.changes_by_date = {}  # stamp -> { files, ins, del }
-        # computation of lines of code by date is better done
-        # on a linear history.
-        extra = ""
-        if conf["linear_linestats"]:
-            extra = "--first-parent -m"
-        lines = get_pipe_output(
-            [
-                'git log --shortstat {} --pretty=format:"%at %aN" {}'.format(
-                    extra, get_log_range("HEAD", False)
-                )
-            ]
-        ).split("\n")
-        lines.reverse()
-        files = 0
-        inserted = 0
-        deleted = 0
-        total_lines = 0
-        for line in lines:
-            if len(line) == 0:
-                continue
-
-            # <stamp> <author>; only the stamp matters here, the author is
-            # attributed in _collect_per_author_line_stats
-            if re.search("files? changed", line) is None:
-                pos = line.find(" ")
-                if pos != -1:
-                    try:
-                        stamp = int(line[:pos])
-                        self.changes_by_date[stamp] = {
-                            "files": files,
-                            "ins": inserted,
-                            "del": deleted,
-                            "lines": total_lines,
-                        }
-
-                        date = datetime.datetime.fromtimestamp(stamp)
-                        yymm = date.strftime("%Y-%m")
-                        self.lines_added_by_month[yymm] = (
-                            self.lines_added_by_month.get(yymm, 0) + inserted
-                        )
-                        self.lines_removed_by_month[yymm] = (
-                            self.lines_removed_by_month.get(yymm, 0) + deleted
-                        )
-
-                        yy = date.year
-                        self.lines_added_by_year[yy] = (
-                            self.lines_added_by_year.get(yy, 0) + inserted
-                        )
-                        self.lines_removed_by_year[yy] = (
-                            self.lines_removed_by_year.get(yy, 0) + deleted
-                        )
-
-                        files, inserted, deleted = 0, 0, 0
-                    except ValueError:
-                        logger.warning(f'Unexpected line "{line}"')
-                else:
-                    logger.warning(f'Unexpected line "{line}"')
-            else:
-                numbers = get_stat_summary_counts(line)
-
-                if len(numbers) == 3:
-                    (files, inserted, deleted) = [int(el) for el in numbers]
-                    total_lines += inserted
-                    total_lines -= deleted
-                    self.total_lines_added += inserted
-                    self.total_lines_removed += deleted
-
-                else:
-                    logger.warning(f'Failed to handle line "{line}"')
-                    (files, inserted, deleted) = (0, 0, 0)
-        self.total_lines += total_lines
-
-    def _collect_per_author_line_stats(self, name_to_canonical: dict[str, str]) -> None:
+        rows = table.rows(MAINLINE if conf["linear_linestats"] else 0, oldest_first=True)
+        stamps = take(table.stamps, rows)
+        files = take(table.files, rows)
+        inserted = take(table.inserted, rows)
+        deleted = take(table.deleted, rows)
+        totals = running_totals(inserted, deleted, self.total_lines)
+        for stamp, changed, ins, dels, total in zip(stamps, files, inserted, deleted, totals):
+            self.changes_by_date[stamp] = {
+                "files": changed,
+                "ins": ins,
+                "del": dels,
+                "lines": total,
+            }
+        if totals:
+            self.total_lines = totals[-1]
+        self.total_lines_added += sum(inserted)
+        self.total_lines_removed += sum(deleted)
+
+        days = take(table.days, rows)
+        removed_by_day = group_sums(days, deleted)
+        for day, added in group_sums(days, inserted).items():
+            removed = removed_by_day[day]
+            _, _, yy, _, yymm, _ = day_keys(day)
+            self.lines_added_by_month[yymm] = self.lines_added_by_month.get(yymm, 0) + added
+            self.lines_removed_by_month[yymm] = self.lines_removed_by_month.get(yymm, 0) + removed
+
+            self.lines_added_by_year[yy] = self.lines_added_by_year.get(yy, 0) + added
+            self.lines_removed_by_year[yy] = self.lines_removed_by_year.get(yy, 0) + removed
+
+    def _collect_per_author_line_stats(
+        self, table: CommitTable, name_to_canonical: dict[str, str]
+    ) -> None:
         """Record each author's commits and line counts over time.
 
-        Unlike :meth:`_collect_line_stats` this never uses ``--first-parent``:
-        every commit must be walked to know who committed what, not just the
-        mainline.
+        Unlike :meth:`_collect_line_stats` this covers every commit, not just
+        the mainline: every commit must be counted to know who committed what.
+        Merges count as commits without lines. The walked commits are replayed
+        oldest first, with authors resolved to their canonical identity, after
+        any restored statistics.
         """
-        # defined for stamp, author only if author committed at this timestamp.
-        self.changes_by_date_by_author = {}  # stamp -> author -> lines_added
-
-        lines = get_pipe_output(
-            [
-                'git log --shortstat --date-order --pretty=format:"%at %aN" {}'.format(
-                    get_log_range("HEAD", False)
-                )
-            ]
-        ).split("\n")
-        lines.reverse()
-        inserted = 0
-        deleted = 0
-        author = None
-        stamp = 0
-        for line in lines:
-            if len(line) == 0:
-                continue
-
-            # <stamp> <author>
-            if re.search("files? changed", line) is None:
-                pos = line.find(" ")
-                if pos != -1:
-                    try:
-                        oldstamp = stamp
-                        (stamp, author) = (int(line[:pos]), line[pos + 1 :])
-                        author = name_to_canonical.get(author, author)
-                        if oldstamp > stamp:
-                            # clock skew, keep old timestamp to avoid having ugly graph
-                            stamp = oldstamp
-                        if author not in self.authors:
-                            self.authors[author] = {
-                                "lines_added": 0,
-                                "lines_removed": 0,
-                                "commits": 0,
-                            }
-                        self.authors[author]["commits"] = self.authors[author].get("commits", 0) + 1
-                        self.authors[author]["lines_added"] = (
-                            self.authors[author].get("lines_added", 0) + inserted
-                        )
-                        self.authors[author]["lines_removed"] = (
-                            self.authors[author].get("lines_removed", 0) + deleted
-                        )
-                        if stamp not in self.changes_by_date_by_author:
-                            self.changes_by_date_by_author[stamp] = {}
-                        if author not in self.changes_by_date_by_author[stamp]:
-                            self.changes_by_date_by_author[stamp][author] = {}
-                        self.changes_by_date_by_author[stamp][author]["lines_added"] = self.authors[
-                            author
-                        ]["lines_added"]
-                        self.changes_by_date_by_author[stamp][author]["commits"] = self.authors[
-                            author
-                        ]["commits"]
-                        inserted, deleted = 0, 0
-                    except ValueError:
-                        logger.warning(f'Unexpected line "{line}"')
-                else:
-                    logger.warning(f'Unexpected line "{line}"')
+        canonical = [name_to_canonical.get(name, name) for name in table.author_names]
+        # changes_by_date_by_author is defined for stamp, author only if
+        # author committed at this timestamp.
+        stamp = max(self.changes_by_date_by_author, default=0)
+        for i in table.rows(oldest_first=True):
+            author = canonical[table.authors[i]]
+            if table.flags[i] & MERGE:
+                inserted, deleted = 0, 0
             else:
-                numbers = get_stat_summary_counts(line)
-
-                if len(numbers) == 3:
-                    # the file count is unused here; only line deltas matter
-                    (_, inserted, deleted) = [int(el) for el in numbers]
-                else:
-                    logger.warning(f'Failed to handle line "{line}"')
-                    (inserted, deleted) = (0, 0)
-
-    def _collect_file_churn_and_ownership(self, name_to_canonical: dict[str, str]) -> None:
-        """Record how often each file changes and who changes it.
-
-        A single name-only pass drives two metrics:
-        ``file_churn`` (commits touching each file) and ``author_files``
-        (which files each author touches, for code ownership). Each commit is
-        prefixed with a ``COMMIT:<author>`` marker line; the lines that follow
-        are the file paths changed by that commit. Authors are resolved to their
-        canonical identity so aliases merge here directly.
-        """
-        churn_output = get_pipe_output(
-            ['git log --format="COMMIT:%aN" --name-only {}'.format(get_log_range("HEAD", False))]
-        )
-        current_author = None
-        for line in churn_output.split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-            if line.startswith("COMMIT:"):
-                current_author = name_to_canonical.get(line[7:], line[7:])
-                continue
-            # A changed-file line.
-            self.file_churn[line] = self.file_churn.get(line, 0) + 1
-            if current_author:
-                author_map = self.author_files.setdefault(current_author, {})
-                author_map[line] = author_map.get(line, 0) + 1
+                inserted, deleted = table.inserted[i], table.deleted[i]
+            # clock skew, keep old timestamp to avoid having ugly graph
+            stamp = max(stamp, table.stamps[i])
+            if author not in self.authors:
+                self.authors[author] = {
+                    "lines_added": 0,
+                    "lines_removed": 0,
+                    "commits": 0,
+                }
+            self.authors[author]["commits"] = self.authors[author].get("commits", 0) + 1
+            self.authors[author]["lines_added"] = (
+                self.authors[author].get("lines_added", 0) + inserted
+            )
+            self.authors[author]["lines_removed"] = (
+                self.authors[author].get("lines_removed", 0) + deleted
+            )
+            if stamp not in self.changes_by_date_by_author:
+                self.changes_by_date_by_author[stamp] = {}
+            if author not in self.changes_by_date_by_author[stamp]:
+                self.changes_by_date_by_author[stamp][author] = {}
+            self.changes_by_date_by_author[stamp][author]["lines_added"] = self.authors[author][
+                "lines_added"
+            ]
+            self.changes_by_date_by_author[stamp][author]["commits"] = self.authors[author][
+                "commits"
+            ]
 
-    def _collect_commit_subjects(self) -> None:
+    def _collect_commit_subjects(self, subjects_by_year: dict[int, list[str]]) -> None:
         """Sample commit subjects per year to ground the AI chronicle.
 
-        One subjects-only pass in chronological order; each year keeps an
-        evenly spaced sample so the whole span stays represented no matter
-        how large the repository is. Only runs when AI features are enabled.
+        ``subjects_by_year`` comes newest first from :meth:`_walk_history`;
+        each year keeps an evenly spaced, chronological sample so the whole
+        span stays represented no matter how large the repository is. Only
+        runs when AI features are enabled.
         """
-        output = get_pipe_output(
-            ['git log --reverse --format="%at %s" {}'.format(get_log_range("HEAD", False))]
-        )
-        by_year: dict[int, list[str]] = {}
-        for line in output.split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-            pos = line.find(" ")
-            if pos == -1:
-                continue
-            try:
-                year = datetime.datetime.fromtimestamp(int(line[:pos])).year
-            except ValueError:
-                continue
-            subject = line[pos + 1 :].strip()
-            if subject:
-                by_year.setdefault(year, []).append(subject[:100])
-
         self.commit_subjects_by_year = {
-            year: _sample_evenly(subjects, 10) for year, subjects in by_year.items()
+            year: _sample_evenly(subjects[::-1], 10)
+            for year, subjects in sorted(subjects_by_year.items())
         }
 
     def refine(self) -> None:
@@ -861,8 +1461,8 @@ class GitDataCollector(DataCollector):
             date_first = datetime.datetime.fromtimestamp(a["first_commit_stamp"])
             date_last = datetime.datetime.fromtimestamp(a["last_commit_stamp"])
             delta = date_last - date_first
-            a["date_first"] = date_first.strftime("%Y-%m-%d")
-            a["date_last"] = date_last.strftime("%Y-%m-%d")
+            a["date_first"] = date_label(a["first_commit_stamp"])
+            a["date_last"] = date_label(a["last_commit_stamp"])
             a["timedelta"] = delta
             if "lines_added" not in a:
                 a["lines_added"] = 0
@@ -873,9 +1473,7 @@ class GitDataCollector(DataCollector):
         for name in self.authors:
             a = self.authors[name]
             if "first_commit_stamp" in a:
-                first_month = datetime.datetime.fromtimestamp(a["first_commit_stamp"]).strftime(
-                    "%Y-%m"
-                )
+                first_month = stamp_keys(a["first_commit_stamp"])[4]
                 self.new_contributors_by_month[first_month] = (
                     self.new_contributors_by_month.get(first_month, 0) + 1
                 )
@@ -912,9 +1510,11 @@ class GitDataCollector(DataCollector):
         return self.authors[author]
 
     def get_authors(self, limit: int | None = None) -> list[str]:
-        res = get_keys_sorted_by_value_key(self.authors, "commits")
-        res.reverse()
-        return res[:limit]
+        """Authors by commits, most first; reuses the ranking made by :meth:`refine`."""
+        if len(self.authors_by_commits) == len(self.authors):
+            return self.authors_by_commits[:limit]
+        authors = self.authors
+        return top_k(authors, limit, key=lambda name: (authors[name]["commits"], name))
 
     def get_commit_delta_days(self) -> float:
         return (self.last_commit_stamp / 86400 - self.first_commit_stamp / 86400) + 1
@@ -955,7 +1555,7 @@ class GitDataCollector(DataCollector):
 
     def rev_to_date(self, rev: str) -> str:
         stamp = int(get_pipe_output([f'git log --pretty=format:%at "{rev}" -n 1']))
-        return datetime.datetime.fromtimestamp(stamp).strftime("%Y-%m-%d")
+        return date_label(stamp)
 
 
 def _prepare_output_dir(path: str) -> str:
@@ -982,6 +1582,8 @@ def _run_single_repo(
     extra_fmt: str | None = None,
     project_name: str | None = None,
     json_sibling: bool = True,
+    from_snapshot: bool = False,
+    assets_root: str | None = None,
 ) -> DataCollector:
     """Collect, refine and render the full report for one repository.
 
@@ -994,6 +1596,10 @@ def _run_single_repo(
             rename every repository identically)
         json_sibling: write the extra JSON next to the output directory
             (single-repo behavior) instead of inside it
+        from_snapshot: render from the snapshot a previous run left in
+            ``outputpath`` instead of collecting from the repository
+        assets_root: directory holding the static assets shared by all
+            reports of a multi-repo run (see the ``shared_assets`` option)
     Returns:
         the populated collector
     """
@@ -1003,25 +1609,35 @@ def _run_single_repo(
 
     logger.info(f"Output path: {outputpath}")
     cachefile = os.path.join(outputpath, "gitstats.cache")
+    snapshotfile = os.path.join(outputpath, "gitstats.snapshot")
+    profiling.reset()
 
     data = GitDataCollector()
-    data.load_cache(cachefile)
+    if from_snapshot:
+        data.load_snapshot(snapshotfile)
+    else:
+        data.load_cache(cachefile)
 
-    logger.info(f"Git path: {gitpath}")
-    prevdir = os.getcwd()
-    os.chdir(gitpath)
-    try:
-        logger.info("Collecting data...")
-        data.collect(gitpath)
-    finally:
-        os.chdir(prevdir)
+        logger.info(f"Git path: {gitpath}")
+        prevdir = os.getcwd()
+        os.chdir(gitpath)
+        try:
+            logger.info("Collecting data...")
+            with profiling.phase("collect"):
+                data.collect(gitpath)
+        finally:
+            os.chdir(prevdir)
 
     if project_name is not None:
         data.project_name = project_name
 
-    logger.info("Refining data...")
-    data.save_cache(cachefile)
-    data.refine()
+    if not from_snapshot:
+        logger.info("Refining data...")
+        with profiling.phase("refine"):
+            data.save_cache(cachefile)
+            data.refine()
+            if conf["snapshot"]:
+                data.save_snapshot(snapshotfile)
 
     # Generate AI summaries if enabled
     if conf.get("ai_enabled", False):
@@ -1030,7 +1646,8 @@ def _run_single_repo(
             summarizer = AISummarizer(conf)
             summarizer.set_cache_dir(os.path.join(outputpath, ".ai_cache"))
             force_refresh = conf.get("refresh_ai", False)
-            data.ai_summaries = summarizer.generate_all_summaries(data.__dict__, force_refresh)
+            with profiling.phase("ai summaries"):
+                data.ai_summaries = summarizer.generate_all_summaries(data.__dict__, force_refresh)
             logger.info("AI summaries generated successfully")
         except Exception as e:
             logger.warning(f"Failed to generate AI summaries: {str(e)}")
@@ -1041,7 +1658,17 @@ def _run_single_repo(
 
     logger.info("Generating report...")
     html_report = HTMLReportCreator()
-    html_report.create(data, outputpath)
+    html_report.assets_root = assets_root
+    with profiling.phase("render"):
+        html_report.create(data, outputpath)
+
+    if profiling.is_enabled():
+        profile = profiling.get_profile()
+        logger.info(f"Writing profile: {profiling.write_profile(profile, outputpath)}")
+        html_report.create_diagnostics_html(profile, outputpath)
+
+    with profiling.phase("publish"):
+        publish(outputpath)
 
     if extra_fmt:
         if extra_fmt == "json":
@@ -1068,10 +1695,15 @@ def _dump_json_within(directory: str, filename: str, data: DataCollector) -> Non
         raise ValueError(f"Refusing to write outside output directory: {filename}")
     logger.info(f'Generating JSON file: "{target}"')
     with open(target, "w", encoding="utf-8") as file:
-        json.dump(data.__dict__, file, default=str)
+        state = {name: value for name, value in data.__dict__.items() if name not in _JSON_SKIP}
+        cache = state.get("cache")
+        if isinstance(cache, Mapping):
+            # the incremental state is only for resuming the next collection
+            state["cache"] = {key: value for key, value in cache.items() if key != "history"}
+        json.dump(state, file, default=lambda o: dict(o) if isinstance(o, Mapping) else str(o))
 
 
-def run(gitpath, outputpath, extra_fmt=None) -> int:
+def run(gitpath, outputpath, extra_fmt=None, from_snapshot=False) -> int:
     """Run the gitstats program.
 
     With one repository path the report lands directly in ``outputpath``
@@ -1083,6 +1715,8 @@ def run(gitpath, outputpath, extra_fmt=None) -> int:
         gitpath: list of paths to git repositories
         outputpath: path to the output directory
         extra_fmt: extra format
+        from_snapshot: render from the snapshots an earlier run left in the
+            output directories, without reading the repositories
     Returns:
         0 if at least one repository was analyzed, 1 otherwise
     """
@@ -1093,24 +1727,28 @@ def run(gitpath, outputpath, extra_fmt=None) -> int:
         logger.error("FATAL: Output path is not a directory or does not exist")
         return 1
 
+    profiling.enable(bool(conf.get("profile", False)))
     exit_code = 0
     try:
         if len(gitpath) == 1:
             try:
-                data = _run_single_repo(gitpath[0], outputpath, extra_fmt)
+                data = _run_single_repo(
+                    gitpath[0], outputpath, extra_fmt, from_snapshot=from_snapshot
+                )
             except RuntimeError as e:
                 logger.error(f"FATAL: {e}")
                 return 1
             write_repo_summary(compute_repo_summary(data, "index.html"), outputpath)
         else:
-            exit_code = _run_multi_repo(gitpath, outputpath, extra_fmt)
+            exit_code = _run_multi_repo(gitpath, outputpath, extra_fmt, from_snapshot)
     finally:
         os.chdir(rundir)
 
     time_end = time.time()
     exectime_internal = time_end - time_start
+    exectime_external = profiling.external_time()
     logger.info(
-        f"Execution time {exectime_internal:.5f} secs, {exectime_external:.5f} secs ({(100.0 * exectime_external) / exectime_internal:.2f} %) in external commands)"
+        f"Execution time {exectime_internal:.5f} secs, {exectime_external:.5f} secs ({(100.0 * exectime_external) / exectime_internal:.2f} %) in external commands, summed over parallel processes)"
     )
     if sys.stdin.isatty():
         python_cmd = "python" if os.name == "nt" else "python3"
@@ -1121,11 +1759,24 @@ def run(gitpath, outputpath, extra_fmt=None) -> int:
     return exit_code
 
 
-def _run_multi_repo(gitpaths: list, outputpath: str, extra_fmt=None) -> int:
+def _run_multi_repo(gitpaths: list, outputpath: str, extra_fmt=None, from_snapshot=False) -> int:
     """Analyze several repositories and assemble the portfolio page."""
-    summaries = []
     failures = []
     seen_slugs: dict[str, int] = {}
+    assets_root = None
+    if conf["shared_assets"] not in ("", "link", "reference"):
+        logger.error(f"FATAL: Unknown shared_assets mode '{conf['shared_assets']}'")
+        return 1
+    jobs = conf["jobs"]
+    if not isinstance(jobs, int) or jobs < 1:
+        logger.error(f"FATAL: jobs must be a positive number, not '{jobs}'")
+        return 1
+    if conf["shared_assets"]:
+        # the repository reports link to or load the root's assets
+        AggregateReportCreator._copy_assets(outputpath)
+        assets_root = outputpath
+
+    repos = []
     for path in gitpaths:
         try:
             slug = _slugify_repo(path)
@@ -1137,22 +1788,71 @@ def _run_multi_repo(gitpaths: list, outputpath: str, extra_fmt=None) -> int:
         seen_slugs[slug] = count
         if count > 1:
             slug = f"{slug}-{count}"
-        repo_outdir = os.path.join(outputpath, slug)
+        repos.append((path, slug))
+
+    estimates: list[dict[str, int] | None]
+    if from_snapshot:
+        # nothing is read from the repositories, not even their size
+        estimates = [None] * len(repos)
+    else:
+        with ThreadPoolExecutor(max_workers=max(1, conf["processes"])) as executor:
+            estimates = list(executor.map(estimate_repo, [path for path, _ in repos]))
+    schedule = RepoSchedule(
+        [(path, slug, estimate) for (path, slug), estimate in zip(repos, estimates)],
+        load_portfolio_summary(outputpath),
+    )
+
+    tasks = [
+        (path, slug, os.path.join(outputpath, slug), extra_fmt, from_snapshot, assets_root)
+        for path, slug in repos
+    ]
+    in_processes = jobs > 1 or conf["repo_timeout"] > 0
+    if in_processes and "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("Processes cannot be forked here, analyzing one repository at a time")
+        in_processes = False
+    message = f"Analyzing {len(tasks)} repositories, largest first"
+    if schedule.calibrated:
+        expected = datetime.timedelta(seconds=round(schedule.makespan(jobs if in_processes else 1)))
+        message += f", expected to take about {expected}"
+    logger.info(message)
+    if in_processes:
+        # the workers share blob line counts through a temporary SQLite file
+        directory = tempfile.mkdtemp(prefix="gitstats-")
+        blob_cache = os.path.join(directory, "blobs.sqlite")
         try:
-            data = _run_single_repo(
-                path,
-                repo_outdir,
-                extra_fmt,
-                project_name=slug,
-                json_sibling=False,
+            # created up front rather than by workers racing to
+            SharedBlobCache(
+                blob_cache, LINE_COUNT_VERSION, conf["shared_cache_max_entries"]
+            ).close()
+            outcomes = _analyze_repos_in_processes(
+                tasks, jobs, conf["repo_timeout"], schedule, blob_cache
             )
-        except Exception as e:
-            logger.warning(f"Skipping repository {path!r}: {e}")
-            failures.append({"name": slug, "path": path, "error": str(e)})
-            continue
-        summary = compute_repo_summary(data, f"{slug}/index.html")
-        write_repo_summary(summary, repo_outdir)
-        summaries.append(summary)
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+    else:
+        outcomes = [None] * len(tasks)
+        # count blobs shared between the repositories (forks, vendored code) once
+        with shared_blob_cache_for_run():
+            for index in schedule.order:
+                schedule.started(index)
+                try:
+                    outcomes[index] = _analyze_repo(*tasks[index])
+                except Exception as e:
+                    outcomes[index] = str(e)
+                schedule.finished(index, outcomes[index])
+    if not from_snapshot:
+        # estimates and durations for scheduling the next run; a run from
+        # snapshots only rendered, so it leaves them as they were
+        write_portfolio_summary(schedule.portfolio_summary(), outputpath)
+
+    # outcomes are in input order however long each repository took
+    summaries = []
+    for (path, slug), outcome in zip(repos, outcomes):
+        if isinstance(outcome, str):
+            logger.warning(f"Skipping repository {path!r}: {outcome}")
+            failures.append({"name": slug, "path": path, "error": outcome})
+        else:
+            summaries.append(outcome)
 
     if not summaries:
         logger.error("FATAL: No repository could be analyzed")
@@ -1160,9 +1860,112 @@ def _run_multi_repo(gitpaths: list, outputpath: str, extra_fmt=None) -> int:
 
     logger.info("Generating portfolio page...")
     AggregateReportCreator().create(summaries, failures, outputpath)
+    # the repository reports were published as they were written
+    publish(outputpath, recursive=False)
     return 0
 
 
+def _analyze_repo(
+    path: str,
+    slug: str,
+    repo_outdir: str,
+    extra_fmt: str | None,
+    from_snapshot: bool,
+    assets_root: str | None,
+) -> dict[str, Any]:
+    """Write the report and ``summary.json`` of one repository of a multi-repo run."""
+    data = _run_single_repo(
+        path,
+        repo_outdir,
+        extra_fmt,
+        project_name=slug,
+        json_sibling=False,
+        from_snapshot=from_snapshot,
+        assets_root=assets_root,
+    )
+    summary = compute_repo_summary(data, f"{slug}/index.html")
+    write_repo_summary(summary, repo_outdir)
+    return summary
+
+
+def _analyze_repo_worker(sender, task: tuple, blob_cache: str) -> None:
+    """Process analyzing one repository; sends back its summary or an error message."""
+    # lead a process group, so a timeout also stops the git commands and
+    # collection processes started from here
+    os.setpgrp()
+    slug = task[1]
+    for handler in logging.getLogger().handlers:
+        handler.setFormatter(logging.Formatter(f"[{slug}] %(message)s"))
+    outcome: dict[str, Any] | str
+    try:
+        with shared_blob_cache_for_run(blob_cache):
+            outcome = _analyze_repo(*task)
+    except Exception as e:
+        outcome = str(e)
+    sender.send(outcome)
+    sender.close()
+
+
+def _analyze_repos_in_processes(
+    tasks: list[tuple], jobs: int, timeout: int, schedule: RepoSchedule, blob_cache: str
+) -> list:
+    """Run :func:`_analyze_repo` for ``tasks``, each in its own forked process.
+
+    Tasks start in the order of ``schedule``, at most ``jobs`` at once; one
+    still running after ``timeout`` seconds (0 = no limit) is stopped. The
+    workers share blob line counts through the SQLite file ``blob_cache``.
+    Returns per task, in input order, the summary or an error message.
+    """
+    context = multiprocessing.get_context("fork")
+    outcomes: list = [None] * len(tasks)
+    pending = deque((index, tasks[index]) for index in schedule.order)
+    running: dict[Connection, tuple[int, Any, float | None]] = {}
+    while pending or running:
+        while pending and len(running) < jobs:
+            index, task = pending.popleft()
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_analyze_repo_worker, args=(sender, task, blob_cache))
+            process.start()
+            # only the worker may hold the sending end, so that the receiving
+            # end sees end-of-file if the worker dies
+            sender.close()
+            schedule.started(index)
+            deadline = time.monotonic() + timeout if timeout > 0 else None
+            running[receiver] = (index, process, deadline)
+            logger.info(f"Analyzing {task[0]} ({len(running)} of at most {jobs} running)")
+
+        deadlines = [deadline for _, _, deadline in running.values() if deadline is not None]
+        wait_time = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+        ready = multiprocessing.connection.wait(list(running), wait_time)
+        for receiver in [receiver for receiver in running if receiver in ready]:
+            index, process, _ = running.pop(receiver)
+            try:
+                outcomes[index] = receiver.recv()
+            except EOFError:
+                outcomes[index] = None
+            receiver.close()
+            process.join()
+            if outcomes[index] is None:
+                outcomes[index] = f"Analysis process exited with code {process.exitcode}"
+            schedule.finished(index, outcomes[index])
+
+        now = time.monotonic()
+        for receiver, (index, process, deadline) in list(running.items()):
+            if deadline is None or now < deadline:
+                continue
+            del running[receiver]
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+            except OSError:
+                # not yet leading its own group
+                process.terminate()
+            process.join()
+            receiver.close()
+            outcomes[index] = f"Analysis timed out after {timeout} seconds"
+            schedule.finished(index, outcomes[index])
+    return outcomes
+
+
 def get_parser() -> argparse.ArgumentParser:
     """Get the parser for the command line arguments."""
     parser = argparse.ArgumentParser(
@@ -1255,6 +2058,29 @@ def get_parser() -> argparse.ArgumentParser:
         help="Force refresh AI-generated summaries (ignore cache)",
     )
 
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Time every git command and phase; writes profile.json and a Run diagnostics page",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="Number of repositories of a multi-repository run analyzed at once (default: 1)",
+    )
+
+    parser.add_argument(
+        "--from-snapshot",
+        action="store_true",
+        help=(
+            "Skip collection and render the report from the snapshot (gitstats.snapshot) "
+            "a previous run left in the output directory"
+        ),
+    )
+
     return parser
 
 
@@ -1315,8 +2141,12 @@ def main() -> int:
 
     # Handle AI CLI arguments (CLI takes precedence over config)
     _apply_ai_args(conf, args)
+    if args.profile:
+        conf["profile"] = 1
+    if args.jobs is not None:
+        conf["jobs"] = args.jobs
 
-    return run(gitpath, outputpath, extra_fmt=extra_fmt)
+    return run(gitpath, outputpath, extra_fmt=extra_fmt, from_snapshot=args.from_snapshot)
 
 
 if __name__ == "__main__":
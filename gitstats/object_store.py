@@ -0,0 +1,420 @@
+"""
+In-process reader for the git object database.
+
+Reads loose objects and packfiles directly, with ``.pack``/``.idx`` files
+mmapped and deltas resolved in Python, so read-heavy phases do not have to
+spawn ``git`` at all. Repositories using features the reader does not
+support (SHA-256 object names, partial clones, alternate object directories
+set through the environment) raise :class:`ObjectStoreError` on open, and
+callers fall back to the git CLI.
+"""
+
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+
+logger = logging.getLogger("gitstats")
+
+_OBJ_OFS_DELTA = 6
+_OBJ_REF_DELTA = 7
+_TYPE_NAMES = {1: "commit", 2: "tree", 3: "blob", 4: "tag"}
+_TYPE_NUMBERS = {name: num for num, name in _TYPE_NAMES.items()}
+_IDX_MAGIC = b"\377tOc"
+_INFLATE_CHUNK = 1 << 16
+_BASE_CACHE_BYTES = 32 << 20
+
+
+class ObjectStoreError(Exception):
+    """The object database cannot be read in-process."""
+
+    pass
+
+
+def find_git_dir(path: str) -> str:
+    """Return the git directory of the repository containing ``path``."""
+    path = os.path.abspath(path)
+    while True:
+        dotgit = os.path.join(path, ".git")
+        if os.path.isdir(dotgit):
+            return dotgit
+        if os.path.isfile(dotgit):
+            # worktrees and submodules: "gitdir: <path>"
+            with open(dotgit, encoding="utf-8") as f:
+                line = f.readline().strip()
+            if not line.startswith("gitdir:"):
+                raise ObjectStoreError(f"unrecognized {dotgit}")
+            return os.path.normpath(os.path.join(path, line[len("gitdir:") :].strip()))
+        if os.path.isfile(os.path.join(path, "HEAD")) and os.path.isdir(
+            os.path.join(path, "objects")
+        ):
+            return path  # bare repository
+        parent = os.path.dirname(path)
+        if parent == path:
+            raise ObjectStoreError("not inside a git repository")
+        path = parent
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Read a little-endian base-128 integer (delta headers)."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, pos
+
+
+def _apply_delta(base: bytes, delta: bytes) -> bytes:
+    """Rebuild an object from its delta base and a git delta."""
+    src_size, pos = _read_varint(delta, 0)
+    dst_size, pos = _read_varint(delta, pos)
+    if src_size != len(base):
+        raise ObjectStoreError("delta base size mismatch")
+    out = bytearray()
+    end = len(delta)
+    while pos < end:
+        cmd = delta[pos]
+        pos += 1
+        if cmd & 0x80:
+            # copy from base: bits 0-3 select offset bytes, bits 4-6 size bytes
+            offset = size = 0
+            for i in range(4):
+                if cmd & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if cmd & (0x10 << i):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset : offset + (size or 0x10000)]
+        elif cmd:
+            # insert the next `cmd` bytes of the delta
+            out += delta[pos : pos + cmd]
+            pos += cmd
+        else:
+            raise ObjectStoreError("invalid delta opcode")
+    if len(out) != dst_size:
+        raise ObjectStoreError("delta result size mismatch")
+    return bytes(out)
+
+
+def _tree_entries(data: bytes):
+    """Yield ``(mode, sha)`` for each entry of raw tree content."""
+    pos = 0
+    end = len(data)
+    while pos < end:
+        space = data.index(b" ", pos)
+        nul = data.index(b"\0", space)
+        yield data[pos:space], data[nul + 1 : nul + 21]
+        pos = nul + 21
+
+
+class _Pack:
+    """An mmapped ``.pack`` file and its version 2 ``.idx``."""
+
+    def __init__(self, idx_path: str, pack_path: str) -> None:
+        with open(idx_path, "rb") as f:
+            self.idx = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(pack_path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.idx[:4] != _IDX_MAGIC or struct.unpack(">I", self.idx[4:8])[0] != 2:
+            raise ObjectStoreError(f"unsupported pack index {idx_path}")
+        if self.data[:4] != b"PACK" or struct.unpack(">I", self.data[4:8])[0] not in (2, 3):
+            raise ObjectStoreError(f"unsupported pack {pack_path}")
+        self.fanout = struct.unpack(">256I", self.idx[8:1032])
+        count = self.fanout[255]
+        self.sha_start = 1032
+        # 20-byte names, then 4-byte CRCs, then 4-byte offsets, then 8-byte large offsets
+        self.offset_start = self.sha_start + 24 * count
+        self.large_offset_start = self.offset_start + 4 * count
+
+    def find(self, sha: bytes) -> int | None:
+        """Return the pack offset of an object, or None if it is not in this pack."""
+        lo = self.fanout[sha[0] - 1] if sha[0] else 0
+        hi = self.fanout[sha[0]]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = self.sha_start + 20 * mid
+            candidate = self.idx[pos : pos + 20]
+            if candidate < sha:
+                lo = mid + 1
+            elif candidate > sha:
+                hi = mid
+            else:
+                pos = self.offset_start + 4 * mid
+                (offset,) = struct.unpack(">I", self.idx[pos : pos + 4])
+                if offset & 0x80000000:
+                    pos = self.large_offset_start + 8 * (offset & 0x7FFFFFFF)
+                    (offset,) = struct.unpack(">Q", self.idx[pos : pos + 8])
+                return offset
+        return None
+
+    def object_header(self, offset: int) -> tuple[int, int, int]:
+        """Return ``(type, size, data position)`` of the object at ``offset``."""
+        byte = self.data[offset]
+        type_num = (byte >> 4) & 7
+        size = byte & 0x0F
+        shift = 4
+        pos = offset + 1
+        while byte & 0x80:
+            byte = self.data[pos]
+            pos += 1
+            size |= (byte & 0x7F) << shift
+            shift += 7
+        return type_num, size, pos
+
+    def delta_base_distance(self, pos: int) -> tuple[int, int]:
+        """Read the base distance of an OFS_DELTA; returns ``(distance, data position)``."""
+        byte = self.data[pos]
+        pos += 1
+        distance = byte & 0x7F
+        while byte & 0x80:
+            byte = self.data[pos]
+            pos += 1
+            distance = ((distance + 1) << 7) | (byte & 0x7F)
+        return distance, pos
+
+    def inflate(self, pos: int, size: int) -> bytes:
+        """Decompress the zlib stream at ``pos`` that inflates to ``size`` bytes."""
+        decompressor = zlib.decompressobj()
+        parts = []
+        # the compressed stream is rarely larger than its content
+        chunk_size = size + 64
+        while not decompressor.eof:
+            chunk = self.data[pos : pos + chunk_size]
+            if not chunk:
+                raise ObjectStoreError("truncated pack")
+            parts.append(decompressor.decompress(chunk))
+            pos += len(chunk)
+            chunk_size = _INFLATE_CHUNK
+        data = b"".join(parts)
+        if len(data) != size:
+            raise ObjectStoreError("object size mismatch")
+        return data
+
+    def close(self) -> None:
+        self.idx.close()
+        self.data.close()
+
+
+class GitObjectStore:
+    """Reads objects of one repository without running git.
+
+    Packs are mmapped once; delta bases are kept in a small LRU cache, since
+    neighbouring objects of a delta chain are usually read together. Reads
+    are serialized with a lock, so one store can be shared between threads.
+    """
+
+    def __init__(self, git_dir: str) -> None:
+        if os.environ.get("GIT_OBJECT_DIRECTORY") or os.environ.get(
+            "GIT_ALTERNATE_OBJECT_DIRECTORIES"
+        ):
+            raise ObjectStoreError("object directories set through the environment")
+        common_dir = git_dir
+        commondir_file = os.path.join(git_dir, "commondir")
+        if os.path.isfile(commondir_file):
+            with open(commondir_file, encoding="utf-8") as f:
+                common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+        self._check_config(os.path.join(common_dir, "config"))
+
+        objects_dir = os.path.join(common_dir, "objects")
+        if not os.path.isdir(objects_dir):
+            raise ObjectStoreError(f"no object directory in {common_dir}")
+        self._objects_dirs = [objects_dir] + self._alternates(objects_dir)
+
+        self._packs: list[_Pack] = []
+        try:
+            for directory in self._objects_dirs:
+                self._open_packs(os.path.join(directory, "pack"))
+        except (OSError, ValueError, struct.error) as e:
+            self.close()
+            raise ObjectStoreError(f"cannot open pack: {e}") from e
+        except ObjectStoreError:
+            self.close()
+            raise
+
+        self._bases: OrderedDict[tuple[int, int], tuple[int, bytes]] = OrderedDict()
+        self._bases_size = 0
+        self._tree_file_counts: dict[bytes, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _check_config(config_path: str) -> None:
+        try:
+            with open(config_path, encoding="utf-8", errors="replace") as f:
+                config = f.read()
+        except OSError:
+            return
+        object_format = re.search(r"^\s*objectformat\s*=\s*(\S+)", config, re.I | re.M)
+        if object_format and object_format.group(1).lower() != "sha1":
+            raise ObjectStoreError(f"unsupported object format {object_format.group(1)}")
+        if re.search(r"^\s*partialclone\s*=", config, re.I | re.M):
+            raise ObjectStoreError("partial clone")
+
+    @staticmethod
+    def _alternates(objects_dir: str) -> list[str]:
+        try:
+            with open(os.path.join(objects_dir, "info", "alternates"), encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return []
+        alternates = []
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                alternates.append(os.path.normpath(os.path.join(objects_dir, line)))
+        return alternates
+
+    def _open_packs(self, pack_dir: str) -> None:
+        try:
+            names = sorted(os.listdir(pack_dir))
+        except FileNotFoundError:
+            return
+        if any(name.endswith(".promisor") for name in names):
+            raise ObjectStoreError("promisor pack")
+        for name in names:
+            if not name.endswith(".idx"):
+                continue
+            pack_path = os.path.join(pack_dir, name[: -len(".idx")] + ".pack")
+            if os.path.isfile(pack_path):
+                self._packs.append(_Pack(os.path.join(pack_dir, name), pack_path))
+
+    def read(self, object_id: str) -> tuple[str, bytes] | None:
+        """Return ``(type, content)`` of an object, or None if it cannot be read."""
+        try:
+            sha = bytes.fromhex(object_id)
+        except ValueError:
+            return None
+        if len(sha) != 20:
+            return None
+        with self._lock:
+            try:
+                return self._read(sha)
+            except (ObjectStoreError, KeyError, IndexError, zlib.error, struct.error) as e:
+                logger.debug(f"In-process read of {object_id} failed: {e}")
+                return None
+
+    def count_files_in_tree(self, tree_id: str) -> int | None:
+        """Count entries of a tree and its subtrees, as ``git ls-tree -r`` lists them.
+
+        Subtree counts are remembered, so counting many revisions of the same
+        project only reads the trees that changed. Returns None if any tree
+        cannot be read.
+        """
+        try:
+            sha = bytes.fromhex(tree_id)
+        except ValueError:
+            return None
+        if len(sha) != 20:
+            return None
+        with self._lock:
+            try:
+                return self._count_files(sha)
+            except (ObjectStoreError, KeyError, IndexError, ValueError, zlib.error) as e:
+                logger.debug(f"In-process count of tree {tree_id} failed: {e}")
+                return None
+
+    def _count_files(self, sha: bytes) -> int:
+        count = self._tree_file_counts.get(sha)
+        if count is not None:
+            return count
+        obj = self._read(sha)
+        if obj is None or obj[0] != "tree":
+            raise KeyError(sha.hex())
+        count = 0
+        for mode, entry_sha in _tree_entries(obj[1]):
+            count += self._count_files(entry_sha) if mode == b"40000" else 1
+        self._tree_file_counts[sha] = count
+        return count
+
+    def _read(self, sha: bytes) -> tuple[str, bytes] | None:
+        for pack_index, pack in enumerate(self._packs):
+            offset = pack.find(sha)
+            if offset is not None:
+                type_num, data = self._unpack(pack_index, offset)
+                return _TYPE_NAMES[type_num], data
+        return self._read_loose(sha)
+
+    def _read_loose(self, sha: bytes) -> tuple[str, bytes] | None:
+        hex_sha = sha.hex()
+        for directory in self._objects_dirs:
+            try:
+                with open(os.path.join(directory, hex_sha[:2], hex_sha[2:]), "rb") as f:
+                    raw = zlib.decompress(f.read())
+            except FileNotFoundError:
+                continue
+            header, _, content = raw.partition(b"\0")
+            type_name = header.split(b" ", 1)[0].decode("ascii")
+            return type_name, content
+        return None
+
+    def _unpack(self, pack_index: int, offset: int) -> tuple[int, bytes]:
+        """Inflate a packed object, resolving its delta chain down to a base."""
+        deltas: list[tuple[tuple[int, int], bytes]] = []  # outermost first
+        key = (pack_index, offset)
+        while True:
+            cached = self._bases.get(key)
+            if cached is not None:
+                self._bases.move_to_end(key)
+                type_num, data = cached
+                break
+            pack = self._packs[key[0]]
+            type_num, size, pos = pack.object_header(key[1])
+            if type_num == _OBJ_OFS_DELTA:
+                distance, pos = pack.delta_base_distance(pos)
+                deltas.append((key, pack.inflate(pos, size)))
+                key = (key[0], key[1] - distance)
+            elif type_num == _OBJ_REF_DELTA:
+                base_sha = bytes(pack.data[pos : pos + 20])
+                deltas.append((key, pack.inflate(pos + 20, size)))
+                base_key = self._find_packed(base_sha)
+                if base_key is None:
+                    loose = self._read_loose(base_sha)
+                    if loose is None:
+                        raise KeyError(base_sha.hex())
+                    type_num, data = _TYPE_NUMBERS[loose[0]], loose[1]
+                    break
+                key = base_key
+            elif type_num in _TYPE_NAMES:
+                data = pack.inflate(pos, size)
+                if deltas:
+                    self._remember_base(key, type_num, data)
+                break
+            else:
+                raise ObjectStoreError(f"unknown object type {type_num}")
+
+        # every object rebuilt on the way out is the base of the next one
+        for index in range(len(deltas) - 1, -1, -1):
+            delta_key, delta = deltas[index]
+            data = _apply_delta(data, delta)
+            if index > 0:
+                self._remember_base(delta_key, type_num, data)
+        return type_num, data
+
+    def _find_packed(self, sha: bytes) -> tuple[int, int] | None:
+        for pack_index, pack in enumerate(self._packs):
+            offset = pack.find(sha)
+            if offset is not None:
+                return pack_index, offset
+        return None
+
+    def _remember_base(self, key: tuple[int, int], type_num: int, data: bytes) -> None:
+        if len(data) > _BASE_CACHE_BYTES // 8 or key in self._bases:
+            return
+        self._bases[key] = (type_num, data)
+        self._bases_size += len(data)
+        while self._bases_size > _BASE_CACHE_BYTES:
+            _, (_, evicted) = self._bases.popitem(last=False)
+            self._bases_size -= len(evicted)
+
+    def close(self) -> None:
+        for pack in self._packs:
+            pack.close()
+        self._packs = []
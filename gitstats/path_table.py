@@ -0,0 +1,211 @@
+"""
+Interned file paths for GitStats.
+
+The history walk sees the same paths over and over, once for every commit
+touching them. A :class:`PathTable` interns each path once as an integer id,
+a node of a prefix tree of path segments, so a directory shared by many files
+is stored once. Per-path counts (file churn, the files each author edits) are
+:class:`PathCounts`: parallel ``array`` columns of path ids and counts that
+read like a ``{path: count}`` dict, and that the tree rolls up per directory
+in one pass over its nodes.
+"""
+
+from array import array
+from collections.abc import ItemsView, Iterable, Iterator, Mapping, ValuesView
+from operator import itemgetter
+
+from gitstats.topk import top_k
+
+
+class PathTable:
+    """Prefix tree of interned paths; every node id stands for the path up to it.
+
+    Node 0 is the root. Nodes are numbered in order of creation, so a node's
+    parent always has a lower id.
+    """
+
+    def __init__(self, parents: Iterable[int] = (-1,), names: Iterable[str] = ("",)) -> None:
+        self.parents = array("i", parents)  # node -> parent node
+        self.names: list[str] = list(names)  # node -> last path segment
+        # node -> segment -> child node, only for nodes that have children
+        self._children: dict[int, dict[str, int]] = {}
+        for node in range(1, len(self.names)):
+            self._children.setdefault(self.parents[node], {})[self.names[node]] = node
+
+    def __len__(self) -> int:
+        return len(self.names) - 1
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PathTable):
+            return NotImplemented
+        return self.parents == other.parents and self.names == other.names
+
+    def intern(self, path: str) -> int:
+        """The id of ``path``, adding it (and its directories) on first sight."""
+        node = 0
+        children = self._children
+        for name in path.split("/"):
+            nodes = children.get(node)
+            if nodes is None:
+                nodes = children[node] = {}
+            child = nodes.get(name)
+            if child is None:
+                child = nodes[name] = len(self.names)
+                self.parents.append(node)
+                self.names.append(name)
+            node = child
+        return node
+
+    def lookup(self, path: str) -> int | None:
+        """The id of ``path``, or None if it was never interned."""
+        node = 0
+        for name in path.split("/"):
+            child = self._children.get(node, {}).get(name)
+            if child is None:
+                return None
+            node = child
+        return node
+
+    def path(self, node: int) -> str:
+        """The path a node stands for."""
+        names = []
+        parents = self.parents
+        while node > 0:
+            names.append(self.names[node])
+            node = parents[node]
+        return "/".join(reversed(names))
+
+    def directory_totals(self, counts: "PathCounts", depth: int | None = None) -> dict[str, int]:
+        """Sum ``counts`` per directory, i.e. over all paths below it.
+
+        With ``depth``, only directories at most that many levels deep are
+        reported (top-level directories are at depth 1). Directories come in
+        order of first sight.
+        """
+        size = len(self.names)
+        totals = array("q", bytes(8 * size))
+        for node, count in counts.id_items():
+            totals[node] += count
+        parents = self.parents
+        # children come after their parents, so one backward pass adds up whole subtrees
+        for node in range(size - 1, 0, -1):
+            if totals[node]:
+                totals[parents[node]] += totals[node]
+        nodes = [node for node in sorted(self._children) if node and totals[node]]
+        if depth is not None:
+            levels = array("i", bytes(4 * size))
+            for node in range(1, size):
+                levels[node] = levels[parents[node]] + 1
+            nodes = [node for node in nodes if levels[node] <= depth]
+        return {self.path(node): totals[node] for node in nodes}
+
+
+class PathCounts(Mapping[str, int]):
+    """Counts per path of a :class:`PathTable`, in order of first count.
+
+    Reads like a ``{path: count}`` dict; :meth:`add` and :meth:`update`
+    count by path id. Updates keep an id -> slot index, which
+    :meth:`compact` drops once counting is done.
+    """
+
+    def __init__(
+        self, table: PathTable, ids: Iterable[int] = (), counts: Iterable[int] = ()
+    ) -> None:
+        self.table = table
+        self.ids = array("i", ids)
+        self.counts = array("q", counts)
+        self._slots: dict[int, int] | None = None
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[str, int], table: PathTable | None = None):
+        """Intern the paths of a plain ``{path: count}`` mapping."""
+        if isinstance(mapping, PathCounts) and (table is None or table is mapping.table):
+            return mapping
+        counts = cls(table if table is not None else PathTable())
+        for path, count in mapping.items():
+            counts.add(counts.table.intern(path), count)
+        return counts
+
+    def _index(self) -> dict[int, int]:
+        if self._slots is None:
+            self._slots = {node: slot for slot, node in enumerate(self.ids)}
+        return self._slots
+
+    def add(self, node: int, count: int = 1) -> None:
+        """Add ``count`` to the path with id ``node``."""
+        slots = self._index()
+        slot = slots.get(node)
+        if slot is None:
+            slots[node] = len(self.ids)
+            self.ids.append(node)
+            self.counts.append(count)
+        else:
+            self.counts[slot] += count
+
+    def update(self, other: "PathCounts") -> None:
+        """Add the counts of ``other``, which must share this table."""
+        for node, count in other.id_items():
+            self.add(node, count)
+
+    def compact(self) -> None:
+        """Drop the index kept for updates; lookups rebuild it when needed."""
+        self._slots = None
+
+    def id_items(self) -> Iterator[tuple[int, int]]:
+        """``(path id, count)`` pairs, in order of first count."""
+        return zip(self.ids, self.counts)
+
+    def items(self) -> ItemsView[str, int]:
+        return _PathCountItems(self)
+
+    def values(self) -> ValuesView[int]:
+        return _PathCountValues(self)
+
+    def most_common(self, k: int | None = None) -> list[tuple[str, int]]:
+        """The ``k`` highest counts as ``(path, count)``, highest first; ties keep their order."""
+        return [(self.table.path(node), count) for node, count in self.top_ids(k)]
+
+    def top_ids(self, k: int | None = None) -> list[tuple[int, int]]:
+        """Like :meth:`most_common`, by path id."""
+        return top_k(self.id_items(), k, key=itemgetter(1))
+
+    def directory_totals(self, depth: int | None = None) -> dict[str, int]:
+        """See :meth:`PathTable.directory_totals`."""
+        return self.table.directory_totals(self, depth)
+
+    def __getitem__(self, path: str) -> int:
+        node = self.table.lookup(path)
+        slot = None if node is None else self._index().get(node)
+        if slot is None:
+            raise KeyError(path)
+        return self.counts[slot]
+
+    def __iter__(self) -> Iterator[str]:
+        path = self.table.path
+        return (path(node) for node in self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __repr__(self) -> str:
+        return f"PathCounts({dict(self.items())!r})"
+
+
+class _PathCountItems(ItemsView[str, int]):
+    """Items of :class:`PathCounts`, read from its columns rather than by path lookups."""
+
+    _mapping: PathCounts
+
+    def __iter__(self) -> Iterator[tuple[str, int]]:
+        path = self._mapping.table.path
+        for node, count in self._mapping.id_items():
+            yield path(node), count
+
+
+class _PathCountValues(ValuesView[int]):
+    """Values of :class:`PathCounts`, read from its count column."""
+
+    _mapping: PathCounts
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._mapping.counts)
@@ -0,0 +1,193 @@
+"""
+Run profiling for GitStats.
+
+Every external command reports its wall time, CPU time, bytes read and
+process count here, and collection/render phases are timed with
+:func:`phase`. The total time spent in external commands is always tracked;
+the per-command and per-phase records are only kept with ``--profile``.
+Worker processes hand their records back to the parent through
+:func:`run_in_worker`.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any
+
+PROFILE_VERSION = 1
+
+_lock = threading.Lock()
+_local = threading.local()
+_state: dict[str, Any] = {"enabled": False, "external_time": 0.0, "started": time.time()}
+_commands: list[dict[str, Any]] = []
+_phases: list[dict[str, Any]] = []
+
+
+def _reset_lock() -> None:
+    global _lock
+    _lock = threading.Lock()
+
+
+# A forked worker may inherit the lock held by another thread of the parent
+os.register_at_fork(after_in_child=_reset_lock)
+
+
+def enable(enabled: bool = True) -> None:
+    """Turn the detailed per-command and per-phase records on or off."""
+    _state["enabled"] = enabled
+
+
+def is_enabled() -> bool:
+    return _state["enabled"]
+
+
+def reset() -> None:
+    """Forget the detailed records, e.g. before profiling the next repository."""
+    with _lock:
+        _commands.clear()
+        _phases.clear()
+        _state["started"] = time.time()
+
+
+def external_time() -> float:
+    """Wall time spent in external commands this run, including worker processes."""
+    return _state["external_time"]
+
+
+def current_phase() -> str:
+    """Name of the phase the calling thread is running, or an empty string."""
+    return getattr(_local, "phase", "")
+
+
+def record_command(
+    command: str, wall: float, cpu: float, bytes_read: int, processes: int = 1
+) -> None:
+    """Record one external command; ``cpu`` is the CPU time of its processes."""
+    with _lock:
+        _state["external_time"] += wall
+        if _state["enabled"]:
+            _commands.append(
+                {
+                    "command": command,
+                    "phase": current_phase(),
+                    "pid": os.getpid(),
+                    "wall": wall,
+                    "cpu": cpu,
+                    "bytes_read": bytes_read,
+                    "processes": processes,
+                }
+            )
+
+
+@contextmanager
+def phase(name: str):
+    """Time a block as phase ``name``; commands it runs are attributed to it."""
+    if not _state["enabled"]:
+        yield
+        return
+    parent = current_phase()
+    _local.phase = name
+    start_wall = time.time()
+    start_cpu = time.thread_time()
+    try:
+        yield
+    finally:
+        _local.phase = parent
+        with _lock:
+            _phases.append(
+                {
+                    "phase": name,
+                    "pid": os.getpid(),
+                    "wall": time.time() - start_wall,
+                    "cpu": time.thread_time() - start_cpu,
+                }
+            )
+
+
+def run_in_worker(func, phase_name: str, item: Any) -> tuple[Any, dict[str, Any]]:
+    """Call ``func(item)`` in a worker process and return it with the worker's records.
+
+    Forked workers inherit (and may reuse) the parent's state, so it is
+    cleared first. The records go back to the parent with the result, to be
+    added with :func:`merge_worker_records`.
+    """
+    with _lock:
+        _commands.clear()
+        _phases.clear()
+        _state["external_time"] = 0.0
+    with phase(f"{phase_name} (worker)" if phase_name else "worker"):
+        result = func(item)
+    with _lock:
+        records = {
+            "external_time": _state["external_time"],
+            "commands": list(_commands),
+            "phases": list(_phases),
+        }
+    return result, records
+
+
+def merge_worker_records(records: dict[str, Any]) -> None:
+    with _lock:
+        _state["external_time"] += records["external_time"]
+        if _state["enabled"]:
+            _commands.extend(records["commands"])
+            _phases.extend(records["phases"])
+
+
+def _summarize(rows: list[dict[str, Any]], key) -> list[dict[str, Any]]:
+    """Total ``rows`` per ``key(row)``, slowest first."""
+    totals: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        name = key(row)
+        total = totals.setdefault(
+            name,
+            {"name": name, "count": 0, "wall": 0.0, "cpu": 0.0, "bytes_read": 0, "processes": 0},
+        )
+        total["count"] += 1
+        total["wall"] += row["wall"]
+        total["cpu"] += row["cpu"]
+        total["bytes_read"] += row.get("bytes_read", 0)
+        total["processes"] += row.get("processes", 0)
+    return sorted(totals.values(), key=lambda total: (-total["wall"], total["name"]))
+
+
+def _command_kind(row: dict[str, Any]) -> str:
+    """Program and subcommand, e.g. "git log", for grouping invocations."""
+    words = row["command"].split()
+    if words and words[0] == "git" and len(words) > 1:
+        return " ".join(words[:2])
+    return words[0] if words else ""
+
+
+def get_profile() -> dict[str, Any]:
+    """All records of this run plus per-phase and per-command totals."""
+    with _lock:
+        commands = list(_commands)
+        phases = list(_phases)
+        started = _state["started"]
+    phase_totals = _summarize(phases, lambda row: row["phase"])
+    # bytes and processes of a phase are those of the commands it ran
+    by_phase = {total["name"]: total for total in _summarize(commands, lambda row: row["phase"])}
+    for total in phase_totals:
+        command_total = by_phase.get(total["name"])
+        total["bytes_read"] = command_total["bytes_read"] if command_total else 0
+        total["processes"] = command_total["processes"] if command_total else 0
+    return {
+        "version": PROFILE_VERSION,
+        "total_wall": time.time() - started,
+        "external_time": sum(row["wall"] for row in commands),
+        "phases": phase_totals,
+        "commands": _summarize(commands, _command_kind),
+        "phase_records": phases,
+        "command_records": commands,
+    }
+
+
+def write_profile(profile: dict[str, Any], outputpath: str) -> str:
+    """Write ``profile.json`` into ``outputpath`` and return its path."""
+    target = os.path.join(outputpath, "profile.json")
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump(profile, f, indent=2)
+    return target
@@ -0,0 +1,144 @@
+"""
+Output stage for statically hosted reports.
+
+After a report is written, :func:`publish` minifies its HTML pages and writes
+precompressed ``.gz`` siblings of its pages, scripts and stylesheets, plus
+``.br`` siblings when the optional ``brotli`` module is installed, for static
+servers that serve them as they are (nginx ``gzip_static``/``brotli_static``,
+most CDNs). Files are processed in parallel threads; the compression modules
+release the GIL. A manifest of content hashes in the report directory lets
+files unchanged since the last run keep their siblings.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from gitstats import load_config
+from gitstats.utils import write_atomically
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger("gitstats")
+
+_MANIFEST = "gitstats.precompressed"
+_COMPRESSIBLE = (".html", ".js", ".css", ".svg")
+# smaller files gain too little from compression to be worth a sibling
+_MIN_COMPRESS_SIZE = 1024
+
+# content that must keep its whitespace
+_VERBATIM = re.compile(r"<(pre|textarea|script|style)\b.*?</\1\s*>", re.S | re.I)
+_COMMENT = re.compile(r"<!--.*?-->", re.S)
+_SPACE = re.compile(r"\s+")
+
+
+def _collapse(match: re.Match) -> str:
+    return "\n" if "\n" in match.group(0) else " "
+
+
+def minify_html(text: str) -> str:
+    """Drop comments and collapse whitespace the browser would collapse anyway.
+
+    Runs of whitespace become one space, or one newline if they span lines.
+    ``pre`` and ``textarea`` are kept as they are; scripts and styles only
+    lose their indentation and blank lines.
+    """
+    parts = []
+    end = 0
+    for match in _VERBATIM.finditer(text):
+        parts.append(_SPACE.sub(_collapse, _COMMENT.sub("", text[end : match.start()])))
+        block = match.group(0)
+        if match.group(1).lower() in ("script", "style"):
+            block = "\n".join(line.strip() for line in block.splitlines() if line.strip())
+        parts.append(block)
+        end = match.end()
+    parts.append(_SPACE.sub(_collapse, _COMMENT.sub("", text[end:])))
+    return "".join(parts)
+
+
+def publish(path: str, recursive: bool = True) -> None:
+    """Minify and precompress the report in ``path``, as configured.
+
+    ``minify_html`` rewrites the HTML pages in place; ``precompress`` writes
+    the ``.gz``/``.br`` siblings. With ``recursive`` false only the files
+    directly in ``path`` are processed (the portfolio root, whose repository
+    subdirectories were published on their own).
+    """
+    conf = load_config()
+    minify = bool(conf["minify_html"])
+    compress = bool(conf["precompress"])
+    if not minify and not compress:
+        return
+
+    files = []
+    for directory, subdirs, names in os.walk(path):
+        # hidden directories hold caches, not report files
+        subdirs[:] = sorted(d for d in subdirs if recursive and not d.startswith("."))
+        for name in sorted(names):
+            if name.endswith(_COMPRESSIBLE):
+                files.append(os.path.relpath(os.path.join(directory, name), path))
+
+    manifest_file = os.path.join(path, _MANIFEST)
+    try:
+        with open(manifest_file, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+
+    def process(name: str) -> tuple[str, str | None]:
+        return name, _publish_file(path, name, manifest.get(name), minify, compress)
+
+    with ThreadPoolExecutor(max_workers=max(1, conf["processes"])) as pool:
+        digests = {name: digest for name, digest in pool.map(process, files) if digest}
+
+    if compress:
+        _remove_orphaned_siblings(path, recursive)
+        write_atomically(manifest_file, json.dumps(digests, sort_keys=True).encode("utf-8"))
+    logger.info(f"Published {len(files)} files in {path}")
+
+
+def _publish_file(
+    path: str, name: str, digest: str | None, minify: bool, compress: bool
+) -> str | None:
+    """Minify and compress one file; returns its content hash if it was compressed."""
+    target = os.path.join(path, name)
+    with open(target, "rb") as f:
+        content = f.read()
+    if minify and name.endswith(".html"):
+        minified = minify_html(content.decode("utf-8")).encode("utf-8")
+        if minified != content:
+            write_atomically(target, minified)
+            content = minified
+    if not compress:
+        return None
+    current = hashlib.sha256(content).hexdigest()
+    compressors = {
+        ".gz": lambda data: gzip.compress(data, mtime=0),
+        ".br": brotli.compress if brotli is not None else None,
+    }
+    for ext, compressor in compressors.items():
+        sibling = target + ext
+        if compressor is None or len(content) < _MIN_COMPRESS_SIZE:
+            # never leave a sibling behind that may be out of date
+            if os.path.exists(sibling):
+                os.remove(sibling)
+        elif current != digest or not os.path.exists(sibling):
+            write_atomically(sibling, compressor(content))
+    return current
+
+
+def _remove_orphaned_siblings(path: str, recursive: bool) -> None:
+    """Remove ``.gz``/``.br`` siblings whose file is gone, e.g. a dropped page."""
+    for directory, subdirs, names in os.walk(path):
+        subdirs[:] = [d for d in subdirs if recursive and not d.startswith(".")]
+        for name in names:
+            base, ext = os.path.splitext(name)
+            if ext in (".gz", ".br") and base.endswith(_COMPRESSIBLE) and base not in names:
+                os.remove(os.path.join(directory, name))
@@ -3,21 +3,58 @@
 # Copyright (c) 2024-present Xianpeng Shen <xianpeng.shen@gmail.com>.
 # GPLv2 / GPLv3
 import datetime
+import hashlib
 import html
 import json
+import logging
 import math
+import multiprocessing
 import os
 import re
 import shutil
 import time
+import types
+from array import array
+from collections.abc import Iterable, Mapping
+from functools import partial
+from operator import itemgetter
 from typing import Any
 
-from gitstats import WEEKDAYS, get_i18n_text, load_config
-from gitstats.utils import (
-    format_int,
-    get_git_version,
-    get_pipe_output,
-    get_version,
+from gitstats import WEEKDAYS, get_i18n_text, load_config, profiling
+from gitstats.downsample import downsample, lttb_indices
+from gitstats.path_table import PathCounts
+from gitstats.timebuckets import date_label, stamp_keys
+from gitstats.topk import top_k
+from gitstats.utils import format_int, get_git_version, get_version, write_atomically
+
+logger = logging.getLogger("gitstats")
+
+# directory of the chart data scripts, relative to the pages
+_CHART_DATA_DIR = "data"
+
+# settings that change how a report is produced but not what its pages show;
+# they are left out of the page fingerprints
+_UNRENDERED_CONFIG = frozenset(
+    {
+        "processes",
+        "render_processes",
+        "jobs",
+        "repo_timeout",
+        "incremental_pages",
+        "incremental_collection",
+        "incremental_filecounts",
+        "snapshot",
+        "cache_backend",
+        "object_reader",
+        "shared_cache",
+        "shared_cache_dir",
+        "shared_cache_max_entries",
+        "precompress",
+        "ai_api_key",
+        "ai_cache_enabled",
+        "ai_max_retries",
+        "ai_retry_delay",
+    }
 )
 
 _FLEX_CONTAINER = '<div style="display:flex;gap:24px;align-items:flex-start">'
@@ -38,6 +75,14 @@ class ReportCreator:
 
 
 class HTMLReportCreator(ReportCreator):
+    def __init__(self):
+        super().__init__()
+        # directory holding the static assets shared by the reports of a
+        # multi-repository run (see the shared_assets option)
+        self.assets_root: str | None = None
+        # prefix of the asset URLs in the pages
+        self.asset_prefix = ""
+
     @staticmethod
     def _heat_level(value, max_value):
         if max_value <= 0 or value <= 0:
@@ -58,33 +103,144 @@ class HTMLReportCreator(ReportCreator):
     def create(self, data: Any, path: str) -> None:
         ReportCreator.create(self, data, path)
         self.title = data.project_name
+        # chart data files written by the page being rendered
+        self.chart_data: list[str] = []
+        manifest = _load_manifest(path)
+
+        # copy static files to the report directory, or share those of the root
+        shared = load_config()["shared_assets"] if self.assets_root is not None else ""
+        if shared == "reference" and self.assets_root is not None:
+            assets = {}
+            prefix = os.path.relpath(self.assets_root, path).replace(os.sep, "/")
+            self.asset_prefix = f"{prefix}/"
+            # copies of an earlier run are not loaded any more
+            for file in report_assets():
+                if os.path.exists(os.path.join(path, file)):
+                    os.remove(os.path.join(path, file))
+        else:
+            assets = _copy_assets(
+                path,
+                report_assets(),
+                manifest.get("assets", {}),
+                link_from=self.assets_root if shared == "link" else None,
+            )
 
-        # copy static files to the report directory
-        basedir = os.path.dirname(os.path.abspath(__file__))
-        for file in (
-            load_config()["style"],
-            "sortable.js",
-            "chart.umd.min.js",
-            "arrow-up.gif",
-            "arrow-down.gif",
-            "arrow-none.gif",
-        ):
-            src = basedir + "/" + file
-            if os.path.exists(src):
-                shutil.copyfile(src, path + "/" + file)
-
-        self.create_index_html(data, path)
-        self.create_activity_html(data, path)
-        self.create_authors_html(data, path)
-        self.create_files_html(data, path)
-        self.create_lines_html(data, path)
-        self.create_tags_html(data, path)
-        self.create_ownership_html(data, path)
-        self.create_history_html(data, path)
-
+        pages = [
+            ("index", self.create_index_html),
+            ("activity", self.create_activity_html),
+            ("authors", self.create_authors_html),
+            ("files", self.create_files_html),
+            ("lines", self.create_lines_html),
+            ("tags", self.create_tags_html),
+            ("ownership", self.create_ownership_html),
+            ("history", self.create_history_html),
+        ]
         # Create AI Insights page if AI is enabled
         if hasattr(data, "ai_summaries") and data.ai_summaries:
-            self.create_ai_insights_html(data, path)
+            pages.append(("ai-insights", self.create_ai_insights_html))
+        rendered = self._render_pages(dict(pages), data, path, manifest.get("pages", {}))
+        _save_manifest(path, {"assets": assets, "pages": rendered})
+
+    def _render_pages(
+        self, pages: dict[str, Any], data: Any, path: str, previous: dict | None = None
+    ) -> dict[str, dict]:
+        """Render the pages, concurrently in forked worker processes when possible.
+
+        Pages only read the collector, so the workers share it copy-on-write
+        instead of receiving a pickled copy; each writes its own file, the same
+        bytes as rendering them one after another. Logs the time of each page
+        and removes chart data files no page uses any more.
+
+        A page whose entry in ``previous`` (the manifest of the last run)
+        still matches the fingerprint of the collector attributes it read
+        and of the configuration is left untouched. Returns the manifest
+        entries of all pages.
+        """
+        context = self._page_context()
+        entries = {}
+        for name in list(pages):
+            entry = (previous or {}).get(name)
+            if entry and self._is_page_current(name, entry, data, path, context):
+                logger.info(f"Page {name} is up to date")
+                entries[name] = entry
+        pages = {name: render for name, render in pages.items() if name not in entries}
+
+        workers = load_config()["render_processes"] or os.cpu_count() or 1
+        workers = min(workers, len(pages))
+        results = None
+        if (
+            workers > 1
+            and "fork" in multiprocessing.get_all_start_methods()
+            and not multiprocessing.current_process().daemon
+        ):
+            global _render_job
+            _render_job = (self, pages, data, path)
+            try:
+                with multiprocessing.get_context("fork").Pool(workers) as pool:
+                    outcomes = pool.map(
+                        partial(profiling.run_in_worker, _render_page, "render"), list(pages)
+                    )
+                results = []
+                for result, records in outcomes:
+                    profiling.merge_worker_records(records)
+                    results.append(result)
+            except OSError as e:
+                logger.warning(f"Multiprocessing not available ({e}), rendering pages sequentially")
+            finally:
+                _render_job = None
+        if results is None:
+            results = [_render_page(name, (self, pages, data, path)) for name in pages]
+        for name, (seconds, chart_data, reads) in zip(pages, results):
+            logger.info(f"Rendered {name} in {seconds:.2f}s")
+            fingerprint = None
+            if reads is not None:
+                fingerprint = _fingerprint(context + _page_clock(name), data, reads)
+            if fingerprint is not None:
+                entries[name] = {"fingerprint": fingerprint, "inputs": reads}
+            else:
+                entries[name] = {}
+            entries[name]["chart_data"] = chart_data
+        self._prune_chart_data(
+            path, {source for entry in entries.values() for source in entry["chart_data"]}
+        )
+        return entries
+
+    def _page_context(self) -> str:
+        """What every page depends on besides the collector: code, configuration, title."""
+        conf = load_config()
+        return json.dumps(
+            [
+                get_version(),
+                _code_hash(),
+                {key: value for key, value in conf.items() if key not in _UNRENDERED_CONFIG},
+                profiling.is_enabled(),
+                self.title,
+                self.asset_prefix,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+
+    @staticmethod
+    def _is_page_current(name: str, entry: dict, data: Any, path: str, context: str) -> bool:
+        """Whether a page of the last run may be kept as it is."""
+        if "fingerprint" not in entry or not os.path.exists(os.path.join(path, f"{name}.html")):
+            return False
+        if not all(os.path.exists(os.path.join(path, source)) for source in entry["chart_data"]):
+            return False
+        fingerprint = _fingerprint(context + _page_clock(name), data, entry["inputs"])
+        return fingerprint == entry["fingerprint"]
+
+    @staticmethod
+    def _prune_chart_data(path: str, used: set[str]) -> None:
+        """Remove the chart data files of earlier runs that no page refers to."""
+        directory = os.path.join(path, _CHART_DATA_DIR)
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            source = f"{_CHART_DATA_DIR}/{re.sub(r'[.](gz|br)$', '', name)}"
+            if source not in used:
+                os.remove(os.path.join(directory, name))
 
     def create_index_html(self, data: Any, path: str) -> None:
         f = open(path + "/index.html", "w", encoding="utf-8")
@@ -180,10 +336,8 @@ class HTMLReportCreator(ReportCreator):
 
     def _write_yearly_activity_section(self, f, data) -> None:
         """Write yearly activity section with chart."""
-        log_output = get_pipe_output(["git log --reverse --pretty=format:%ct"], quiet=True)
-        first_commit_timestamp = log_output.split("\n")[0] if log_output else ""
-        if first_commit_timestamp:
-            repo_age_years = (time.time() - int(first_commit_timestamp)) / 31536000
+        if data.first_commit_stamp:
+            repo_age_years = (time.time() - data.first_commit_stamp) / 31536000
             years_count = max(5, int(math.ceil(repo_age_years / 5.0)) * 5)
         else:
             years_count = 5
@@ -460,32 +614,18 @@ class HTMLReportCreator(ReportCreator):
     def _build_author_time_series(self, data):
         """Build per-author cumulative lines and commits time series for Chart.js.
 
-        For large repositories, data points are automatically downsampled to keep
-        the HTML file size manageable and Chart.js rendering fast. Since the stored
-        values are already cumulative, downsampling preserves the chart shape.
+        Both charts share their time axis, so they are downsampled together to
+        at most ``chart_max_points`` points (see :mod:`gitstats.downsample`).
         """
         authors_to_plot = data.get_authors(load_config()["max_authors"])
         sorted_stamps = sorted(data.changes_by_date_by_author.keys())
-        total_points = len(sorted_stamps)
-
-        # Target max ~500 data points per chart to prevent browser lag and huge HTML.
-        # 500 points covers ~10 years at weekly granularity — more than enough for
-        # cumulative line charts.
-        MAX_POINTS = 500
-        if total_points > MAX_POINTS:
-            step = total_points / MAX_POINTS
-            sampled_indices = {int(i * step) for i in range(MAX_POINTS)}
-            sampled_indices.add(total_points - 1)  # ensure the last point is always included
-        else:
-            sampled_indices = set(range(total_points))
 
         lines_by_authors = dict.fromkeys(authors_to_plot, 0)
         commits_by_authors = dict.fromkeys(authors_to_plot, 0)
-        time_labels = []
-        per_author_lines = {a: [] for a in authors_to_plot}
-        per_author_commits = {a: [] for a in authors_to_plot}
+        per_author_lines = {a: array("q") for a in authors_to_plot}
+        per_author_commits = {a: array("q") for a in authors_to_plot}
 
-        for i, stamp in enumerate(sorted_stamps):
+        for stamp in sorted_stamps:
             # Update running totals: only the author(s) of this commit changed
             for author in data.changes_by_date_by_author[stamp]:
                 if author in authors_to_plot:
@@ -495,18 +635,58 @@ class HTMLReportCreator(ReportCreator):
                     commits_by_authors[author] = data.changes_by_date_by_author[stamp][author][
                         "commits"
                     ]
-
-            # Only record a data point if this index is in the sampled set
-            if i in sampled_indices:
-                time_labels.append(datetime.datetime.fromtimestamp(stamp).strftime("%Y-%m-%d"))
-                for author in authors_to_plot:
-                    per_author_lines[author].append(lines_by_authors[author])
-                    per_author_commits[author].append(commits_by_authors[author])
-
-        loc_datasets = [{"label": a, "data": per_author_lines[a]} for a in authors_to_plot]
-        cba_datasets = [{"label": a, "data": per_author_commits[a]} for a in authors_to_plot]
+            for author in authors_to_plot:
+                per_author_lines[author].append(lines_by_authors[author])
+                per_author_commits[author].append(commits_by_authors[author])
+
+        series = [per_author_lines[a] for a in authors_to_plot]
+        series += [per_author_commits[a] for a in authors_to_plot]
+        indices = lttb_indices(series, load_config()["chart_max_points"])
+        time_labels = [date_label(sorted_stamps[i]) for i in indices]
+        loc_datasets = [
+            {"label": a, "data": [per_author_lines[a][i] for i in indices]} for a in authors_to_plot
+        ]
+        cba_datasets = [
+            {"label": a, "data": [per_author_commits[a][i] for i in indices]}
+            for a in authors_to_plot
+        ]
         return time_labels, loc_datasets, cba_datasets
 
+    def _render_author_of_period_table(
+        self, table_id: str, period: str, author_of_period: dict, commits_by_period: dict
+    ) -> str:
+        """Author of Month/Year as a :meth:`_render_table`, latest period first."""
+        authors_top = load_config()["authors_top"]
+        rows = []
+        for key in sorted(author_of_period.keys(), reverse=True):
+            authors = get_keys_sorted_by_values(author_of_period[key])
+            authors.reverse()
+            commits = author_of_period[key][authors[0]]
+            rows.append(
+                (
+                    key,
+                    authors[0],
+                    commits,
+                    (100.0 * commits) / commits_by_period[key],
+                    commits_by_period[key],
+                    ", ".join(authors[1 : authors_top + 1]),
+                    len(authors),
+                )
+            )
+        return self._render_table(
+            table_id,
+            [
+                {"title": period, "type": "text"},
+                {"title": "Author", "type": "text"},
+                {"title": "Commits", "type": "number"},
+                {"title": "Commits (%)", "type": "number", "digits": 2},
+                {"title": f"Commits in {period.lower()}", "type": "number"},
+                {"title": "Next top %d" % authors_top, "type": "text"},
+                {"title": "Number of authors", "type": "number"},
+            ],
+            rows,
+        )
+
     def create_authors_html(self, data: Any, path: str) -> None:
         ###
         # Authors
@@ -542,16 +722,44 @@ class HTMLReportCreator(ReportCreator):
             )
         f.write("</table>")
 
-        allauthors = data.get_authors()
-        if len(allauthors) > load_config()["max_authors"]:
-            rest = allauthors[load_config()["max_authors"] :]
+        total_authors = len(data.authors)
+        max_authors = load_config()["max_authors"]
+        if total_authors > max_authors and self._is_large_table(total_authors - max_authors):
+            # paged from JSON columns, so all of them are listed, not only max_authors_list
+            f.write('<p class="moreauthors">These didn\'t make it to the top:</p>')
+            rest_rows = []
+            for author in data.get_authors(total_authors)[max_authors:]:
+                info = data.get_author_info(author)
+                rest_rows.append(
+                    (
+                        author,
+                        info["commits"],
+                        info["lines_added"],
+                        info["lines_removed"],
+                        info["date_last"],
+                    )
+                )
+            f.write(
+                self._render_table(
+                    "authors-rest",
+                    [
+                        {"title": "Author", "type": "text"},
+                        {"title": "Commits", "type": "number"},
+                        {"title": "+ lines", "type": "number"},
+                        {"title": "- lines", "type": "number"},
+                        {"title": "Last commit", "type": "text"},
+                    ],
+                    rest_rows,
+                )
+            )
+        elif total_authors > max_authors:
             max_list = load_config()["max_authors_list"]
-            if len(rest) > max_list:
-                shown = ", ".join(rest[:max_list])
-                more = len(rest) - max_list
+            rest = data.get_authors(max_authors + max_list)[max_authors:]
+            more = total_authors - max_authors - len(rest)
+            if more:
                 f.write(
                     f'<p class="moreauthors">These didn\'t make it to the top:'
-                    f" {shown}<em>, and {more} more authors</em></p>"
+                    f" {', '.join(rest)}<em>, and {more} more authors</em></p>"
                 )
             else:
                 f.write(
@@ -574,11 +782,8 @@ class HTMLReportCreator(ReportCreator):
                 x_ticks_rotate=True,
             )
         )
-        if len(allauthors) > load_config()["max_authors"]:
-            f.write(
-                '<p class="moreauthors">Only top %d authors shown</p>'
-                % load_config()["max_authors"]
-            )
+        if total_authors > max_authors:
+            f.write('<p class="moreauthors">Only top %d authors shown</p>' % max_authors)
 
         f.write(html_header(2, "Commits per Author"))
         f.write(
@@ -591,79 +796,89 @@ class HTMLReportCreator(ReportCreator):
                 x_ticks_rotate=True,
             )
         )
-        if len(allauthors) > load_config()["max_authors"]:
-            f.write(
-                '<p class="moreauthors">Only top %d authors shown</p>'
-                % load_config()["max_authors"]
-            )
+        if total_authors > max_authors:
+            f.write('<p class="moreauthors">Only top %d authors shown</p>' % max_authors)
 
         # Authors :: Author of Month
         f.write(html_header(2, "Author of Month"))
-        f.write('<table class="sortable" id="aom">')
-        f.write(
-            '<tr><th>Month</th><th>Author</th><th>Commits (%%)</th><th class="unsortable">Next top %d</th><th>Number of authors</th></tr>'
-            % load_config()["authors_top"]
-        )
-        for yymm in sorted(data.author_of_month.keys(), reverse=True):
-            author_dict = data.author_of_month[yymm]
-            authors = get_keys_sorted_by_values(author_dict)
-            authors.reverse()
-            commits = data.author_of_month[yymm][authors[0]]
-            authors_str = ", ".join(authors[1 : load_config()["authors_top"] + 1])
+        if self._is_large_table(len(data.author_of_month)):
             f.write(
-                "<tr><td>%s</td><td>%s</td><td>%d (%.2f%% of %d)</td><td>%s</td><td>%d</td></tr>"
-                % (
-                    yymm,
-                    authors[0],
-                    commits,
-                    (100.0 * commits) / data.commits_by_month[yymm],
-                    data.commits_by_month[yymm],
-                    authors_str,
-                    len(authors),
+                self._render_author_of_period_table(
+                    "aom", "Month", data.author_of_month, data.commits_by_month
                 )
             )
+        else:
+            f.write('<table class="sortable" id="aom">')
+            f.write(
+                '<tr><th>Month</th><th>Author</th><th>Commits (%%)</th><th class="unsortable">Next top %d</th><th>Number of authors</th></tr>'
+                % load_config()["authors_top"]
+            )
+            for yymm in sorted(data.author_of_month.keys(), reverse=True):
+                author_dict = data.author_of_month[yymm]
+                authors = get_keys_sorted_by_values(author_dict)
+                authors.reverse()
+                commits = data.author_of_month[yymm][authors[0]]
+                authors_str = ", ".join(authors[1 : load_config()["authors_top"] + 1])
+                f.write(
+                    "<tr><td>%s</td><td>%s</td><td>%d (%.2f%% of %d)</td><td>%s</td><td>%d</td></tr>"
+                    % (
+                        yymm,
+                        authors[0],
+                        commits,
+                        (100.0 * commits) / data.commits_by_month[yymm],
+                        data.commits_by_month[yymm],
+                        authors_str,
+                        len(authors),
+                    )
+                )
 
-        f.write("</table>")
+            f.write("</table>")
 
         f.write(html_header(2, "Author of Year"))
-        f.write(
-            '<table class="sortable" id="aoy"><tr><th>Year</th><th>Author</th><th>Commits (%%)</th><th class="unsortable">Next top %d</th><th>Number of authors</th></tr>'
-            % load_config()["authors_top"]
-        )
-        for yy in sorted(data.author_of_year.keys(), reverse=True):
-            author_dict = data.author_of_year[yy]
-            authors = get_keys_sorted_by_values(author_dict)
-            authors.reverse()
-            commits = data.author_of_year[yy][authors[0]]
-            authors_str = ", ".join(authors[1 : load_config()["authors_top"] + 1])
+        if self._is_large_table(len(data.author_of_year)):
             f.write(
-                "<tr><td>%s</td><td>%s</td><td>%d (%.2f%% of %d)</td><td>%s</td><td>%d</td></tr>"
-                % (
-                    yy,
-                    authors[0],
-                    commits,
-                    (100.0 * commits) / data.commits_by_year[yy],
-                    data.commits_by_year[yy],
-                    authors_str,
-                    len(authors),
+                self._render_author_of_period_table(
+                    "aoy", "Year", data.author_of_year, data.commits_by_year
                 )
             )
-        f.write("</table>")
+        else:
+            f.write(
+                '<table class="sortable" id="aoy"><tr><th>Year</th><th>Author</th><th>Commits (%%)</th><th class="unsortable">Next top %d</th><th>Number of authors</th></tr>'
+                % load_config()["authors_top"]
+            )
+            for yy in sorted(data.author_of_year.keys(), reverse=True):
+                author_dict = data.author_of_year[yy]
+                authors = get_keys_sorted_by_values(author_dict)
+                authors.reverse()
+                commits = data.author_of_year[yy][authors[0]]
+                authors_str = ", ".join(authors[1 : load_config()["authors_top"] + 1])
+                f.write(
+                    "<tr><td>%s</td><td>%s</td><td>%d (%.2f%% of %d)</td><td>%s</td><td>%d</td></tr>"
+                    % (
+                        yy,
+                        authors[0],
+                        commits,
+                        (100.0 * commits) / data.commits_by_year[yy],
+                        data.commits_by_year[yy],
+                        authors_str,
+                        len(authors),
+                    )
+                )
+            f.write("</table>")
 
         # Domains
         f.write(html_header(2, "Commits by Domains"))
-        domains_by_commits = get_keys_sorted_by_value_key(data.domains, "commits")
-        domains_by_commits.reverse()  # most first
+        domains_by_commits = top_k(
+            data.domains,
+            load_config()["max_domains"],
+            key=lambda domain: (data.domains[domain]["commits"], domain),
+        )
         f.write(_FLEX_CONTAINER)
         f.write("<table>")
         f.write("<tr><th>Domains</th><th>Total (%)</th></tr>")
         dom_labels = []
         dom_values = []
-        n = 0
         for domain in domains_by_commits:
-            if n == load_config()["max_domains"]:
-                break
-            n += 1
             info = data.get_domain_info(domain)
             dom_labels.append(domain)
             dom_values.append(info["commits"])
@@ -740,11 +955,14 @@ class HTMLReportCreator(ReportCreator):
         # use set to get rid of duplicate/unnecessary entries, then sort
         files_by_date = {}
         for stamp in sorted(data.files_by_stamp.keys()):
-            date_str = datetime.datetime.fromtimestamp(stamp).strftime("%Y-%m-%d")
-            files_by_date[date_str] = data.files_by_stamp[stamp]
+            files_by_date[date_label(stamp)] = data.files_by_stamp[stamp]
 
         fbd_labels = sorted(files_by_date.keys())
-        fbd_values = [files_by_date[d] for d in fbd_labels]
+        fbd_labels, (fbd_values,) = downsample(
+            fbd_labels,
+            [[files_by_date[d] for d in fbd_labels]],
+            load_config()["chart_max_points"],
+        )
         f.write(
             self._render_chartjs(
                 "chart-files-by-date",
@@ -794,8 +1012,8 @@ class HTMLReportCreator(ReportCreator):
                 "<p><em>Files touched most often across all commits. "
                 "High-churn files are hotspots that may benefit from extra review or refactoring.</em></p>"
             )
-            churn_sorted = sorted(data.file_churn.items(), key=lambda x: x[1], reverse=True)
-            top_churn = churn_sorted[:25]
+            churn = PathCounts.from_mapping(data.file_churn)
+            top_churn = churn.most_common(25)
             max_churn = max(1, top_churn[0][1]) if top_churn else 1
             churn_labels = [item[0] for item in top_churn]
             churn_values = [item[1] for item in top_churn]
@@ -824,6 +1042,24 @@ class HTMLReportCreator(ReportCreator):
                 )
             )
 
+            # Files :: directory rollup of the churn, from the interned path tree
+            directories = churn.directory_totals()
+            if directories:
+                f.write(html_header(2, "Most Changed Directories"))
+                f.write("<p><em>File changes summed over everything below each directory.</em></p>")
+                top_dirs = top_k(directories.items(), 15, key=itemgetter(1))
+                max_dir = max(1, top_dirs[0][1])
+                f.write(
+                    '<table class="sortable" id="churn-dirs">'
+                    "<tr><th>Directory</th><th>File Changes</th></tr>"
+                )
+                for dirpath, count in top_dirs:
+                    f.write(
+                        '<tr><td class="%s">%s/</td><td>%d</td></tr>'
+                        % (self._heat_td_class(count, max_dir), html.escape(dirpath), count)
+                    )
+                f.write("</table>")
+
         self.print_footer(f)
         f.write("</body></html>")
         f.close()
@@ -842,8 +1078,11 @@ class HTMLReportCreator(ReportCreator):
 
         f.write(html_header(2, "Lines of Code"))
         loc_stamps = sorted(data.changes_by_date.keys())
-        loc_labels = [datetime.datetime.fromtimestamp(s).strftime("%Y-%m-%d") for s in loc_stamps]
-        loc_values = [data.changes_by_date[s]["lines"] for s in loc_stamps]
+        loc_labels, (loc_values,) = downsample(
+            [date_label(s) for s in loc_stamps],
+            [[data.changes_by_date[s]["lines"] for s in loc_stamps]],
+            load_config()["chart_max_points"],
+        )
         f.write(
             self._render_chartjs(
                 "chart-lines-of-code",
@@ -876,14 +1115,14 @@ class HTMLReportCreator(ReportCreator):
             )
         f.write("</dl>")
 
-        f.write('<table class="tags">')
-        f.write("<tr><th>Name</th><th>Date</th><th>Commits</th><th>Authors</th></tr>")
         # sort the tags by date desc
         tags_sorted_by_date_desc = [
             el[1]
             for el in sorted([(el[1]["date"], el[0]) for el in data.tags.items()], reverse=True)
         ]
         max_tags_authors = load_config()["max_tags_authors"]
+        large = self._is_large_table(len(tags_sorted_by_date_desc))
+        rows = []
         for tag in tags_sorted_by_date_desc:
             authorinfo = []
             self.authors_by_commits = get_keys_sorted_by_values(data.tags[tag]["authors"])
@@ -894,20 +1133,39 @@ class HTMLReportCreator(ReportCreator):
                 remaining = len(authors_reversed) - max_tags_authors
                 for i in authors_shown:
                     authorinfo.append("%s (%d)" % (i, data.tags[tag]["authors"][i]))
-                authorinfo.append("<em>and %d more authors</em>" % remaining)
+                more = "and %d more authors" % remaining
+                authorinfo.append(more if large else "<em>%s</em>" % more)
             else:
                 for i in authors_reversed:
                     authorinfo.append("%s (%d)" % (i, data.tags[tag]["authors"][i]))
-            f.write(
-                "<tr><td>%s</td><td>%s</td><td>%d</td><td>%s</td></tr>"
-                % (
+            rows.append(
+                (
                     tag,
                     data.tags[tag]["date"],
                     data.tags[tag]["commits"],
                     ", ".join(authorinfo),
                 )
             )
-        f.write("</table>")
+
+        if large:
+            f.write(
+                self._render_table(
+                    "tags",
+                    [
+                        {"title": "Name", "type": "text"},
+                        {"title": "Date", "type": "text"},
+                        {"title": "Commits", "type": "number"},
+                        {"title": "Authors", "type": "text"},
+                    ],
+                    rows,
+                )
+            )
+        else:
+            f.write('<table class="tags">')
+            f.write("<tr><th>Name</th><th>Date</th><th>Commits</th><th>Authors</th></tr>")
+            for row in rows:
+                f.write("<tr><td>%s</td><td>%s</td><td>%d</td><td>%s</td></tr>" % row)
+            f.write("</table>")
 
         self.print_footer(f)
         f.write("</body></html>")
@@ -942,7 +1200,7 @@ class HTMLReportCreator(ReportCreator):
         author_files = getattr(data, "author_files", {})
         if not isinstance(author_files, dict):
             author_files = {}
-        ownership = compute_code_ownership(author_files)
+        ownership = compute_code_ownership(author_files, limit=50)
 
         if not ownership["files"]:
             f.write(
@@ -969,7 +1227,7 @@ class HTMLReportCreator(ReportCreator):
             "<dt>Files tracked</dt><dd>%d</dd>"
             "<dt>Single-owner files</dt><dd>%d (%.1f%%)</dd>"
             "<dt>Contributors</dt><dd>%d</dd>"
-            "</dl></div>" % (total, single, single_pct, len(ownership["authors"]))
+            "</dl></div>" % (total, single, single_pct, ownership["total_authors"])
         )
 
         # Bus-factor risk: single-owner files, most-changed first
@@ -978,22 +1236,21 @@ class HTMLReportCreator(ReportCreator):
             "<p><em>Files only one author has ever changed. The more a file has "
             "changed, the more knowledge is at risk if that person leaves.</em></p>"
         )
-        risk_files = [fs for fs in ownership["files"] if fs["contributors"] == 1]
+        risk_files = ownership["single_owner"]
         if risk_files:
             f.write(
                 '<table class="sortable" id="ownership-busfactor">'
                 "<tr><th>File</th><th>Sole owner</th><th>Commits</th></tr>"
             )
-            for fs in risk_files[:50]:
+            for fs in risk_files:
                 f.write(
                     "<tr><td>%s</td><td>%s</td><td>%d</td></tr>"
                     % (html.escape(fs["path"]), html.escape(fs["owner"]), fs["edits"])
                 )
             f.write("</table>")
-            if len(risk_files) > 50:
+            if single > 50:
                 f.write(
-                    '<p class="moreauthors">Showing top 50 of %d single-owner files.</p>'
-                    % len(risk_files)
+                    '<p class="moreauthors">Showing top 50 of %d single-owner files.</p>' % single
                 )
         else:
             f.write("<p>No single-owner files — every file has multiple contributors.</p>")
@@ -1020,10 +1277,10 @@ class HTMLReportCreator(ReportCreator):
                 )
             )
         f.write("</table>")
-        if len(ownership["authors"]) > 25:
+        if ownership["total_authors"] > 25:
             f.write(
                 '<p class="moreauthors">Showing top 25 of %d contributors.</p>'
-                % len(ownership["authors"])
+                % ownership["total_authors"]
             )
 
         # Coordination hotspots: files with the most contributors
@@ -1032,11 +1289,7 @@ class HTMLReportCreator(ReportCreator):
             "<p><em>Files touched by the most people — shared code where changes "
             "are most likely to need coordination.</em></p>"
         )
-        shared = sorted(
-            (fs for fs in ownership["files"] if fs["contributors"] >= 2),
-            key=lambda x: (x["contributors"], x["edits"]),
-            reverse=True,
-        )
+        shared = ownership["shared"]
         if shared:
             f.write(
                 '<table class="sortable" id="ownership-shared">'
@@ -1302,6 +1555,43 @@ class HTMLReportCreator(ReportCreator):
 
     CHART_COLORS = ["#5b8dee", "#1a7f37", "#cf222e", "#8250df", "#e16f24", "#0550ae"]
 
+    def create_diagnostics_html(self, profile: dict[str, Any], path: str) -> None:
+        """Create the Run diagnostics page from a :func:`profiling.get_profile` result.
+
+        Written after the other pages, so their render times are included.
+        """
+        f = self._open_report_file(path, "diagnostics.html")
+        self.print_header(f)
+        self.print_nav(f)
+        f.write("<h1>Run diagnostics</h1>")
+
+        total_wall = profile["total_wall"]
+        f.write("<dl>")
+        f.write("<dt>Total time</dt><dd>%.3f s</dd>" % total_wall)
+        f.write(
+            "<dt>External commands</dt><dd>%.3f s in %d processes</dd>"
+            % (
+                profile["external_time"],
+                sum(total["processes"] for total in profile["commands"]),
+            )
+        )
+        f.write('<dt>Raw data</dt><dd><a href="profile.json">profile.json</a></dd>')
+        f.write("</dl>")
+
+        f.write(html_header(2, "Phases"))
+        f.write(
+            "<p>Phases run in worker processes are listed with <em>(worker)</em>; "
+            "concurrent phases overlap, so their times add up to more than the total.</p>"
+        )
+        f.write(_profile_table("phases", "Phase", profile["phases"]))
+
+        f.write(html_header(2, "External commands"))
+        f.write(_profile_table("commands", "Command", profile["commands"]))
+
+        self.print_footer(f)
+        f.write("</body></html>")
+        f.close()
+
     def _render_chartjs(
         self,
         chart_id,
@@ -1328,32 +1618,34 @@ class HTMLReportCreator(ReportCreator):
                 entry.setdefault("pointRadius", 2)
                 entry.setdefault("borderWidth", 1)
             else:
-                # single dataset: use CSS var for theme-aware color
-                entry["backgroundColor"] = "__CSS_BAR_COLOR__"
-                entry["borderColor"] = "__CSS_BAR_COLOR__"
+                # single dataset: colored from a CSS var when built, see below
+                entry.pop("backgroundColor", None)
+                entry.pop("borderColor", None)
                 if chart_type == "line":
                     entry.setdefault("borderWidth", 1)
                     entry.setdefault("pointRadius", 2)
             js_datasets.append(entry)
 
-        labels_json = json.dumps(labels).replace("</", "<\\/")
-        datasets_json = json.dumps(js_datasets).replace("</", "<\\/")
-        # Replace quoted placeholder with JS expression
-        datasets_json = datasets_json.replace('"__CSS_BAR_COLOR__"', "getCSSVar('--bar-color')")
+        payload = json.dumps({"labels": labels, "datasets": js_datasets}, separators=(",", ":"))
+        data_args = self._lazy_data_args(chart_id, payload)
+        # a single dataset takes the theme's bar color when the chart is built
+        bar_color = (
+            ""
+            if is_multi
+            else "\n    data.datasets[0].backgroundColor = data.datasets[0].borderColor = "
+            "getCSSVar('--bar-color');"
+        )
 
         x_ticks_opts = "maxRotation: 45, minRotation: 45" if x_ticks_rotate else "maxRotation: 0"
         legend_display = "true" if is_multi else "false"
 
         return f"""<div style="max-width:100%;margin-bottom:8px"><canvas id="{chart_id}"></canvas></div>
 <script>
-(function() {{
+lazyChart('{chart_id}', {data_args}, function(data) {{{bar_color}
   var ctx = document.getElementById('{chart_id}').getContext('2d');
   var chart = new Chart(ctx, {{
     type: '{chart_type}',
-    data: {{
-      labels: {labels_json},
-      datasets: {datasets_json}
-    }},
+    data: data,
     options: {{
       responsive: true,
       maintainAspectRatio: true,
@@ -1368,10 +1660,67 @@ class HTMLReportCreator(ReportCreator):
     }}
   }});
   document.addEventListener('themechange', function() {{ chart.update(); }});
-}})();
+}});
+</script>
+"""
+
+    def _render_table(self, table_id: str, columns: list[dict], rows: list[tuple]) -> str:
+        """Render a large table as JSON columns for ``virtualTable()`` (virtualtable.js).
+
+        ``columns`` are ``{"title", "type"}`` dicts, ``type`` being "text" or
+        "number", with optional ``digits`` for fixed-point numbers. The page
+        shows ``table_page_size`` rows at a time and builds only the rows in
+        view; headers sort the whole table.
+        """
+        data = [list(column) for column in zip(*rows)] if rows else [[] for _ in columns]
+        payload = json.dumps(
+            {
+                "columns": columns,
+                "rows": len(rows),
+                "pageSize": load_config()["table_page_size"],
+                "data": data,
+            },
+            separators=(",", ":"),
+        )
+        data_args = self._lazy_data_args(table_id, payload)
+        return f"""<div class="virtual-table" id="{table_id}"></div>
+<script>
+lazyChart('{table_id}', {data_args}, function(data) {{ virtualTable('{table_id}', data); }});
 </script>
 """
 
+    def _is_large_table(self, rows: int) -> bool:
+        """Whether a table of ``rows`` rows is rendered by :meth:`_render_table`."""
+        page_size = load_config()["table_page_size"]
+        return 0 < page_size < rows
+
+    def _lazy_data_args(self, data_id: str, payload: str) -> str:
+        """The ``data, src`` arguments of ``lazyChart()`` for a JSON payload."""
+        source = self._write_chart_data(data_id, payload)
+        if source is None:
+            return "{}, null".format(payload.replace("</", "<\\/"))
+        return f"null, '{source}'"
+
+    def _write_chart_data(self, chart_id: str, payload: str) -> str | None:
+        """Write a chart's JSON data to a content-hashed script in ``data/``.
+
+        Returns the script's path relative to the page, or None if the data
+        stays inline: it is small (``inline_chart_data_max``) or no report
+        is being written.
+        """
+        limit = load_config()["inline_chart_data_max"]
+        if self.path is None or limit < 0 or len(payload) <= limit:
+            return None
+        digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+        source = f"{_CHART_DATA_DIR}/{chart_id}.{digest}.js"
+        self.chart_data.append(source)
+        target = os.path.join(self.path, source)
+        script = f"chartData({json.dumps(source)},{payload});\n".encode()
+        # an unchanged chart keeps its file, and its name, from the last run
+        if not os.path.exists(target):
+            write_atomically(target, script)
+        return source
+
     def print_footer(self, file: Any) -> None:
         """
         Write the HTML page footer with a "Generated by gitstats" link.
@@ -1405,13 +1754,36 @@ class HTMLReportCreator(ReportCreator):
 	<title>GitStats - {}</title>
 	<!-- Apply theme before CSS loads to prevent flash of unstyled content -->
 	<script>(function(){{var t=localStorage.getItem('theme')||'light';document.documentElement.setAttribute('data-theme',t);}})();</script>
-	<link rel="stylesheet" href="{}" type="text/css">
+	<link rel="stylesheet" href="{assets}{}" type="text/css">
 	<meta name="generator" content="GitStats {}">
-	<script type="text/javascript" src="sortable.js"></script>
-	<script type="text/javascript" src="chart.umd.min.js"></script>
+	<script type="text/javascript" src="{assets}sortable.js"></script>{image_path}
+	<script type="text/javascript" src="{assets}chart.umd.min.js"></script>
+	<script type="text/javascript" src="{assets}virtualtable.js"></script>
 	<script>
 		function getCSSVar(v) {{ return getComputedStyle(document.documentElement).getPropertyValue(v).trim(); }}
 
+		// Charts are built once scrolled into view, from inline data or from a
+		// data script that hands its data to chartData() when loaded
+		var chartLoads = {{}};
+		function chartData(src, data) {{ chartLoads[src](data); }}
+		function lazyChart(id, data, src, build) {{
+			function load() {{
+				if (data) {{ build(data); return; }}
+				chartLoads[src] = build;
+				var script = document.createElement('script');
+				script.src = src;
+				document.head.appendChild(script);
+			}}
+			if (!('IntersectionObserver' in window)) {{ load(); return; }}
+			var observer = new IntersectionObserver(function(entries) {{
+				if (entries.some(function(e) {{ return e.isIntersecting; }})) {{
+					observer.disconnect();
+					load();
+				}}
+			}}, {{ rootMargin: '200px' }});
+			observer.observe(document.getElementById(id));
+		}}
+
 		function toggleTheme() {{
 			const currentTheme = document.documentElement.getAttribute('data-theme');
 			const newTheme = currentTheme === 'dark' ? 'light' : 'dark';
@@ -1434,7 +1806,18 @@ class HTMLReportCreator(ReportCreator):
 	</script>
 </head>
 <body>
-""".format(self.title, load_config()["style"], get_version())
+""".format(
+                self.title,
+                load_config()["style"],
+                get_version(),
+                assets=self.asset_prefix,
+                # sortable.js loads its arrow images relative to the page
+                image_path=(
+                    f"\n\t<script>image_path = '{self.asset_prefix}';</script>"
+                    if self.asset_prefix
+                    else ""
+                ),
+            )
         )
 
     def print_nav(self, file: Any) -> None:
@@ -1448,6 +1831,11 @@ class HTMLReportCreator(ReportCreator):
         has_ai = hasattr(self.data, "ai_summaries") and self.data.ai_summaries
 
         ai_link = '<li><a href="ai-insights.html">AI Insights</a></li>' if has_ai else ""
+        diagnostics_link = (
+            '<li><a href="diagnostics.html">Run diagnostics</a></li>'
+            if profiling.is_enabled()
+            else ""
+        )
 
         github_icon = (
             '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 16 16" width="20" height="20" '
@@ -1476,6 +1864,7 @@ class HTMLReportCreator(ReportCreator):
             <li><a href="ownership.html">Code Ownership</a></li>
             <li><a href="history.html">History</a></li>
             {ai_link}
+            {diagnostics_link}
             </ul>
             <div class="nav-right">
             <a href="https://github.com/shenxianpeng/gitstats" class="nav-github" target="_blank" rel="noopener" aria-label="GitHub">{github_icon}</a>
@@ -1524,30 +1913,254 @@ class HTMLReportCreator(ReportCreator):
         """
 
 
-def compute_code_ownership(author_files: dict[str, dict[str, int]]) -> dict[str, Any]:
+# ── incremental pages ───────────────────────────────────────────────────
+
+_MANIFEST = "gitstats.manifest"
+_MANIFEST_VERSION = 1
+# static files every page loads, besides the configured stylesheet
+_ASSETS = (
+    "sortable.js",
+    "chart.umd.min.js",
+    "virtualtable.js",
+    "arrow-up.gif",
+    "arrow-down.gif",
+    "arrow-none.gif",
+)
+# pages showing the last weeks or years before today, with the clock they follow
+_PAGE_CLOCKS = {"activity": "%Y-%W"}
+
+
+def _load_manifest(path: str) -> dict[str, Any]:
+    """The manifest of the last run in ``path``; empty if missing or disabled."""
+    if not load_config()["incremental_pages"]:
+        return {}
+    try:
+        with open(os.path.join(path, _MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get("version") == _MANIFEST_VERSION else {}
+
+
+def _save_manifest(path: str, manifest: dict[str, Any]) -> None:
+    target = os.path.join(path, _MANIFEST)
+    if not load_config()["incremental_pages"]:
+        # a manifest left over would vouch for pages it did not see written
+        if os.path.exists(target):
+            os.remove(target)
+        return
+    manifest = {"version": _MANIFEST_VERSION, **manifest}
+    write_atomically(target, json.dumps(manifest, sort_keys=True).encode("utf-8"))
+
+
+def report_assets() -> tuple[str, ...]:
+    """The static files the report pages load, the configured stylesheet first."""
+    return (load_config()["style"],) + _ASSETS
+
+
+def _copy_assets(
+    path: str, files: Iterable[str], previous: dict[str, str], link_from: str | None = None
+) -> dict[str, str]:
+    """Copy static files into ``path``; returns their content hashes for the manifest.
+
+    A file whose hash matches ``previous`` (the last run's) and that is still
+    there is left untouched, modification time included. With ``link_from``
+    the files are hard links to the copies in that directory instead, where
+    the file system allows it.
+    """
+    basedir = link_from or os.path.dirname(os.path.abspath(__file__))
+    base = os.path.abspath(path)
+    assets = {}
+    for file in files:
+        src = os.path.join(basedir, os.path.basename(file))
+        target = os.path.abspath(os.path.join(base, os.path.basename(file)))
+        if os.path.commonpath([base, target]) != base:
+            raise ValueError(f"Refusing to write outside report directory: {file}")
+        if not os.path.exists(src):
+            continue
+        with open(src, "rb") as f:
+            assets[file] = hashlib.sha256(f.read()).hexdigest()
+        if link_from is not None:
+            if os.path.exists(target) and os.path.samefile(src, target):
+                continue
+            if os.path.exists(target):
+                os.remove(target)
+            try:
+                os.link(src, target)
+                continue
+            except OSError:
+                pass  # e.g. another file system: copy instead
+        elif previous.get(file) == assets[file] and os.path.exists(target):
+            continue
+        shutil.copyfile(src, target)
+    return assets
+
+
+def _page_clock(name: str) -> str:
+    clock = _PAGE_CLOCKS.get(name)
+    return time.strftime(clock) if clock else ""
+
+
+def _code_hash() -> str:
+    """Hash of the package's code, scripts and stylesheets, so changes to them re-render pages."""
+    digest = hashlib.sha256()
+    basedir = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(basedir)):
+        if name.endswith((".py", ".js", ".css")):
+            digest.update(name.encode("utf-8") + b"\0")
+            with open(os.path.join(basedir, name), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _fingerprint_default(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=repr)
+    if isinstance(value, array):
+        return value.tolist()
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    raise TypeError(f"cannot fingerprint {type(value).__name__}")
+
+
+def _fingerprint(context: str, data: Any, names: list[str]) -> str | None:
+    """Hash of ``context`` and of the collector attributes ``names``.
+
+    None if a value cannot be fingerprinted; the page is rendered then.
+    """
+    digest = hashlib.sha256(context.encode("utf-8"))
+    try:
+        for name in names:
+            value = json.dumps(getattr(data, name), default=_fingerprint_default)
+            digest.update(f"{name}={value}\n".encode())
+    except (AttributeError, TypeError, ValueError):
+        return None
+    return digest.hexdigest()
+
+
+class _ReadRecorder:
+    """Stands in for the collector while a page renders, noting which of its
+    instance attributes the page reads.
+
+    Methods and properties of the collector run against the recorder, so the
+    attributes they read are noted too. Each attribute is looked up through
+    the collector once and then kept on the recorder, so reading it again
+    costs no more than on the collector itself.
+    """
+
+    def __init__(self, data: Any) -> None:
+        object.__setattr__(self, "_recorder_data", data)
+        object.__setattr__(self, "_recorder_reads", set())
+
+    def __getattr__(self, name: str) -> Any:
+        data = self._recorder_data
+        attribute = getattr(type(data), name, None)
+        if isinstance(attribute, property):
+            return attribute.__get__(self)
+        value = getattr(data, name)
+        if name in data.__dict__:
+            self._recorder_reads.add(name)
+        elif isinstance(value, types.MethodType) and value.__self__ is data:
+            value = types.MethodType(value.__func__, self)
+        object.__setattr__(self, name, value)
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._recorder_data, name, value)
+        object.__setattr__(self, name, value)
+
+    @classmethod
+    def wrap(cls, data: Any) -> "_ReadRecorder | None":
+        """A recorder for ``data``; None for objects whose attribute access is customized."""
+        kind = type(data)
+        if (
+            kind.__getattribute__ is not object.__getattribute__
+            or kind.__setattr__ is not object.__setattr__
+            or hasattr(kind, "__getattr__")
+            or not hasattr(data, "__dict__")
+        ):
+            return None
+        return cls(data)
+
+
+# (creator, pages, data, path) of the report being rendered, inherited by forked workers
+_render_job: tuple[Any, dict[str, Any], Any, str] | None = None
+
+
+def _render_page(
+    name: str, job: tuple[Any, dict[str, Any], Any, str] | None = None
+) -> tuple[float, list[str], list[str] | None]:
+    """Render one page of ``job`` (of the inherited render job by default).
+
+    Returns the time it took, the chart data files the page uses and the
+    collector attributes it read (None if they could not be recorded).
+    """
+    job = job or _render_job
+    assert job is not None, "no render job to take the page from"
+    creator, pages, data, path = job
+    creator.chart_data = []
+    recorder = _ReadRecorder.wrap(data)
+    start = time.time()
+    if recorder is not None:
+        # the page helpers read the collector through creator.data too
+        data = creator.data = recorder
+    try:
+        with profiling.phase(f"render:{name}"):
+            pages[name](data, path)
+    finally:
+        if recorder is not None:
+            creator.data = recorder._recorder_data
+    reads = None if recorder is None else sorted(recorder._recorder_reads)
+    return time.time() - start, creator.chart_data, reads
+
+
+def compute_code_ownership(
+    author_files: Mapping[str, PathCounts | Mapping[str, int]], limit: int | None = None
+) -> dict[str, Any]:
     """Derive per-file ownership and per-author stats from author edit counts.
 
     Args:
         author_files: mapping of author -> file path -> number of commits that
-            author made touching the file.
+            author made touching the file. When these are :class:`PathCounts`
+            of one table, as collected, files are handled by path id and each
+            path is spelled out once.
+        limit: keep only this many entries of each ranking (all for None).
 
     Bot accounts (names ending in ``[bot]``) are excluded so ownership reflects
     human contributors. Returns a dict with:
-        files:   per-file stats (path, edits, owner, owner_edits, ownership_pct,
-                 contributors), sorted by edits descending;
-        authors: per-author stats (author, files_owned, files_solely_owned,
-                 files_touched), sorted by files owned then files touched;
-        total_files, single_owner_files.
+        files:        per-file stats (path, edits, owner, owner_edits,
+                      ownership_pct, contributors), sorted by edits descending;
+        single_owner: the files with one contributor, in the same order;
+        shared:       the files with several contributors, sorted by
+                      contributors then edits;
+        authors:      per-author stats (author, files_owned,
+                      files_solely_owned, files_touched), sorted by files
+                      owned then files touched;
+        total_files, single_owner_files, total_authors.
     """
+    path_counts = [files for files in author_files.values() if isinstance(files, PathCounts)]
+    table = None
+    if len(path_counts) == len(author_files) and len({id(f.table) for f in path_counts}) == 1:
+        table = path_counts[0].table
+
     # Invert to file -> {author: edits}, dropping bots.
-    file_authors: dict[str, dict[str, int]] = {}
+    file_authors: dict[Any, dict[str, int]] = {}
     for author, files in author_files.items():
         if author.endswith("[bot]"):
             continue
-        for filepath, count in files.items():
+        pairs: Iterable[tuple[Any, int]] = files.items()
+        if table is not None and isinstance(files, PathCounts):
+            pairs = files.id_items()
+        for filepath, count in pairs:
             file_authors.setdefault(filepath, {})[author] = count
 
-    files_stats: list[dict[str, Any]] = []
+    # (file, edits, owner, owner edits, contributors); stats are only built
+    # for the files that make it into a ranking
+    rows: list[tuple[Any, int, str, int, int]] = []
     author_owned: dict[str, int] = {}
     author_solely: dict[str, int] = {}
     author_touched: dict[str, int] = {}
@@ -1556,40 +2169,52 @@ def compute_code_ownership(author_files: dict[str, dict[str, int]]) -> dict[str,
         # Primary owner: most edits; ties broken alphabetically for determinism.
         owner = max(zip(authors.values(), authors.keys()))[1]
         contributors = len(authors)
-        files_stats.append(
-            {
-                "path": filepath,
-                "edits": edits,
-                "owner": owner,
-                "owner_edits": authors[owner],
-                "ownership_pct": round(100.0 * authors[owner] / edits, 1) if edits else 0.0,
-                "contributors": contributors,
-            }
-        )
+        rows.append((filepath, edits, owner, authors[owner], contributors))
         author_owned[owner] = author_owned.get(owner, 0) + 1
         if contributors == 1:
             author_solely[owner] = author_solely.get(owner, 0) + 1
         for a in authors:
             author_touched[a] = author_touched.get(a, 0) + 1
 
-    files_stats.sort(key=lambda x: x["edits"], reverse=True)
+    def file_stats(ranked: list[tuple[Any, int, str, int, int]]) -> list[dict[str, Any]]:
+        return [
+            {
+                "path": table.path(filepath) if table is not None else filepath,
+                "edits": edits,
+                "owner": owner,
+                "owner_edits": owner_edits,
+                "ownership_pct": round(100.0 * owner_edits / edits, 1) if edits else 0.0,
+                "contributors": contributors,
+            }
+            for filepath, edits, owner, owner_edits, contributors in ranked
+        ]
 
-    authors_stats = [
-        {
-            "author": a,
-            "files_owned": author_owned.get(a, 0),
-            "files_solely_owned": author_solely.get(a, 0),
-            "files_touched": author_touched[a],
-        }
-        for a in author_touched
-    ]
-    authors_stats.sort(key=lambda x: (x["files_owned"], x["files_touched"]), reverse=True)
+    by_edits = itemgetter(1)
+    single = [row for row in rows if row[4] == 1]
+    top_authors = top_k(
+        author_touched,
+        limit,
+        key=lambda a: (author_owned.get(a, 0), author_touched[a]),
+    )
 
     return {
-        "files": files_stats,
-        "authors": authors_stats,
-        "total_files": len(files_stats),
-        "single_owner_files": sum(1 for fs in files_stats if fs["contributors"] == 1),
+        "files": file_stats(top_k(rows, limit, key=by_edits)),
+        "single_owner": file_stats(top_k(single, limit, key=by_edits)),
+        "shared": file_stats(
+            top_k((row for row in rows if row[4] >= 2), limit, key=itemgetter(4, 1))
+        ),
+        "authors": [
+            {
+                "author": a,
+                "files_owned": author_owned.get(a, 0),
+                "files_solely_owned": author_solely.get(a, 0),
+                "files_touched": author_touched[a],
+            }
+            for a in top_authors
+        ],
+        "total_files": len(rows),
+        "single_owner_files": len(single),
+        "total_authors": len(author_touched),
     }
 
 
@@ -1671,7 +2296,7 @@ def compute_project_history(data: Any) -> dict[str, Any]:
         stamp = info.get("first_commit_stamp") if isinstance(info, dict) else None
         if not stamp or name.endswith("[bot]"):
             continue
-        yy = datetime.datetime.fromtimestamp(stamp).year
+        yy = stamp_keys(stamp)[2]
         newcomers_by_year.setdefault(yy, []).append(name)
 
     # Releases (tags) by the year they were made.
@@ -1755,6 +2380,29 @@ def parse_chronicle(text: str) -> dict[str, Any]:
     return {"prologue": prologue, "chapters": chapters}
 
 
+def _profile_table(table_id: str, first_column: str, totals: list[dict[str, Any]]) -> str:
+    """Render per-phase or per-command profile totals as a sortable table."""
+    rows = [
+        f'<table class="sortable" id="{table_id}">'
+        f"<tr><th>{first_column}</th><th>Count</th><th>Wall (s)</th><th>CPU (s)</th>"
+        "<th>Bytes read</th><th>Processes</th></tr>"
+    ]
+    for total in totals:
+        rows.append(
+            "<tr><td>%s</td><td>%d</td><td>%.3f</td><td>%.3f</td><td>%d</td><td>%d</td></tr>"
+            % (
+                html.escape(total["name"] or "(none)"),
+                total["count"],
+                total["wall"],
+                total["cpu"],
+                total["bytes_read"],
+                total["processes"],
+            )
+        )
+    rows.append("</table>")
+    return "".join(rows)
+
+
 def html_header(level: int, text: str) -> str:
     name = html_linkify(text)
     return '\n<h%d id="%s"><a href="#%s">%s</a></h%d>\n\n' % (
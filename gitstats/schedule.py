@@ -0,0 +1,202 @@
+"""
+Cost model, scheduling and progress of multi-repository runs.
+
+Before anything is analyzed, :func:`estimate_repo` sizes up each repository
+with a few cheap git commands: its object count and size
+(``git count-objects -v``), its commit count (``git rev-list --count``) and
+the number of files in its HEAD tree. :class:`RepoSchedule` turns these into
+costs and starts the costliest repositories first (longest processing time
+first), so that a huge repository does not start last and keep the run going
+long after the other workers went idle. The portfolio's ``portfolio.json``
+keeps the estimates and the measured durations; later runs schedule the
+repositories by how long they took and scale the estimates of new ones to
+match.
+"""
+
+import datetime
+import heapq
+import json
+import logging
+import os
+import shlex
+import time
+from collections.abc import Mapping
+from typing import Any
+
+from gitstats.utils import get_pipe_output, get_version
+
+logger = logging.getLogger("gitstats")
+
+# cost of a commit, a file in HEAD and a KiB of objects; only their
+# proportions matter, measured durations scale them to seconds
+_COMMIT_COST = 1.0
+_FILE_COST = 0.2
+_KIB_COST = 0.01
+
+# next to the per-repository directories and their ``summary.json``
+PORTFOLIO_FILE = "portfolio.json"
+
+
+def estimate_repo(path: str) -> dict[str, int]:
+    """Commits, files in HEAD, objects and KiB of objects of the repository at ``path``.
+
+    What cannot be read (not a repository, no commits yet) counts as 0.
+    """
+    git = f"git -C {shlex.quote(os.path.abspath(path))}"
+    counts = {}
+    for line in get_pipe_output([f"{git} count-objects -v"], quiet=True).splitlines():
+        key, _, value = line.partition(":")
+        if value.strip().isdigit():
+            counts[key.strip()] = int(value)
+    commits = get_pipe_output([f"{git} rev-list --count HEAD"], quiet=True).strip()
+    files = get_pipe_output([f"{git} ls-tree -r --name-only HEAD", "wc -l"], quiet=True)
+    return {
+        "commits": int(commits) if commits.isdigit() else 0,
+        "files": int(files) if files.isdigit() else 0,
+        "objects": counts.get("count", 0) + counts.get("in-pack", 0),
+        "size_kib": counts.get("size", 0) + counts.get("size-pack", 0),
+    }
+
+
+def estimate_cost(estimate: Mapping[str, int]) -> float:
+    """Cost of analyzing a repository of the size :func:`estimate_repo` found."""
+    return (
+        estimate.get("commits", 0) * _COMMIT_COST
+        + estimate.get("files", 0) * _FILE_COST
+        + estimate.get("size_kib", 0) * _KIB_COST
+    )
+
+
+def load_portfolio_summary(outputpath: str) -> dict[str, dict[str, Any]]:
+    """Repositories of the ``portfolio.json`` in ``outputpath``, by path.
+
+    Empty if there is none, e.g. before the first multi-repo run.
+    """
+    try:
+        with open(os.path.join(outputpath, PORTFOLIO_FILE), encoding="utf-8") as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    repos = summary.get("repositories") if isinstance(summary, dict) else None
+    if not isinstance(repos, list):
+        return {}
+    return {repo["path"]: repo for repo in repos if isinstance(repo, dict) and "path" in repo}
+
+
+def write_portfolio_summary(summary: Mapping[str, Any], outputpath: str) -> None:
+    """Write :meth:`RepoSchedule.portfolio_summary` as ``portfolio.json`` into ``outputpath``."""
+    with open(os.path.join(outputpath, PORTFOLIO_FILE), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+
+class RepoSchedule:
+    """Order, cost and progress of the repositories of a multi-repo run.
+
+    A repository analyzed by an earlier run costs the seconds it took then;
+    the others cost their estimate, scaled by the seconds per unit of
+    estimated cost the measured repositories took. Repositories are started
+    in :attr:`order`, costliest first, and their progress is logged as they
+    finish.
+    """
+
+    def __init__(
+        self,
+        repos: list[tuple[str, str, dict[str, int] | None]],
+        previous: Mapping[str, Mapping[str, Any]],
+    ) -> None:
+        """``repos`` are (path, name, estimate) in input order; ``previous`` is
+        :func:`load_portfolio_summary` of the output directory."""
+        self.paths = [os.path.abspath(path) for path, _, _ in repos]
+        self.names = [name for _, name, _ in repos]
+        self.estimates = []
+        for path, (_, _, estimate) in zip(self.paths, repos):
+            if estimate is None:
+                estimate = previous.get(path, {}).get("estimate")
+            self.estimates.append(dict(estimate or {}))
+        self._raw_costs = [estimate_cost(estimate) for estimate in self.estimates]
+
+        measured = {
+            path: repo
+            for path, repo in previous.items()
+            if repo.get("status") == "ok" and repo.get("seconds") and repo.get("cost")
+        }
+        # seconds per unit of estimated cost
+        self.calibrated = bool(measured)
+        scale = 1.0
+        if measured:
+            scale = sum(repo["seconds"] for repo in measured.values()) / sum(
+                repo["cost"] for repo in measured.values()
+            )
+        self.costs = [
+            measured[path]["seconds"] if path in measured else cost * scale
+            for path, cost in zip(self.paths, self._raw_costs)
+        ]
+        # sorted() is stable: equal costs keep their input order
+        self.order = sorted(range(len(repos)), key=lambda i: -self.costs[i])
+
+        self.seconds: list[float | None] = [None] * len(repos)
+        self.failed = [False] * len(repos)
+        self._started: dict[int, float] = {}
+        self._start = time.monotonic()
+        self._done = 0
+        self._done_cost = 0.0
+        self._commits = 0
+
+    def makespan(self, jobs: int) -> float:
+        """Expected duration of the run with ``jobs`` repositories analyzed at once."""
+        workers = [0.0] * max(1, jobs)
+        for index in self.order:
+            # the next repository starts on the worker that is free first
+            heapq.heapreplace(workers, workers[0] + self.costs[index])
+        return max(workers)
+
+    def started(self, index: int) -> None:
+        """Note that the analysis of repository ``index`` starts now."""
+        self._started[index] = time.monotonic()
+
+    def finished(self, index: int, outcome: Any) -> None:
+        """Note that repository ``index`` is done and log the progress of the run.
+
+        ``outcome`` is the repository's summary, or an error message.
+        """
+        now = time.monotonic()
+        self.seconds[index] = now - self._started.get(index, now)
+        self.failed[index] = isinstance(outcome, str)
+        if isinstance(outcome, Mapping):
+            self._commits += outcome.get("total_commits", 0)
+        self._done += 1
+        self._done_cost += self.costs[index]
+
+        elapsed = max(now - self._start, 1e-6)
+        message = (
+            f"{self._done} of {len(self.costs)} repositories done in {elapsed:.1f} secs "
+            f"({60 * self._done / elapsed:.1f} repos/min, "
+            f"{self._commits / elapsed:.0f} commits/sec)"
+        )
+        if self._done < len(self.costs) and self._done_cost > 0:
+            # the costs finished so far took this long, whatever ran in parallel
+            left = elapsed * (sum(self.costs) - self._done_cost) / self._done_cost
+            message += f", about {datetime.timedelta(seconds=round(left))} left"
+        logger.info(message)
+
+    def portfolio_summary(self) -> dict[str, Any]:
+        """The ``portfolio.json``: estimate and duration per repository."""
+        repos = []
+        for i, path in enumerate(self.paths):
+            repo: dict[str, Any] = {
+                "name": self.names[i],
+                "path": path,
+                "status": "failed" if self.failed[i] else "ok",
+                "estimate": self.estimates[i],
+                "cost": round(self._raw_costs[i], 3),
+            }
+            seconds = self.seconds[i]
+            if seconds is not None:
+                repo["seconds"] = round(seconds, 3)
+            repos.append(repo)
+        return {
+            "schema_version": 1,
+            "generated_by": f"gitstats {get_version()}",
+            "generated_at": datetime.datetime.now().astimezone().isoformat(timespec="seconds"),
+            "repositories": repos,
+        }
@@ -0,0 +1,82 @@
+"""
+Calendar bucketing of commit timestamps for GitStats.
+
+Statistics and charts bucket commits by local hour, weekday, week, month,
+year and day. :func:`local_day` maps a timestamp to its local day and hour,
+looking up the local time once per UTC hour, and :func:`day_keys` formats
+the bucket keys of a day once. Both are memoized for the whole process, so
+the collector and the report creators share the work instead of calling
+``datetime.fromtimestamp`` and ``strftime`` for every commit. Call
+:func:`reset` after changing the local timezone (``TZ``) at runtime.
+"""
+
+import datetime
+from typing import Any
+
+_HOUR = 3600
+_DAY = 24 * _HOUR
+
+# UTC hour start -> (local day, local second of day) at that instant, or None
+# when the UTC offset changes within the hour
+_hour_starts: dict[int, tuple[int, int] | None] = {}
+# local day -> (weekday, month, year, "%Y-%W", "%Y-%m", "%Y-%m-%d")
+_day_keys: dict[int, tuple[int, int, int, str, str, str]] = {}
+# default of _hour_starts lookups, whose values may be None
+_MISSING: Any = object()
+
+
+def reset() -> None:
+    """Forget memoized conversions, e.g. after the local timezone changed."""
+    _hour_starts.clear()
+    _day_keys.clear()
+
+
+def local_day(stamp: int) -> tuple[int, int]:
+    """Local ``(day, hour)`` of a timestamp; ``day`` is a ``date.toordinal()``."""
+    hour_start = stamp - stamp % _HOUR
+    start = _hour_starts.get(hour_start, _MISSING)
+    if start is _MISSING:
+        start = _hour_starts[hour_start] = _local_hour_start(hour_start)
+    if start is None:
+        date = datetime.datetime.fromtimestamp(stamp)
+        return date.toordinal(), date.hour
+    day, second = start
+    second += stamp - hour_start
+    if second >= _DAY:
+        day += 1
+        second -= _DAY
+    return day, second // _HOUR
+
+
+def _local_hour_start(hour_start: int) -> tuple[int, int] | None:
+    first = datetime.datetime.fromtimestamp(hour_start)
+    last = datetime.datetime.fromtimestamp(hour_start + _HOUR - 1)
+    if last - first != datetime.timedelta(seconds=_HOUR - 1):
+        return None
+    return first.toordinal(), first.hour * _HOUR + first.minute * 60 + first.second
+
+
+def day_keys(day: int) -> tuple[int, int, int, str, str, str]:
+    """Bucket keys of a local day: ``(weekday, month, year, "%Y-%W", "%Y-%m", "%Y-%m-%d")``."""
+    keys = _day_keys.get(day)
+    if keys is None:
+        date = datetime.date.fromordinal(day)
+        keys = _day_keys[day] = (
+            date.weekday(),
+            date.month,
+            date.year,
+            date.strftime("%Y-%W"),
+            date.strftime("%Y-%m"),
+            date.strftime("%Y-%m-%d"),
+        )
+    return keys
+
+
+def stamp_keys(stamp: int) -> tuple[int, int, int, str, str, str]:
+    """:func:`day_keys` of the local day of a timestamp."""
+    return day_keys(local_day(stamp)[0])
+
+
+def date_label(stamp: int) -> str:
+    """Local date of a timestamp as ``YYYY-MM-DD``."""
+    return stamp_keys(stamp)[5]
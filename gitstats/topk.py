@@ -0,0 +1,82 @@
+"""
+Bounded top-K selection for GitStats.
+
+The report lists only the first few entries of long rankings: the most
+changed files, the most active authors and domains, the riskiest
+single-owner files. :func:`top_k` picks them with a bounded heap in
+O(n log k) instead of sorting every entry, and returns exactly what the full
+sort would have, ties included. :class:`SpaceSaving` estimates the heaviest
+keys of a stream of increments in a fixed number of counters, for streams
+too long to count exactly.
+"""
+
+import heapq
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def top_k(items: Iterable[T], k: int | None, key: Callable[[T], Any]) -> list[T]:
+    """The ``k`` largest ``items`` by ``key``, largest first (all of them for None).
+
+    Same as ``sorted(items, key=key, reverse=True)[:k]``: equal keys keep
+    their input order.
+    """
+    if k is None:
+        return sorted(items, key=key, reverse=True)
+    return heapq.nlargest(k, items, key=key)
+
+
+class SpaceSaving:
+    """Approximate counts of the heaviest keys of a stream (the Space-Saving algorithm).
+
+    Keeps at most ``capacity`` counters. A key arriving when all are taken
+    replaces the smallest one and inherits its count, so counts are
+    overestimated by at most the smallest count, and every key counted more
+    often than ``total / capacity`` is kept.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0
+        self.counts: dict[Hashable, int] = {}  # key -> count, in order of admission
+        self.errors: dict[Hashable, int] = {}  # key -> overestimation bound
+        # one (count, admission, key) entry per counter; counts may lag behind
+        # ``counts`` and are brought up to date when the entry reaches the top
+        self._heap: list[tuple[int, int, Hashable]] = []
+        self._admitted = 0
+
+    def add(self, key: Hashable, count: int = 1) -> None:
+        """Count ``key`` ``count`` more times."""
+        self.total += count
+        counts = self.counts
+        if key in counts:
+            counts[key] += count
+            return
+        error = 0
+        if len(counts) >= self.capacity:
+            evicted, error = self._pop_smallest()
+            del counts[evicted]
+            del self.errors[evicted]
+        counts[key] = error + count
+        self.errors[key] = error
+        self._admitted += 1
+        heapq.heappush(self._heap, (counts[key], self._admitted, key))
+
+    def _pop_smallest(self) -> tuple[Hashable, int]:
+        heap = self._heap
+        while True:
+            count, admitted, key = heap[0]
+            current = self.counts[key]
+            if current == count:
+                heapq.heappop(heap)
+                return key, count
+            # the key was counted since it was pushed; move it to its current count
+            heapq.heapreplace(heap, (current, admitted, key))
+
+    def top(self, k: int | None = None) -> list[tuple[Hashable, int]]:
+        """The ``k`` heaviest ``(key, estimated count)`` pairs, heaviest first."""
+        return top_k(self.counts.items(), k, key=lambda item: item[1])
@@ -6,16 +6,33 @@ import logging
 import os
 import re
 import shlex
+import sqlite3
 import subprocess
 import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from importlib.metadata import PackageNotFoundError, version
 from typing import Any
 
-from gitstats import ON_LINUX, exectime_external, load_config
+from gitstats import ON_LINUX, load_config, profiling
+from gitstats.cache import SharedBlobCache, default_shared_cache_dir
+from gitstats.object_store import GitObjectStore, ObjectStoreError, find_git_dir
 
 logger = logging.getLogger("gitstats")
 
 _WC_L_CMD = "wc -l"
+_PIPE_CHUNK_SIZE = 1 << 16
+_object_stores: dict[str, GitObjectStore | None] = {}
+# A forked worker may inherit a store whose lock is held by another thread
+os.register_at_fork(after_in_child=_object_stores.clear)
+# Version of the line counting and binary detection rules of
+# get_num_of_lines_in_blobs; bump it whenever they change, as it keys the
+# counts kept in the shared blob cache
+LINE_COUNT_VERSION = 1
+_shared_blob_caches: dict[str, SharedBlobCache | None] = {}
+_run_blob_caches: list[SharedBlobCache] = []
+os.register_at_fork(after_in_child=_shared_blob_caches.clear)
+os.register_at_fork(after_in_child=_run_blob_caches.clear)
 
 
 def count_lines_in_text(text: str | None) -> int:
@@ -25,6 +42,14 @@ def count_lines_in_text(text: str | None) -> int:
     return len(text.strip().split("\n"))
 
 
+def count_lines_in_bytes(data: bytes) -> int:
+    """Count lines in raw blob content, with the same rules as ``count_lines_in_text``"""
+    data = data.strip()
+    if not data:
+        return 0
+    return data.count(b"\n") + 1
+
+
 def filter_lines_by_pattern(text: str | None, pattern: str) -> str:
     """Filter out lines matching a pattern (cross-platform grep -v replacement)"""
     if not text or not text.strip():
@@ -54,21 +79,47 @@ def format_int(value: Any) -> str:
         return str(value)
 
 
+def write_atomically(target: str, content: bytes) -> None:
+    """Write a file under a temporary name first, so readers never see it half written."""
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    tmpfile = f"{target}.{os.getpid()}.tmp"
+    with open(tmpfile, "wb") as f:
+        f.write(content)
+    os.replace(tmpfile, target)
+
+
 def get_git_version() -> str:
     return get_pipe_output(["git --version"]).split("\n")[0]
 
 
-def _run_command(cmd: str) -> bytes:
-    """Run a single command safely without shell=True."""
+def _reap(proc: subprocess.Popen) -> float:
+    """Wait for ``proc`` and return the CPU seconds it used (0.0 where unknown)."""
+    if proc.returncode is None and hasattr(os, "wait4"):
+        try:
+            _, status, usage = os.wait4(proc.pid, 0)
+        except ChildProcessError:
+            proc.wait()
+            return 0.0
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        return usage.ru_utime + usage.ru_stime
+    proc.wait()
+    return 0.0
+
+
+def _run_command(cmd: str) -> tuple[bytes, float]:
+    """Run a single command safely without shell=True; returns (stdout, CPU seconds)."""
     args = shlex.split(cmd)
-    result = subprocess.run(args, capture_output=True, text=False, check=False)
-    return result.stdout
+    proc = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    output = proc.stdout.read() if proc.stdout is not None else b""
+    if proc.stdout is not None:
+        proc.stdout.close()
+    return output, _reap(proc)
 
 
-def _run_pipe_chain(cmds: list[str]) -> bytes:
-    """Run a chain of piped commands safely without shell=True."""
+def _run_pipe_chain(cmds: list[str]) -> tuple[bytes, float]:
+    """Run a chain of piped commands safely without shell=True; returns (stdout, CPU seconds)."""
     if not cmds:
-        return b""
+        return b"", 0.0
 
     args = shlex.split(cmds[0])
     p = subprocess.Popen(args, stdout=subprocess.PIPE)
@@ -79,21 +130,21 @@ def _run_pipe_chain(cmds: list[str]) -> bytes:
         p = subprocess.Popen(args, stdin=p.stdout, stdout=subprocess.PIPE)
         processes.append(p)
 
-    output, _ = p.communicate()
+    output = p.stdout.read() if p.stdout is not None else b""
     for proc in processes:
-        proc.wait()
-    return output
+        if proc.stdout is not None:
+            proc.stdout.close()
+    return output, sum(_reap(proc) for proc in processes)
 
 
 def get_pipe_output(cmds: list[str], quiet: bool = False) -> str:
-    global exectime_external
     start = time.time()
     if not quiet and ON_LINUX and os.isatty(1):
         logger.debug(">> " + " | ".join(cmds))
 
     # Handle cross-platform cases with Python equivalents (no shell pipes)
     if len(cmds) == 2 and cmds[1] == _WC_L_CMD:
-        output = _run_command(cmds[0])
+        output, cpu = _run_command(cmds[0])
         try:
             text = output.decode("utf-8", errors="replace").rstrip("\n")
         except UnicodeDecodeError:
@@ -102,14 +153,14 @@ def get_pipe_output(cmds: list[str], quiet: bool = False) -> str:
         result = str(line_count)
     elif len(cmds) == 2 and cmds[1].startswith("grep -v"):
         pattern = cmds[1].split("grep -v ")[1]
-        output = _run_command(cmds[0])
+        output, cpu = _run_command(cmds[0])
         try:
             text = output.decode("utf-8", errors="replace").rstrip("\n")
         except UnicodeDecodeError:
             text = output.decode("latin-1", errors="replace").rstrip("\n")
         result = filter_lines_by_pattern(text, pattern)
     else:
-        output = _run_pipe_chain(cmds)
+        output, cpu = _run_pipe_chain(cmds)
         try:
             result = output.decode("utf-8", errors="replace").rstrip("\n")
         except UnicodeDecodeError:
@@ -118,10 +169,55 @@ def get_pipe_output(cmds: list[str], quiet: bool = False) -> str:
     end = time.time()
     if not quiet:
         logger.debug("[{:.5f}] >> {}".format(end - start, " | ".join(cmds)))
-    exectime_external += end - start
+    profiling.record_command(" | ".join(cmds), end - start, cpu, len(output), len(cmds))
     return result
 
 
+def iter_pipe_lines(cmd: str, sep: bytes = b"\n", quiet: bool = False) -> Iterator[str]:
+    """Yield the records of a command's output as the command produces them.
+
+    Unlike :func:`get_pipe_output` the whole output is never held in memory:
+    stdout is read in chunks and split on ``sep`` (``b"\\0"`` for ``-z``
+    output), so peak memory is bounded by the longest record. A trailing
+    separator does not yield an empty last record. Closing the generator
+    early stops the command.
+    """
+    start = time.time()
+    if not quiet and ON_LINUX and os.isatty(1):
+        logger.debug(">> " + cmd)
+
+    proc = subprocess.Popen(shlex.split(cmd), stdout=subprocess.PIPE)
+    stdout = proc.stdout
+    finished = False
+    bytes_read = 0
+    try:
+        if stdout is None:
+            return
+        pending = b""
+        while True:
+            chunk = os.read(stdout.fileno(), _PIPE_CHUNK_SIZE)
+            if not chunk:
+                break
+            bytes_read += len(chunk)
+            records = (pending + chunk).split(sep)
+            pending = records.pop()
+            for record in records:
+                yield record.decode("utf-8", errors="replace")
+        if pending:
+            yield pending.decode("utf-8", errors="replace")
+        finished = True
+    finally:
+        if not finished:
+            proc.kill()
+        if stdout is not None:
+            stdout.close()
+        cpu = _reap(proc)
+        end = time.time()
+        if not quiet:
+            logger.debug(f"[{end - start:.5f}] >> {cmd}")
+        profiling.record_command(cmd, end - start, cpu, bytes_read)
+
+
 def get_commit_range(defaultrange: str = "HEAD", end_only: bool = False) -> str:
     if len(load_config()["commit_end"]) > 0:
         commit_begin = load_config()["commit_begin"]
@@ -169,46 +265,186 @@ def should_exclude_file(ext: str) -> bool:
     return ext.lower() in excluded_extensions
 
 
-def get_num_of_lines_in_blob(ext_blob: tuple[str, str]) -> tuple[str, str, int]:
+class CatFileBatch:
+    """A long-lived ``git cat-file --batch`` process for reading many objects.
+
+    Every object is requested over the same pipe, so reading N blobs costs one
+    process launch instead of N. Close it (or use it as a context manager)
+    so the process is always reaped.
     """
-    Get number of lines in blob.
-    Returns 0 for binary files (detected by null bytes).
+
+    def __init__(self) -> None:
+        self._start = time.time()
+        self._bytes_read = 0
+        self._proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def read(self, object_id: str) -> bytes | None:
+        """Return the raw content of an object, or None if it cannot be read."""
+        stdin, stdout = self._proc.stdin, self._proc.stdout
+        if stdin is None or stdout is None:
+            return None
+        try:
+            stdin.write(object_id.encode("ascii") + b"\n")
+            stdin.flush()
+        except (BrokenPipeError, UnicodeEncodeError):
+            return None
+        # "<oid> <type> <size>" on success, "<oid> missing" otherwise
+        header = stdout.readline().split()
+        if len(header) != 3:
+            return None
+        size = int(header[2])
+        content = stdout.read(size)
+        stdout.read(1)  # trailing LF after the object content
+        self._bytes_read += len(content)
+        return content
+
+    def close(self) -> None:
+        if self._proc.stdin is not None:
+            try:
+                self._proc.stdin.close()
+            except BrokenPipeError:
+                pass
+        if self._proc.returncode is not None:
+            return
+        cpu = _reap(self._proc)
+        if self._proc.stdout is not None:
+            self._proc.stdout.close()
+        profiling.record_command(
+            "git cat-file --batch", time.time() - self._start, cpu, self._bytes_read
+        )
+
+    def __enter__(self) -> "CatFileBatch":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def get_object_store() -> GitObjectStore | None:
+    """Return the in-process object reader for the repository in the current directory.
+
+    None unless ``object_reader`` is "python" and the repository can be read
+    in-process; callers then use the git CLI instead.
     """
-    ext, blob_id = ext_blob
+    if load_config().get("object_reader") != "python":
+        return None
+    path = os.getcwd()
+    if path not in _object_stores:
+        try:
+            _object_stores[path] = GitObjectStore(find_git_dir(path))
+        except ObjectStoreError as e:
+            logger.info(f"In-process object reader unavailable ({e}), using git CLI")
+            _object_stores[path] = None
+    return _object_stores[path]
 
-    # Skip excluded files
-    if should_exclude_file(ext):
-        return (ext, blob_id, 0)
 
-    # Check if file is binary by reading first 8192 bytes and looking for null bytes
+def get_shared_blob_cache() -> SharedBlobCache | None:
+    """Return the cache of blob line counts shared beyond this report.
+
+    That is the machine-wide cache when ``shared_cache`` is enabled, the
+    cache of the current :func:`shared_blob_cache_for_run` block otherwise,
+    and None outside of one.
+    """
+    conf = load_config()
+    if not conf.get("shared_cache"):
+        return _run_blob_caches[-1] if _run_blob_caches else None
+    path = os.path.join(conf["shared_cache_dir"] or default_shared_cache_dir(), "blobs.sqlite")
+    if path not in _shared_blob_caches:
+        try:
+            _shared_blob_caches[path] = SharedBlobCache(
+                path, LINE_COUNT_VERSION, conf["shared_cache_max_entries"]
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Shared blob cache unavailable ({e})")
+            _shared_blob_caches[path] = None
+    return _shared_blob_caches[path]
+
+
+@contextmanager
+def shared_blob_cache_for_run(path: str = ":memory:"):
+    """Share blob line counts between the repositories analyzed in the block.
+
+    Without the machine-wide cache, the counts live in memory until the
+    block ends; forks and vendored copies then still get counted only once.
+    Repositories analyzed in parallel processes share them through the
+    SQLite file ``path`` instead.
+    """
+    max_entries = load_config()["shared_cache_max_entries"]
+    cache = SharedBlobCache(path, LINE_COUNT_VERSION, max_entries)
+    _run_blob_caches.append(cache)
     try:
-        # Here not use get_pipe_output because we need raw bytes
-        blob_content = subprocess.check_output(
-            ["git", "cat-file", "blob", blob_id], stderr=subprocess.DEVNULL
-        )
-        # Check first 8KB for null bytes (binary indicator)
-        if b"\x00" in blob_content[:8192]:
-            return (ext, blob_id, 0)
-    except subprocess.CalledProcessError:
-        return (ext, blob_id, 0)
+        yield get_shared_blob_cache()
+    finally:
+        _run_blob_caches.remove(cache)
+        cache.close()
+
 
-    return (
-        ext,
-        blob_id,
-        int(get_pipe_output([f"git cat-file blob {blob_id}", _WC_L_CMD]).split()[0]),
-    )
+def get_num_of_lines_in_blobs(ext_blobs: list[tuple[str, str]]) -> list[tuple[str, str, int]]:
+    """
+    Get number of lines for a batch of blobs.
+    Blobs are read through the in-process object reader when enabled, and
+    otherwise (or when it cannot read one) streamed through a single
+    ``git cat-file --batch`` process; the binary check and the line count run
+    on the same buffer.
+    Returns 0 for excluded extensions and binary files (detected by null bytes).
+    """
+    results = []
+    store = get_object_store()
+    reader: CatFileBatch | None = None
+    start = time.time()
+    try:
+        for ext, blob_id in ext_blobs:
+            # Skip excluded files without reading them
+            if should_exclude_file(ext):
+                results.append((ext, blob_id, 0))
+                continue
+            content = None
+            if store is not None:
+                obj = store.read(blob_id)
+                if obj is not None:
+                    content = obj[1]
+            if content is None:
+                if reader is None:
+                    reader = CatFileBatch()
+                content = reader.read(blob_id)
+            # Check first 8KB for null bytes (binary indicator)
+            if content is None or b"\x00" in content[:8192]:
+                results.append((ext, blob_id, 0))
+            else:
+                results.append((ext, blob_id, count_lines_in_bytes(content)))
+    finally:
+        if reader is not None:
+            reader.close()
+            logger.debug(
+                f"[{time.time() - start:.5f}] >> git cat-file --batch ({len(results)} blobs)"
+            )
+    return results
+
+
+def get_num_of_lines_in_blob(ext_blob: tuple[str, str]) -> tuple[str, str, int]:
+    """
+    Get number of lines in blob.
+    Returns 0 for binary files (detected by null bytes).
+    """
+    return get_num_of_lines_in_blobs([ext_blob])[0]
 
 
-def get_num_of_files_from_rev(time_rev: tuple[str, str]) -> tuple[int, str, int]:
+def get_num_of_files_from_rev(time_rev: tuple[int | str, str]) -> tuple[int, str, int]:
     """
     Get number of files changed in commit
     """
     time, rev = time_rev
-    return (
-        int(time),
-        rev,
-        int(get_pipe_output([f'git ls-tree -r --name-only "{rev}"', _WC_L_CMD]).split("\n")[0]),
-    )
+    store = get_object_store()
+    count = store.count_files_in_tree(rev) if store is not None else None
+    if count is None:
+        paths = iter_pipe_lines(f'git ls-tree -r -z --name-only "{rev}"', sep=b"\0")
+        count = sum(1 for path in paths if path)
+    return (int(time), rev, count)
 
 
 def get_stat_summary_counts(line: str) -> list[str | int]:
@@ -0,0 +1,143 @@
+/*
+Virtualized, paged tables for GitStats.
+
+Large tables are shipped as JSON columns instead of HTML rows:
+{columns: [{title, type, digits}], rows: n, pageSize: n, data: [[column values], ...]}.
+Number columns are decoded into Float64Arrays and rows are sorted as a
+Uint32Array of row indices, so the data itself never moves. Only the rows of
+the current page that are scrolled into view exist in the DOM.
+*/
+
+var VIRTUAL_TABLE_OVERSCAN = 10;
+
+function virtualTable(id, table) {
+	var root = document.getElementById(id);
+	var columns = table.columns;
+	var size = table.rows;
+	var pageSize = table.pageSize > 0 ? table.pageSize : Math.max(size, 1);
+	var values = columns.map(function(column, i) {
+		return column.type === 'number' ? Float64Array.from(table.data[i]) : table.data[i];
+	});
+	var order = new Uint32Array(size);
+	for (var i = 0; i < size; i++) order[i] = i;
+	var collator = typeof Intl !== 'undefined' ? new Intl.Collator(undefined, { numeric: true }) : null;
+	var page = 0, sortColumn = -1, descending = false, rowHeight = 0;
+
+	var viewport = document.createElement('div');
+	viewport.className = 'virtual-table-viewport';
+	var grid = document.createElement('table');
+	var head = document.createElement('thead');
+	var headRow = document.createElement('tr');
+	var body = document.createElement('tbody');
+	var headers = columns.map(function(column, c) {
+		var th = document.createElement('th');
+		th.textContent = column.title;
+		th.addEventListener('click', function() { sortBy(c); });
+		headRow.appendChild(th);
+		return th;
+	});
+	head.appendChild(headRow);
+	grid.appendChild(head);
+	grid.appendChild(body);
+	viewport.appendChild(grid);
+	root.appendChild(viewport);
+
+	var pager = null, status = null, previous = null, next = null;
+	if (size > pageSize) {
+		pager = document.createElement('div');
+		pager.className = 'virtual-table-pager';
+		previous = document.createElement('button');
+		previous.textContent = '‹ Previous';
+		previous.addEventListener('click', function() { showPage(page - 1); });
+		next = document.createElement('button');
+		next.textContent = 'Next ›';
+		next.addEventListener('click', function() { showPage(page + 1); });
+		status = document.createElement('span');
+		pager.appendChild(previous);
+		pager.appendChild(status);
+		pager.appendChild(next);
+		root.appendChild(pager);
+	}
+
+	function cell(c, row) {
+		var value = values[c][row];
+		var digits = columns[c].digits;
+		return digits === undefined ? String(value) : value.toFixed(digits);
+	}
+
+	function spacer(height) {
+		var tr = document.createElement('tr');
+		tr.className = 'virtual-table-spacer';
+		var td = document.createElement('td');
+		td.colSpan = columns.length;
+		td.style.height = height + 'px';
+		tr.appendChild(td);
+		return tr;
+	}
+
+	// render the rows of the current page that are in view, with spacers
+	// standing in for the rows above and below them
+	function render() {
+		var start = page * pageSize;
+		var count = Math.min(pageSize, size - start);
+		var height = rowHeight || 24;
+		var first = Math.max(0, Math.floor(viewport.scrollTop / height) - VIRTUAL_TABLE_OVERSCAN);
+		var visible = Math.ceil((viewport.clientHeight || 600) / height) + 2 * VIRTUAL_TABLE_OVERSCAN;
+		var last = Math.min(count, first + visible);
+		while (body.firstChild) body.removeChild(body.firstChild);
+		if (first > 0) body.appendChild(spacer(first * height));
+		for (var r = first; r < last; r++) {
+			var row = order[start + r];
+			var tr = document.createElement('tr');
+			for (var c = 0; c < columns.length; c++) {
+				var td = document.createElement('td');
+				td.textContent = cell(c, row);
+				tr.appendChild(td);
+			}
+			body.appendChild(tr);
+		}
+		if (last < count) body.appendChild(spacer((count - last) * height));
+		if (!rowHeight && last > first) {
+			// measure once, then render again with the real row height
+			rowHeight = body.children[first > 0 ? 1 : 0].offsetHeight;
+			if (rowHeight) render();
+		}
+	}
+
+	function showPage(number) {
+		var pages = Math.ceil(size / pageSize);
+		page = Math.max(0, Math.min(number, pages - 1));
+		viewport.scrollTop = 0;
+		if (pager) {
+			var end = Math.min(size, (page + 1) * pageSize);
+			status.textContent = ' Rows ' + (page * pageSize + 1) + '–' + end + ' of ' + size + ' ';
+			previous.disabled = page === 0;
+			next.disabled = page === pages - 1;
+		}
+		render();
+	}
+
+	function sortBy(c) {
+		descending = c === sortColumn ? !descending : false;
+		sortColumn = c;
+		var column = values[c];
+		var compare = columns[c].type === 'number'
+			? function(a, b) { return column[a] - column[b]; }
+			: collator
+				? function(a, b) { return collator.compare(column[a], column[b]); }
+				: function(a, b) { return column[a] < column[b] ? -1 : column[a] > column[b] ? 1 : 0; };
+		order.sort(descending ? function(a, b) { return compare(b, a); } : compare);
+		headers.forEach(function(th, h) {
+			th.textContent = columns[h].title + (h === c ? (descending ? ' ▼' : ' ▲') : '');
+		});
+		showPage(0);
+	}
+
+	var scheduled = false;
+	viewport.addEventListener('scroll', function() {
+		if (scheduled) return;
+		scheduled = true;
+		window.requestAnimationFrame(function() { scheduled = false; render(); });
+	});
+	showPage(0);
+}
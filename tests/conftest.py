@@ -192,6 +192,59 @@ def git_repo_minimal(temp_dir):
     return repo_path
 
 
+@pytest.fixture
+def git_repo_with_merge(temp_dir):
+    r"""Git repo whose history has a deleted file, a side branch and a merge.
+
+    main:   c1 (a.txt, b.txt) -- c2 (+c.txt) ------------- merge (tag v2)
+                \                                        /
+    topic:       c3 (-b.txt, tag v1) -- c4 (+d.txt, e.txt)
+    """
+    repo_path = os.path.join(temp_dir, "git_repo_with_merge")
+    os.makedirs(repo_path)
+
+    def _git(*args, author=("Test", "test@example.com"), date="2023-06-01T12:00:00"):
+        env = {
+            **os.environ,
+            "LC_ALL": "C",
+            "GIT_AUTHOR_NAME": author[0],
+            "GIT_AUTHOR_EMAIL": author[1],
+            "GIT_COMMITTER_NAME": author[0],
+            "GIT_COMMITTER_EMAIL": author[1],
+            "GIT_AUTHOR_DATE": date,
+            "GIT_COMMITTER_DATE": date,
+        }
+        subprocess.run(["git", *args], cwd=repo_path, check=True, capture_output=True, env=env)
+
+    def _write(name, text):
+        with open(os.path.join(repo_path, name), "w") as f:
+            f.write(text)
+
+    carol = ("Carol", "carol@example.com")
+    dave = ("Dave", "dave@example.com")
+    _git("init", "-b", "main")
+    _write("a.txt", "a\n")
+    _write("b.txt", "b\nb\n")
+    _git("add", ".")
+    _git("commit", "-m", "c1", author=carol, date="2023-01-01T10:00:00")
+    _git("checkout", "-b", "topic")
+    _git("rm", "b.txt")
+    _git("commit", "-m", "c3", author=dave, date="2023-01-02T10:00:00")
+    _git("tag", "v1")
+    _write("d.txt", "d\n")
+    _write("e.txt", "e\ne\ne\n")
+    _git("add", ".")
+    _git("commit", "-m", "c4", author=dave, date="2023-01-04T10:00:00")
+    _git("checkout", "main")
+    _write("c.txt", "c\n")
+    _git("add", ".")
+    _git("commit", "-m", "c2", author=carol, date="2023-01-03T10:00:00")
+    _git("merge", "--no-ff", "-m", "merge topic", "topic", author=carol, date="2023-01-05T10:00:00")
+    _git("tag", "v2")
+
+    return repo_path
+
+
 @pytest.fixture
 def mock_data_collector():
     """Create a highly simplified DataCollector-like object for testing report generation.
@@ -0,0 +1,135 @@
+"""Tests for gitstats.cache – the SQLite and JSON cache backends and the shared blob cache."""
+
+import json
+import multiprocessing
+import os
+import types
+
+import pytest
+
+import gitstats.cache
+from gitstats.cache import JsonCache, SharedBlobCache, SQLiteCache, open_cache
+
+
+def test_sqlite_cache_roundtrip(temp_dir):
+    path = os.path.join(temp_dir, "gitstats.cache")
+    cache = open_cache(path)
+    blobs = cache.setdefault("lines_in_blob", {})
+    blobs["abc"] = 12
+    blobs["def"] = 0
+    cache["history"] = {"tips": ["123"], "state": {"total_commits": 5}}
+    assert "abc" in blobs and "xyz" not in blobs
+    assert blobs.get("xyz") is None
+    cache.commit()
+    cache.close()
+
+    reopened = open_cache(path)
+    assert isinstance(reopened, SQLiteCache)
+    assert sorted(reopened) == ["history", "lines_in_blob"]
+    assert reopened["lines_in_blob"]["abc"] == 12
+    assert reopened.get("files_in_tree") is None
+    assert reopened == {
+        "lines_in_blob": {"abc": 12, "def": 0},
+        "history": {"tips": ["123"], "state": {"total_commits": 5}},
+    }
+
+    # assigning a table replaces its contents
+    reopened["lines_in_blob"] = {"ghi": 3}
+    assert dict(reopened["lines_in_blob"].items()) == {"ghi": 3}
+    assert len(reopened["lines_in_blob"]) == 1
+    reopened.close()
+
+
+def test_sqlite_cache_flushes_in_batches(temp_dir):
+    path = os.path.join(temp_dir, "gitstats.cache")
+    cache = SQLiteCache(path, batch_size=2)
+    table = cache.setdefault("files_in_tree")
+    for key in ("a", "b", "c"):
+        table[key] = 1
+
+    # a crash now keeps the flushed batch and nothing half-written
+    other = SQLiteCache(path)
+    assert sorted(other["files_in_tree"]) == ["a", "b"]
+    assert table["c"] == 1  # buffered writes are visible to their writer
+    cache.commit()
+    assert sorted(other["files_in_tree"]) == ["a", "b", "c"]
+    cache.close()
+    other.close()
+
+
+def test_json_cache_is_migrated_once(temp_dir):
+    path = os.path.join(temp_dir, "gitstats.cache")
+    legacy = {"files_in_tree": {"t1": 4}, "lines_in_blob": {"b1": 7}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(legacy, f)
+
+    cache = open_cache(path)
+    assert cache == legacy
+    cache.close()
+    with open(path, "rb") as f:
+        assert f.read(6) == b"SQLite"
+    assert not os.path.exists(path + ".tmp")
+    assert open_cache(path) == legacy
+
+
+def test_unreadable_cache_starts_fresh(temp_dir):
+    path = os.path.join(temp_dir, "gitstats.cache")
+    with open(path, "w") as f:
+        f.write("not valid json")
+    assert open_cache(path) == {}
+    assert open_cache(path, "json") == {}
+
+
+def test_json_backend(temp_dir):
+    path = os.path.join(temp_dir, "gitstats.cache")
+    cache = open_cache(path, "json")
+    assert isinstance(cache, JsonCache)
+    cache.setdefault("lines_in_blob", {})["abc"] = 12
+    cache.commit()
+    with open(path, encoding="utf-8") as f:
+        assert json.load(f) == {"lines_in_blob": {"abc": 12}}
+    assert open_cache(path, "json") == {"lines_in_blob": {"abc": 12}}
+
+    with pytest.raises(ValueError):
+        open_cache(path, "pickle")
+
+
+def test_shared_blob_cache_is_keyed_by_rule_version(temp_dir):
+    path = os.path.join(temp_dir, "shared", "blobs.sqlite")
+    cache = SharedBlobCache(path, 1, 100)
+    cache.put_many({"abc": 12, "def": 0})
+    assert cache.get_many(["abc", "def", "xyz"]) == {"abc": 12, "def": 0}
+    cache.close()
+
+    assert SharedBlobCache(path, 1, 100).get_many(["abc"]) == {"abc": 12}
+    # counts made under other line counting rules are not reused
+    assert SharedBlobCache(path, 2, 100).get_many(["abc"]) == {}
+
+
+def test_shared_blob_cache_evicts_least_recently_used(temp_dir, monkeypatch):
+    now = [1_000_000]
+    monkeypatch.setattr(gitstats.cache, "time", types.SimpleNamespace(time=lambda: now[0]))
+    cache = SharedBlobCache(os.path.join(temp_dir, "blobs.sqlite"), 1, 2)
+    cache.put_many({"old": 1, "used": 2})
+    now[0] += 2 * 24 * 60 * 60
+    assert cache.get_many(["used"]) == {"used": 2}
+    cache.put_many({"new": 3})
+    assert cache.get_many(["old", "used", "new"]) == {"used": 2, "new": 3}
+
+
+def _fill_shared_cache(args):
+    path, start = args
+    cache = SharedBlobCache(path, 1, 10000)
+    for i in range(start, start + 200, 20):
+        cache.put_many({f"blob{j}": j for j in range(i, i + 20)})
+        cache.get_many([f"blob{j}" for j in range(0, 400, 7)])
+    cache.close()
+
+
+def test_shared_blob_cache_concurrent_writers(temp_dir):
+    path = os.path.join(temp_dir, "blobs.sqlite")
+    SharedBlobCache(path, 1, 10000).close()
+    with multiprocessing.Pool(2) as pool:
+        pool.map(_fill_shared_cache, [(path, 0), (path, 200)])
+    counts = SharedBlobCache(path, 1, 10000).get_many([f"blob{j}" for j in range(400)])
+    assert counts == {f"blob{j}": j for j in range(400)}
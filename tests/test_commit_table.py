@@ -0,0 +1,59 @@
+"""Tests for gitstats.commit_table – the columnar commit table and its aggregations."""
+
+import datetime
+
+import pytest
+
+from gitstats import commit_table
+from gitstats.commit_table import MAINLINE, MERGE, CommitTable
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run a test with NumPy (when installed) and with the pure-Python fallback."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(commit_table, "np", None)
+    return commit_table
+
+
+def test_table_interns_values_and_localizes_stamps():
+    table = CommitTable()
+    stamp = int(datetime.datetime(2024, 5, 8, 14, 30).timestamp())
+    table.append(stamp, "Ann", "x.com", "+0200", 2, 10, 3)
+    table.append(stamp - 86400, "Bo", "x.com", "+0200", 1, 1, 0, MERGE | MAINLINE)
+    table.append(stamp - 2 * 86400, "Ann", "y.org", "-0500", 1, 4, 4, MAINLINE)
+
+    assert len(table) == 3
+    assert table.author_names == ["Ann", "Bo"]
+    assert list(table.authors) == [0, 1, 0]
+    assert table.domain_names == ["x.com", "y.org"]
+    assert table.timezone_names == ["+0200", "-0500"]
+    assert table.days[0] == datetime.date(2024, 5, 8).toordinal()
+    assert table.hours[0] == 14
+    assert table.rows() == [0, 1, 2]
+    assert table.rows(MAINLINE, oldest_first=True) == [2, 1]
+    assert table.rows(MERGE) == [1]
+
+
+def test_group_counts_and_sums_keep_first_appearance(backend):
+    keys = [5, 3, 5, 9, 3, 5]
+    assert list(backend.group_counts(keys).items()) == [(5, 3), (3, 2), (9, 1)]
+    assert list(backend.group_sums(keys, [1, 2, 3, 4, 5, 6]).items()) == [(5, 10), (3, 7), (9, 4)]
+    assert backend.group_counts([]) == {}
+
+
+def test_group_extremes(backend):
+    lowest, highest, last = backend.group_extremes([1, 0, 1, 1], [30, 7, 10, 20], 3)
+    assert lowest == [7, 10, None]
+    assert highest == [7, 30, None]
+    assert last == [7, 20, None]
+
+
+def test_pair_keys_take_and_running_totals(backend):
+    assert list(backend.pair_keys([2, 0, 1], [1, 1, 0], 3)) == [7, 1, 3]
+    assert list(backend.recode([9, 8, 9], {8: 1, 9: 2})) == [2, 1, 2]
+    assert backend.take([10, 20, 30], [2, 0]) == [30, 10]
+    assert backend.running_totals([5, 0, 2], [1, 3, 0], 100) == [104, 101, 103]
+    assert backend.running_totals([], [], 100) == []
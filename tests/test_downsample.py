@@ -0,0 +1,30 @@
+"""Tests for gitstats.downsample – Largest-Triangle-Three-Buckets sampling."""
+
+from gitstats.downsample import downsample, lttb_indices
+
+
+def test_short_series_are_kept_whole():
+    assert lttb_indices([[1, 2, 3]], 5) == [0, 1, 2]
+    assert lttb_indices([[1, 2, 3, 4]], 0) == [0, 1, 2, 3]
+    assert lttb_indices([], 5) == []
+
+
+def test_keeps_ends_and_spikes():
+    values = [0] * 1000
+    values[137] = 50
+    values[611] = -40
+    indices = lttb_indices([values], 20)
+    assert len(indices) == 20
+    assert indices[0] == 0 and indices[-1] == 999
+    assert indices == sorted(set(indices))
+    assert 137 in indices and 611 in indices
+
+
+def test_series_share_their_indices():
+    first = [i % 7 for i in range(300)]
+    second = [0] * 300
+    second[250] = 99
+    labels, (a, b) = downsample([str(i) for i in range(300)], [first, second], 30)
+    assert len(labels) == len(a) == len(b) == 30
+    assert "250" in labels
+    assert b[labels.index("250")] == 99
@@ -40,8 +40,28 @@ def test_default_config_keys():
         "commit_begin",
         "commit_end",
         "linear_linestats",
+        "incremental_filecounts",
+        "snapshot",
+        "incremental_collection",
+        "cache_backend",
+        "object_reader",
+        "shared_cache",
+        "shared_cache_dir",
+        "shared_cache_max_entries",
+        "churn_counters",
         "project_name",
         "processes",
+        "render_processes",
+        "incremental_pages",
+        "shared_assets",
+        "jobs",
+        "repo_timeout",
+        "inline_chart_data_max",
+        "chart_max_points",
+        "table_page_size",
+        "minify_html",
+        "precompress",
+        "profile",
         "start_date",
         "end_date",
         "authors",
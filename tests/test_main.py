@@ -6,6 +6,7 @@ from unittest.mock import patch
 
 import pytest
 
+from gitstats.commit_table import CommitTable
 from gitstats.main import (
     DataCollector,
     GitDataCollector,
@@ -13,7 +14,9 @@ from gitstats.main import (
     main,
     parallel_map_with_fallback,
     run,
+    worker_pool,
 )
+from gitstats.path_table import PathCounts
 
 # ── DataCollector base class ─────────────────────────────────────────────
 
@@ -83,6 +86,16 @@ class TestDataCollector:
         dc = GitDataCollector()
         assert dc.get_authors() == []
 
+    def test_get_authors_ranks_by_commits_then_name(self):
+        dc = GitDataCollector()
+        dc.authors = {"Bo": {"commits": 2}, "Al": {"commits": 5}, "Cy": {"commits": 2}}
+        assert dc.get_authors() == ["Al", "Cy", "Bo"]
+        assert dc.get_authors(2) == ["Al", "Cy"]
+        # after refine the ranking is made once and reused
+        dc.authors_by_commits = ["Al", "Cy", "Bo"]
+        dc.authors["Bo"]["commits"] = 9
+        assert dc.get_authors(1) == ["Al"]
+
     def test_get_total_methods(self):
         dc = GitDataCollector()
         assert dc.get_total_authors() == 0
@@ -117,6 +130,59 @@ def test_parallel_map_with_fallback_empty():
     assert results == []
 
 
+def test_parallel_map_with_fallback_on_worker_pool():
+    with worker_pool() as pool:
+        assert parallel_map_with_fallback(_square, [1, 2, 3], pool) == [1, 4, 9]
+        assert parallel_map_with_fallback(_square, [4], pool) == [16]
+
+
+def test_collect_forks_workers_before_phase_threads(git_repo, monkeypatch):
+    from contextlib import contextmanager
+
+    import gitstats.main as main_mod
+
+    events = []
+    original_pool = main_mod.worker_pool
+    original_phases = main_mod.run_phases
+    original_map = main_mod.parallel_map_with_fallback
+
+    @contextmanager
+    def recording_pool():
+        with original_pool() as pool:
+            events.append(("pool", pool))
+            yield pool
+
+    def recording_phases(*args, **kwargs):
+        events.append(("phases", None))
+        return original_phases(*args, **kwargs)
+
+    def recording_map(func, items, pool=None):
+        events.append(("map", pool))
+        return original_map(func, items, pool)
+
+    monkeypatch.setattr(main_mod, "worker_pool", recording_pool)
+    monkeypatch.setattr(main_mod, "run_phases", recording_phases)
+    monkeypatch.setattr(main_mod, "parallel_map_with_fallback", recording_map)
+    monkeypatch.chdir(git_repo)
+    GitDataCollector().collect(git_repo)
+
+    assert [event for event, _ in events[:2]] == ["pool", "phases"]
+    pool = events[0][1]
+    assert pool is not None
+    maps = [used for event, used in events if event == "map"]
+    assert maps and all(used is pool for used in maps)
+
+
+def test_batched():
+    from gitstats.main import _batched
+
+    assert _batched([], 4) == []
+    assert _batched([1, 2, 3], 8) == [[1], [2], [3]]
+    batches = _batched(list(range(10)), 3)
+    assert len(batches) == 3
+    assert [x for b in batches for x in b] == list(range(10))
+
+
 # ── GitDataCollector integration tests ───────────────────────────────────
 
 
@@ -168,6 +234,22 @@ class TestGitDataCollectorIntegration:
         assert t["commits"] > 0
         assert len(t["authors"]) > 0
 
+    def test_collect_tags_attributes_commits_to_first_containing_tag(self, git_repo_with_merge):
+        dc = GitDataCollector()
+        prevdir = os.getcwd()
+        try:
+            os.chdir(git_repo_with_merge)
+            dc.collect(git_repo_with_merge)
+        finally:
+            os.chdir(prevdir)
+
+        # v1: c1, c3   v2: c2, c4, merge
+        assert dc.tags["v1"]["date"] == "2023-01-02"
+        assert dc.tags["v1"]["commits"] == 2
+        assert dc.tags["v1"]["authors"] == {"Carol": 1, "Dave": 1}
+        assert dc.tags["v2"]["commits"] == 3
+        assert dc.tags["v2"]["authors"] == {"Carol": 2, "Dave": 1}
+
     def test_collect_activity_by_hour(self, git_repo):
         dc = GitDataCollector()
         prevdir = os.getcwd()
@@ -227,8 +309,10 @@ class TestGitDataCollectorIntegration:
         finally:
             os.chdir(prevdir)
 
-        # File churn may be empty or non-empty depending on diff output
-        assert isinstance(dc.file_churn, dict)
+        # churn is counted over the interned paths, one entry per file
+        assert isinstance(dc.file_churn, PathCounts)
+        assert dc.file_churn.table is dc.paths
+        assert len(dc.file_churn) == len(dc.paths) == 5
 
     def test_collect_author_files(self, git_repo):
         """The name-only pass records which files each author touched."""
@@ -251,6 +335,25 @@ class TestGitDataCollectorIntegration:
         # file_churn comes from the same pass
         assert dc.file_churn["main.py"] == 2
 
+    def test_collect_approximate_churn(self, git_repo):
+        """With churn_counters only that many files keep a (possibly overestimated) count."""
+        import gitstats.main as main_mod
+
+        dc = GitDataCollector()
+        prevdir = os.getcwd()
+        try:
+            os.chdir(git_repo)
+            with patch.dict(main_mod.conf, churn_counters=2):
+                dc.collect(git_repo)
+        finally:
+            os.chdir(prevdir)
+
+        assert len(dc.file_churn) == 2
+        assert dc.file_churn.most_common(1)[0][1] >= 2
+        assert sum(dc.file_churn.values()) == 6  # every file change is counted somewhere
+        # ownership still sees every file
+        assert dc.author_files["Alice Smith"]["main.py"] == 2
+
     def test_collect_changes_by_date(self, git_repo):
         dc = GitDataCollector()
         prevdir = os.getcwd()
@@ -403,21 +506,300 @@ class TestGitDataCollectorIntegration:
         assert dc.authors["Alice Smith"]["commits"] > 0
 
 
+class TestFileCountsOverTime:
+    """files_by_stamp from one tree-diff walk matches per-commit ls-tree."""
+
+    def _collect_files(self, repo, incremental, cache=None):
+        import gitstats.main as main_mod
+
+        dc = GitDataCollector()
+        if cache is not None:
+            dc.cache = cache
+        prevdir = os.getcwd()
+        try:
+            os.chdir(repo)
+            with patch.dict(main_mod.conf, {"incremental_filecounts": incremental}):
+                dc._collect_files_by_stamp(dc._walk_history()["revs"])
+        finally:
+            os.chdir(prevdir)
+        return dc
+
+    def test_matches_ls_tree(self, git_repo_with_merge):
+        incremental = self._collect_files(git_repo_with_merge, 1)
+        full = self._collect_files(git_repo_with_merge, 0)
+
+        assert incremental.files_by_stamp == full.files_by_stamp
+        assert incremental.cache["files_in_tree"] == full.cache["files_in_tree"]
+        assert incremental.total_commits == full.total_commits == 5
+        # c1: a,b  c3: a  c4: a,d,e  c2: a,b,c  merge: a,c,d,e
+        assert sorted(incremental.files_by_stamp.values()) == [1, 2, 3, 3, 4]
+
+    def test_commit_range_boundary_falls_back_to_ls_tree(self, git_repo_with_merge):
+        import gitstats.main as main_mod
+
+        with patch.dict(main_mod.conf, {"commit_begin": "v1", "commit_end": "HEAD"}):
+            incremental = self._collect_files(git_repo_with_merge, 1)
+            full = self._collect_files(git_repo_with_merge, 0)
+        assert incremental.files_by_stamp == full.files_by_stamp
+        assert len(incremental.files_by_stamp) == 3
+
+    def test_skips_walk_when_cache_is_warm(self, git_repo_with_merge):
+        warm = self._collect_files(git_repo_with_merge, 1)
+        with patch.object(GitDataCollector, "_count_files_from_tree_diffs") as walk:
+            again = self._collect_files(git_repo_with_merge, 1, cache=warm.cache)
+        walk.assert_not_called()
+        assert again.files_by_stamp == warm.files_by_stamp
+
+
+# ── incremental collection ───────────────────────────────────────────────
+
+
+class TestIncrementalCollection:
+    """Later runs fold only the new commits into the statistics cached by the last one."""
+
+    # attributes that depend on the whole history, compared against a full walk
+    COMPARED = (
+        "author_of_month",
+        "author_of_year",
+        "commits_by_month",
+        "activity_by_hour_of_week",
+        "active_days",
+        "last_active_day",
+        "domains",
+        "total_commits",
+        "total_authors",
+        "total_lines",
+        "total_lines_added",
+        "files_by_stamp",
+        "changes_by_date",
+        "changes_by_date_by_author",
+        "file_churn",
+        "author_files",
+        "tags",
+        "extensions",
+    )
+
+    def _collect(self, repo, cachefile=None):
+        dc = GitDataCollector()
+        if cachefile:
+            dc.load_cache(cachefile)
+        prevdir = os.getcwd()
+        try:
+            os.chdir(repo)
+            dc.collect(repo)
+        finally:
+            os.chdir(prevdir)
+        if cachefile:
+            dc.save_cache(cachefile)
+        return dc
+
+    def _commit(self, repo, author, email, date, path, content, *extra):
+        import subprocess
+
+        with open(os.path.join(repo, path), "w") as f:
+            f.write(content)
+        env = {
+            **os.environ,
+            "GIT_AUTHOR_NAME": author,
+            "GIT_AUTHOR_EMAIL": email,
+            "GIT_AUTHOR_DATE": date,
+            "GIT_COMMITTER_NAME": author,
+            "GIT_COMMITTER_EMAIL": email,
+            "GIT_COMMITTER_DATE": date,
+        }
+        subprocess.run(["git", "add", path], cwd=repo, check=True, capture_output=True)
+        subprocess.run(
+            ["git", "commit", "-q", "-m", f"edit {path}", *extra],
+            cwd=repo,
+            check=True,
+            capture_output=True,
+            env=env,
+        )
+
+    def _assert_matches_full_walk(self, repo, dc):
+        full = self._collect(repo)
+        for name in self.COMPARED:
+            assert getattr(dc, name) == getattr(full, name), name
+        assert dc.authors == full.authors
+
+    def test_walks_only_new_commits(self, git_repo, temp_dir):
+        cachefile = os.path.join(temp_dir, "gitstats.cache")
+        first = self._collect(git_repo, cachefile)
+        assert first.analyzed_tips == []
+        tips = first.cache["history"]["tips"]
+
+        self._commit(git_repo, "Carol", "carol@x.org", "2023-06-01T09:00:00", "new.py", "a\nb\n")
+        self._commit(git_repo, "Bob Jones", "bob@example.com", "2023-06-02T09:00:00", "main.py", "")
+        original = GitDataCollector._record_walked_commit
+        with patch.object(
+            GitDataCollector, "_record_walked_commit", autospec=True, side_effect=original
+        ) as record:
+            dc = self._collect(git_repo, cachefile)
+
+        assert record.call_count == 2
+        assert dc.analyzed_tips == tips
+        assert dc.total_commits == 7
+        assert dc.authors["Carol"]["commits"] == 1
+        self._assert_matches_full_walk(git_repo, dc)
+
+    def test_rewritten_history_walks_everything(self, git_repo, temp_dir):
+        cachefile = os.path.join(temp_dir, "gitstats.cache")
+        self._collect(git_repo, cachefile)
+
+        self._commit(
+            git_repo, "Bob Jones", "bob@example.com", "2023-06-02T09:00:00", "a.txt", "", "--amend"
+        )
+        dc = self._collect(git_repo, cachefile)
+
+        assert dc.analyzed_tips == []
+        assert dc.total_commits == 5
+        self._assert_matches_full_walk(git_repo, dc)
+
+    def test_changed_identity_walks_everything(self, git_repo, temp_dir):
+        cachefile = os.path.join(temp_dir, "gitstats.cache")
+        self._collect(git_repo, cachefile)
+
+        # Alice's newest name becomes her canonical identity
+        self._commit(
+            git_repo, "Alice Q. Smith", "alice@example.com", "2023-06-01T09:00:00", "a.txt", "a\n"
+        )
+        dc = self._collect(git_repo, cachefile)
+
+        assert "Alice Smith" not in dc.authors
+        assert dc.authors["Alice Q. Smith"]["commits"] == 5
+        assert dc.total_commits == 6
+        self._assert_matches_full_walk(git_repo, dc)
+
+    def test_changed_settings_walk_everything(self, git_repo, temp_dir):
+        import gitstats.main as main_mod
+
+        cachefile = os.path.join(temp_dir, "gitstats.cache")
+        self._collect(git_repo, cachefile)
+        with patch.dict(main_mod.conf, {"authors": "Alice Smith"}):
+            dc = self._collect(git_repo, cachefile)
+        assert dc.analyzed_tips == []
+        assert list(dc.authors) == ["Alice Smith"]
+
+
+class TestSharedBlobCache:
+    """Blob line counts are shared between reports instead of recounted."""
+
+    def _collect(self, repo, cachefile):
+        import gitstats.main as main_mod
+
+        dc = GitDataCollector()
+        dc.load_cache(cachefile)
+        prevdir = os.getcwd()
+        original = main_mod.parallel_map_with_fallback
+        with patch.object(main_mod, "parallel_map_with_fallback", side_effect=original) as pmap:
+            try:
+                os.chdir(repo)
+                dc.collect(repo)
+            finally:
+                os.chdir(prevdir)
+        dc.save_cache(cachefile)
+        counted = [
+            blob
+            for call in pmap.call_args_list
+            if call.args[0] is main_mod.get_num_of_lines_in_blobs
+            for batch in call.args[1]
+            for blob in batch
+        ]
+        return dc, counted
+
+    def test_machine_wide_cache_spans_output_directories(self, git_repo, temp_dir):
+        import gitstats
+
+        shared = {"shared_cache": 1, "shared_cache_dir": os.path.join(temp_dir, "shared")}
+        with patch.dict(gitstats.load_config(), shared):
+            first, counted = self._collect(git_repo, os.path.join(temp_dir, "a.cache"))
+            assert counted
+            second, counted = self._collect(git_repo, os.path.join(temp_dir, "b.cache"))
+        assert counted == []
+        assert second.extensions == first.extensions
+        assert os.path.exists(os.path.join(temp_dir, "shared", "blobs.sqlite"))
+
+    def test_disabled_outside_of_multi_repo_runs(self, git_repo, temp_dir):
+        from gitstats.utils import get_shared_blob_cache, shared_blob_cache_for_run
+
+        assert get_shared_blob_cache() is None
+        self._collect(git_repo, os.path.join(temp_dir, "a.cache"))
+        _, counted = self._collect(git_repo, os.path.join(temp_dir, "b.cache"))
+        assert counted
+
+        with shared_blob_cache_for_run() as cache:
+            assert get_shared_blob_cache() is cache
+            self._collect(git_repo, os.path.join(temp_dir, "c.cache"))
+            _, counted = self._collect(git_repo, os.path.join(temp_dir, "d.cache"))
+        assert counted == []
+        assert get_shared_blob_cache() is None
+
+    def test_parallel_workers_share_through_a_file(self, git_repo, temp_dir):
+        from gitstats.utils import shared_blob_cache_for_run
+
+        path = os.path.join(temp_dir, "run", "blobs.sqlite")
+        # one block per worker process of a parallel multi-repo run
+        with shared_blob_cache_for_run(path):
+            self._collect(git_repo, os.path.join(temp_dir, "a.cache"))
+        with shared_blob_cache_for_run(path):
+            _, counted = self._collect(git_repo, os.path.join(temp_dir, "b.cache"))
+        assert counted == []
+
+
+class TestSnapshot:
+    """The refined statistics survive a snapshot round trip."""
+
+    def test_roundtrip(self, git_repo, temp_dir):
+        dc = GitDataCollector()
+        prevdir = os.getcwd()
+        try:
+            os.chdir(git_repo)
+            dc.collect(git_repo)
+        finally:
+            os.chdir(prevdir)
+        dc.refine()
+        snapshotfile = os.path.join(temp_dir, "gitstats.snapshot")
+        dc.save_snapshot(snapshotfile)
+
+        restored = GitDataCollector()
+        restored.load_snapshot(snapshotfile)
+        expected = {k: v for k, v in vars(dc).items() if k not in ("cache", "analyzed_tips")}
+        actual = {k: v for k, v in vars(restored).items() if k not in ("cache", "analyzed_tips")}
+        assert actual == expected
+        assert isinstance(restored.authors["Alice Smith"]["timedelta"], datetime.timedelta)
+
+    def test_incompatible_version_is_refused(self, temp_dir):
+        import gzip
+        import json
+
+        snapshotfile = os.path.join(temp_dir, "gitstats.snapshot")
+        with gzip.open(snapshotfile, "wt", encoding="utf-8") as f:
+            json.dump({"version": 0, "state": {}}, f)
+        with pytest.raises(RuntimeError, match="incompatible"):
+            GitDataCollector().load_snapshot(snapshotfile)
+
+
 # ── collect() phases (unit-testable without a repository) ────────────────
 
 
 class TestCollectPhases:
     """Each collection phase is exercised on its own, no git required."""
 
-    def test_record_activity_accumulates_histograms(self):
+    @staticmethod
+    def _table(*commits):
+        table = CommitTable()
+        for author, date in commits:
+            table.append(int(date.timestamp()), author, "x.com", "+0000", 1, 1, 0)
+        return table
+
+    def test_collect_activity_accumulates_histograms(self):
         dc = GitDataCollector()
         # Wed 2024-05-08 14:xx  (weekday 2), plus a second commit the same hour
         d1 = datetime.datetime(2024, 5, 8, 14, 30)
         d2 = datetime.datetime(2024, 5, 8, 14, 45)
         d3 = datetime.datetime(2024, 5, 9, 9, 0)  # Thu, different hour
 
-        for d in (d1, d2, d3):
-            dc._record_activity(d)
+        dc._collect_activity(self._table(("Ann", d1), ("Ann", d2), ("Ann", d3)))
 
         assert dc.activity_by_hour_of_day == {14: 2, 9: 1}
         assert dc.activity_by_day_of_week == {2: 2, 3: 1}
@@ -428,25 +810,34 @@ class TestCollectPhases:
         # all three fall in the same calendar week
         assert dc.activity_by_year_week == {d1.strftime("%Y-%W"): 3}
         assert dc.activity_by_year_week_peak == 3
+        assert dc.domains == {"x.com": {"commits": 3}}
+        assert dc.commits_by_timezone == {"+0000": 3}
 
-    def test_record_author_commit_tracks_span_and_active_days(self):
+        # counts add up over later walks
+        dc._collect_activity(self._table(("Ann", d3)))
+        assert dc.activity_by_hour_of_day == {14: 2, 9: 2}
+        assert dc.activity_by_hour_of_day_busiest == 2
+        assert dc.activity_by_year_week_peak == 4
+
+    def test_collect_activity_tracks_author_span_and_active_days(self):
         dc = GitDataCollector()
         early = datetime.datetime(2024, 1, 10, 9, 0)
         late = datetime.datetime(2024, 3, 20, 9, 0)
 
         # deliberately out of order: stamps may arrive in any order
-        dc._record_author_commit("Ann", int(late.timestamp()), late)
-        dc._record_author_commit("Ann", int(early.timestamp()), early)
-        dc._record_author_commit("Bo", int(late.timestamp()), late)
+        dc._collect_activity(self._table(("Ann", late), ("Ann", early), ("Bo", late)))
 
         ann = dc.authors["Ann"]
         assert ann["first_commit_stamp"] == int(early.timestamp())
         assert ann["last_commit_stamp"] == int(late.timestamp())
         assert ann["active_days"] == {"2024-01-10", "2024-03-20"}
+        assert ann["last_active_day"] == "2024-01-10"
         assert dc.commits_by_month == {"2024-03": 2, "2024-01": 1}
         assert dc.commits_by_year == {2024: 3}
         assert dc.author_of_month["2024-03"] == {"Ann": 1, "Bo": 1}
         assert dc.active_days == {"2024-01-10", "2024-03-20"}
+        assert dc.first_commit_stamp == int(early.timestamp())
+        assert dc.last_commit_stamp == int(late.timestamp())
 
     def test_merge_author_aliases_folds_shared_email(self):
         """Two names on one email collapse into the most recent name."""
@@ -520,14 +911,22 @@ class TestCollectPhases:
 
             return _f
 
+        walk = {
+            "commits": {},
+            "revs": [],
+            "email_to_latest": {},
+            "author_to_email": {},
+            "table": CommitTable(),
+            "subjects_by_year": {},
+        }
+        dc._walk_history = spy("walk", walk)
+        dc._collect_activity = spy("activity")
         dc._collect_tags = spy("tags")
-        dc._collect_commit_stats = spy("commits", ({}, {}))
         dc._merge_author_aliases = spy("aliases", {})
         dc._collect_files_by_stamp = spy("files")
         dc._collect_extensions = spy("extensions")
         dc._collect_line_stats = spy("lines")
         dc._collect_per_author_line_stats = spy("author_lines")
-        dc._collect_file_churn_and_ownership = spy("churn")
 
         prevdir = os.getcwd()
         try:
@@ -536,16 +935,108 @@ class TestCollectPhases:
         finally:
             os.chdir(prevdir)
 
-        assert called == [
-            "tags",
-            "commits",
-            "aliases",
-            "files",
-            "extensions",
-            "lines",
-            "author_lines",
-            "churn",
-        ]
+        assert sorted(called) == sorted(
+            ["walk", "activity", "tags", "aliases", "files", "extensions", "lines", "author_lines"]
+        )
+        # phases may run concurrently, but never before their inputs
+        assert called.index("walk") < called.index("tags") < called.index("aliases")
+        assert called.index("aliases") < called.index("author_lines")
+        assert called.index("walk") < called.index("files")
+
+
+def test_run_phases_passes_dependency_results():
+    from gitstats.main import run_phases
+
+    results = run_phases(
+        {
+            "sum": (lambda a, b: a + b, ("a", "b")),
+            "a": (lambda: 1, ()),
+            "b": (lambda a: a * 10, ("a",)),
+        },
+        workers=4,
+    )
+    assert results == {"a": 1, "b": 10, "sum": 11}
+
+
+def test_run_phases_errors():
+    from gitstats.main import run_phases
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        run_phases({"fail": (fail, ()), "after": (lambda _: None, ("fail",))}, workers=2)
+    with pytest.raises(ValueError, match="missing"):
+        run_phases({"missing": (lambda _: None, ("nowhere",))}, workers=2)
+
+
+# ── single-pass history walk ─────────────────────────────────────────────
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        ("src/a.py", "src/a.py"),
+        ("old.py => new.py", "new.py"),
+        ("src/{old => new}/a.py", "src/new/a.py"),
+        ("src/{ => sub}/a.py", "src/sub/a.py"),
+        ("src/{sub => }/a.py", "src/a.py"),
+        ("{a => b}.txt", "b.txt"),
+    ],
+)
+def test_renamed_path(path, expected):
+    from gitstats.main import _renamed_path
+
+    assert _renamed_path(path) == expected
+
+
+class TestWalkHistory:
+    """One `git log --numstat` pass feeds every phase of collect()."""
+
+    def _collect(self, repo, **overrides):
+        import gitstats.main as main_mod
+
+        dc = GitDataCollector()
+        prevdir = os.getcwd()
+        try:
+            os.chdir(repo)
+            with patch.dict(main_mod.conf, overrides):
+                dc.collect(repo)
+        finally:
+            os.chdir(prevdir)
+        return dc
+
+    def test_merge_excluded_from_churn_and_author_lines(self, git_repo_with_merge):
+        dc = self._collect(git_repo_with_merge)
+
+        # the merge brings in d.txt/e.txt and drops b.txt on main, but only
+        # the commits that made those changes count as touching them
+        assert dc.file_churn == {"a.txt": 1, "b.txt": 2, "c.txt": 1, "d.txt": 1, "e.txt": 1}
+        assert dc.author_files == {
+            "Carol": {"a.txt": 1, "b.txt": 1, "c.txt": 1},
+            "Dave": {"b.txt": 1, "d.txt": 1, "e.txt": 1},
+        }
+        assert dc.authors["Carol"]["commits"] == 3
+        assert dc.authors["Carol"]["lines_added"] == 4
+        assert dc.authors["Dave"]["lines_removed"] == 2
+        assert dc.total_commits == 5
+
+    def test_linear_line_stats_follow_first_parent(self, git_repo_with_merge):
+        dc = self._collect(git_repo_with_merge, linear_linestats=1)
+
+        # c1, c2 and the merge (which brings in topic's net change)
+        assert len(dc.changes_by_date) == 3
+        assert sorted(c["lines"] for c in dc.changes_by_date.values()) == [3, 4, 6]
+        assert dc.total_lines_added == 8
+        assert dc.total_lines_removed == 2
+
+    def test_non_linear_line_stats_count_every_commit(self, git_repo_with_merge):
+        dc = self._collect(git_repo_with_merge, linear_linestats=0)
+
+        assert len(dc.changes_by_date) == 5
+        assert dc.total_lines_added == 8
+        assert dc.total_lines_removed == 2
+        assert dc.total_lines == 6
 
 
 # ── commit subject sampling (grounds the AI chronicle) ──────────────────
@@ -624,6 +1115,8 @@ class TestRunIntegration:
 
     def test_run_with_json(self, git_repo, temp_dir):
         """run() with extra_fmt='json' should produce a JSON file."""
+        import json
+
         import gitstats
         import gitstats.main
 
@@ -641,6 +1134,64 @@ class TestRunIntegration:
         # so the join collapses to just f"{outputpath}.json"
         json_path = f"{output}.json"
         assert os.path.exists(json_path), f"Expected {json_path} to exist"
+        with open(json_path, encoding="utf-8") as f:
+            dump = json.load(f)
+        assert "analyzed_tips" not in dump
+        assert sorted(dump["cache"]) == ["files_in_tree", "lines_in_blob"]
+
+    def test_run_from_snapshot_renders_same_report(self, git_repo, temp_dir):
+        """--from-snapshot renders the report of the last run without collecting."""
+        output = os.path.join(temp_dir, "report")
+        assert run([git_repo], output) == 0
+        assert os.path.exists(os.path.join(output, "gitstats.snapshot"))
+        pages = {}
+        for page in ("index", "activity", "authors", "files", "lines", "tags"):
+            with open(os.path.join(output, f"{page}.html"), encoding="utf-8") as f:
+                pages[page] = f.read()
+            os.remove(os.path.join(output, f"{page}.html"))
+
+        with patch.object(GitDataCollector, "collect", side_effect=AssertionError):
+            assert run([git_repo], output, from_snapshot=True) == 0
+        for page, content in pages.items():
+            with open(os.path.join(output, f"{page}.html"), encoding="utf-8") as f:
+                assert f.read() == content, page
+
+    def test_run_leaves_unchanged_pages_untouched(self, git_repo, temp_dir):
+        """A second run over the same history rewrites only the index page."""
+        import gitstats.main
+
+        output = os.path.join(temp_dir, "report")
+        assert run([git_repo], output) == 0
+        assert os.path.exists(os.path.join(output, "gitstats.manifest"))
+        files = ["index.html", "activity.html", "authors.html", "tags.html", "gitstats.css"]
+        for name in files:
+            os.utime(os.path.join(output, name), (0, 0))
+
+        assert run([git_repo], output) == 0
+        rewritten = {name for name in files if os.path.getmtime(os.path.join(output, name))}
+        assert rewritten == {"index.html"}
+
+        # settings that do not change the output keep the pages too
+        for name in files:
+            os.utime(os.path.join(output, name), (0, 0))
+        with patch.dict(gitstats.main.conf, {"render_processes": 1, "processes": 2}):
+            assert run([git_repo], output) == 0
+        rewritten = {name for name in files if os.path.getmtime(os.path.join(output, name))}
+        assert rewritten == {"index.html"}
+
+        # a configuration change renders the pages again
+        with patch.dict(gitstats.main.conf, {"max_authors": 1}):
+            assert run([git_repo], output) == 0
+        assert os.path.getmtime(os.path.join(output, "authors.html"))
+
+    def test_run_from_snapshot_without_snapshot(self, git_repo, temp_dir):
+        import gitstats.main
+
+        output = os.path.join(temp_dir, "report")
+        with patch.dict(gitstats.main.conf, {"snapshot": 0}):
+            assert run([git_repo], output) == 0
+        assert not os.path.exists(os.path.join(output, "gitstats.snapshot"))
+        assert run([git_repo], output, from_snapshot=True) == 1
 
     def test_run_multi_repo_aggregate(self, git_repo, git_repo_minimal, temp_dir):
         """run() with multiple repos writes per-repo reports and a portfolio page."""
@@ -676,9 +1227,81 @@ class TestRunIntegration:
         assert 'href="git_repo/index.html"' in index
         assert 'href="git_repo_minimal/index.html"' in index
         assert "Totals" in index
+        # the portfolio summary keeps estimates and durations for the next run
+        with open(f"{output}/portfolio.json", encoding="utf-8") as f:
+            portfolio = json.load(f)
+        names = [repo["name"] for repo in portfolio["repositories"]]
+        assert names == ["git_repo", "git_repo_minimal"]
+        for repo in portfolio["repositories"]:
+            assert repo["status"] == "ok"
+            assert repo["estimate"]["commits"] > 0
+            assert repo["seconds"] > 0
+        # and does not take the name of a single-repo summary
+        assert not os.path.exists(f"{output}/summary.json")
         # Per-repo pages must not leak into the output root
         assert not os.path.exists(f"{output}/activity.html")
 
+    def test_run_multi_repo_shares_assets(self, git_repo, git_repo_minimal, temp_dir):
+        """shared_assets keeps one copy of the static assets in the output root."""
+        import gitstats.main
+
+        linked = os.path.join(temp_dir, "linked")
+        with patch.dict(gitstats.main.conf, {"shared_assets": "link"}):
+            assert run([git_repo, git_repo_minimal], linked) == 0
+        root_chart = os.path.join(linked, "chart.umd.min.js")
+        for slug in ("git_repo", "git_repo_minimal"):
+            assert os.path.samefile(os.path.join(linked, slug, "chart.umd.min.js"), root_chart)
+        assert os.stat(root_chart).st_nlink == 3
+
+        referenced = os.path.join(temp_dir, "referenced")
+        with patch.dict(gitstats.main.conf, {"shared_assets": "reference"}):
+            assert run([git_repo, git_repo_minimal], referenced) == 0
+        assert os.path.exists(os.path.join(referenced, "chart.umd.min.js"))
+        assert not os.path.exists(os.path.join(referenced, "git_repo", "chart.umd.min.js"))
+        with open(os.path.join(referenced, "git_repo", "authors.html"), encoding="utf-8") as f:
+            page = f.read()
+        assert '<link rel="stylesheet" href="../gitstats.css"' in page
+        assert 'src="../chart.umd.min.js"' in page
+        assert "image_path = '../';" in page
+
+        with patch.dict(gitstats.main.conf, {"shared_assets": "copy"}):
+            assert run([git_repo, git_repo_minimal], referenced) == 1
+
+    def test_run_multi_repo_in_processes(self, git_repo, git_repo_minimal, temp_dir):
+        """jobs analyzes repositories in parallel processes; repo_timeout stops slow ones."""
+        import json
+        import time
+
+        import gitstats.main
+
+        analyze = gitstats.main._run_single_repo
+
+        def stuck_on_minimal(path, *args, **kwargs):
+            if path == git_repo_minimal:
+                time.sleep(120)
+            return analyze(path, *args, **kwargs)
+
+        not_a_repo = os.path.join(temp_dir, "not_a_repo")
+        os.makedirs(not_a_repo)
+        output = os.path.join(temp_dir, "report")
+        started = time.monotonic()
+        with (
+            patch.dict(gitstats.main.conf, {"jobs": 2, "repo_timeout": 20}),
+            patch("gitstats.main._run_single_repo", side_effect=stuck_on_minimal),
+        ):
+            assert run([git_repo_minimal, not_a_repo, git_repo], output) == 0
+        assert time.monotonic() - started < 120
+
+        with open(f"{output}/git_repo/summary.json", encoding="utf-8") as f:
+            assert json.load(f)["total_commits"] > 0
+        assert not os.path.exists(f"{output}/git_repo_minimal/summary.json")
+        with open(f"{output}/index.html", encoding="utf-8") as f:
+            index = f.read()
+        assert 'href="git_repo/index.html"' in index
+        assert "Analysis timed out after 20 seconds" in index
+        # failures are listed in the order the repositories were given
+        assert index.index("git_repo_minimal") < index.index("not_a_repo")
+
     def test_run_multi_repo_tolerates_failure(self, git_repo, temp_dir):
         """One broken repo is reported on the portfolio page, not fatal."""
         import gitstats
@@ -739,6 +1362,8 @@ class TestCLI:
         assert args.quiet is False
         assert args.ai is None
         assert args.refresh_ai is False
+        assert args.from_snapshot is False
+        assert args.jobs is None
 
     def test_parser_single_path(self):
         parser = get_parser()
@@ -751,6 +1376,11 @@ class TestCLI:
         args = parser.parse_args(["-f", "json", "repo", "out"])
         assert args.format == "json"
 
+    def test_parser_jobs(self):
+        parser = get_parser()
+        args = parser.parse_args(["-j", "4", "repo-a", "repo-b", "out"])
+        assert args.jobs == 4
+
     def test_parser_ai_flags(self):
         parser = get_parser()
         args = parser.parse_args(["--ai", "--refresh-ai", "repo", "out"])
@@ -856,6 +1486,26 @@ def test_main_default_outputpath(git_repo_minimal, temp_dir):
     assert os.path.isdir("gitstats-report")
 
 
+def test_main_keeps_configured_profile_without_flag(git_repo_minimal, temp_dir):
+    """Test main() leaves a configured profile alone when --profile is not given."""
+    import gitstats
+    import gitstats.main
+
+    cfg = dict(gitstats.DEFAULT_CONFIG, ai_enabled=False, profile=1)
+    gitstats._config = cfg
+    gitstats.main.conf = cfg
+
+    import sys
+
+    output = os.path.join(temp_dir, "report")
+
+    with patch.object(sys, "argv", ["gitstats", git_repo_minimal, output]):
+        ret = main()
+    assert ret == 0
+    assert gitstats.main.conf["profile"] == 1
+    assert os.path.exists(os.path.join(output, "profile.json"))
+
+
 def test_main_with_config_override(git_repo_minimal, temp_dir):
     """Test main() with -c overrides."""
     import gitstats
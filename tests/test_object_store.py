@@ -0,0 +1,116 @@
+"""Tests for gitstats.object_store – the in-process object database reader."""
+
+import os
+import subprocess
+
+import pytest
+
+from gitstats.object_store import GitObjectStore, ObjectStoreError, _apply_delta, find_git_dir
+
+
+def _git(repo, *args):
+    return subprocess.run(
+        ["git", *args], cwd=repo, check=True, capture_output=True, env={**os.environ, "LC_ALL": "C"}
+    ).stdout
+
+
+def _all_objects(repo):
+    out = _git(repo, "cat-file", "--batch-all-objects", "--batch-check=%(objectname) %(objecttype)")
+    return [line.split() for line in out.decode().splitlines()]
+
+
+@pytest.fixture
+def delta_repo(temp_dir):
+    """Repo with many revisions of one growing file, so packing creates delta chains."""
+    repo = os.path.join(temp_dir, "delta_repo")
+    os.makedirs(os.path.join(repo, "src", "pkg"))
+    _git(repo, "init", "-b", "main")
+    _git(repo, "config", "user.name", "Test")
+    _git(repo, "config", "user.email", "test@example.com")
+    lines = [f"line {i} of a file that changes a little every commit\n" for i in range(200)]
+    for rev in range(12):
+        lines[rev * 7] = f"changed in revision {rev}\n"
+        with open(os.path.join(repo, "src", "pkg", "big.txt"), "w") as f:
+            f.writelines(lines)
+        with open(os.path.join(repo, f"file{rev}.txt"), "w") as f:
+            f.write(f"{rev}\n")
+        _git(repo, "add", ".")
+        _git(repo, "commit", "-m", f"rev {rev}")
+    return repo
+
+
+def _assert_reads_like_git(repo):
+    store = GitObjectStore(find_git_dir(repo))
+    try:
+        objects = _all_objects(repo)
+        assert objects
+        for sha, obj_type in objects:
+            expected = _git(repo, "cat-file", obj_type, sha)
+            assert store.read(sha) == (obj_type, expected)
+    finally:
+        store.close()
+
+
+def test_reads_loose_objects(delta_repo):
+    _assert_reads_like_git(delta_repo)
+
+
+def test_reads_packed_objects_with_ofs_deltas(delta_repo):
+    _git(delta_repo, "gc", "--aggressive", "--quiet")
+    verify = _git(delta_repo, "verify-pack", "-v", *_pack_indexes(delta_repo)).decode()
+    assert "chain length" in verify  # the pack really holds deltas
+    _assert_reads_like_git(delta_repo)
+
+
+def test_reads_packed_objects_with_ref_deltas(delta_repo):
+    _git(delta_repo, "-c", "repack.useDeltaBaseOffset=false", "repack", "-a", "-d", "-f", "-q")
+    _assert_reads_like_git(delta_repo)
+
+
+def _pack_indexes(repo):
+    pack_dir = os.path.join(repo, ".git", "objects", "pack")
+    return [os.path.join(pack_dir, name) for name in os.listdir(pack_dir) if name.endswith(".idx")]
+
+
+def test_count_files_in_tree_matches_ls_tree(delta_repo):
+    _git(delta_repo, "gc", "--quiet")
+    store = GitObjectStore(find_git_dir(os.path.join(delta_repo, "src")))
+    try:
+        for line in _git(delta_repo, "log", "--format=%T").decode().split():
+            expected = len(_git(delta_repo, "ls-tree", "-r", "--name-only", line).splitlines())
+            assert store.count_files_in_tree(line) == expected
+        # commits, unknown objects and non-hex input are left to the CLI
+        head = _git(delta_repo, "rev-parse", "HEAD").decode().strip()
+        assert store.count_files_in_tree(head) is None
+        assert store.count_files_in_tree("0" * 40) is None
+        assert store.count_files_in_tree("HEAD") is None
+        assert store.read("0" * 40) is None
+    finally:
+        store.close()
+
+
+def test_unsupported_repositories_raise(temp_dir):
+    sha256_repo = os.path.join(temp_dir, "sha256")
+    os.makedirs(sha256_repo)
+    _git(sha256_repo, "init", "--object-format=sha256")
+    with pytest.raises(ObjectStoreError):
+        GitObjectStore(find_git_dir(sha256_repo))
+
+    promisor_repo = os.path.join(temp_dir, "promisor")
+    os.makedirs(promisor_repo)
+    _git(promisor_repo, "init")
+    open(os.path.join(promisor_repo, ".git", "objects", "pack", "pack-x.promisor"), "w").close()
+    with pytest.raises(ObjectStoreError):
+        GitObjectStore(find_git_dir(promisor_repo))
+
+    with pytest.raises(ObjectStoreError):
+        find_git_dir(os.path.abspath(os.sep))
+
+
+def test_apply_delta():
+    base = b"hello, world"
+    # sizes 12 -> 12; copy "hello" (offset 0, size 5), insert "!!", copy "world" (offset 7)
+    delta = bytes([12, 12, 0x90, 5, 2]) + b"!!" + bytes([0x91, 7, 5])
+    assert _apply_delta(base, delta) == b"hello!!world"
+    with pytest.raises(ObjectStoreError):
+        _apply_delta(b"short", delta)
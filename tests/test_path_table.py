@@ -0,0 +1,52 @@
+"""Tests for gitstats.path_table – interned paths and per-path counts."""
+
+from gitstats.path_table import PathCounts, PathTable
+
+
+def test_intern_shares_directories():
+    table = PathTable()
+    a = table.intern("src/app/main.py")
+    b = table.intern("src/app/util.py")
+    assert table.intern("src/app/main.py") == a
+    # src, src/app and the two files
+    assert len(table) == 4
+    assert table.parents[a] == table.parents[b]
+    assert table.path(a) == "src/app/main.py"
+    assert table.lookup("src/app/util.py") == b
+    assert table.lookup("src/other.py") is None
+
+
+def test_counts_read_like_a_dict_in_first_count_order():
+    table = PathTable()
+    counts = PathCounts(table)
+    for path in ["b.txt", "a/x.py", "b.txt", "a/y.py"]:
+        counts.add(table.intern(path))
+    counts.compact()
+
+    assert list(counts) == ["b.txt", "a/x.py", "a/y.py"]
+    assert counts == {"b.txt": 2, "a/x.py": 1, "a/y.py": 1}
+    assert counts["b.txt"] == 2
+    assert counts.get("missing") is None
+    assert "a" not in counts
+
+
+def test_update_and_roundtrip_through_columns():
+    table = PathTable()
+    first = PathCounts.from_mapping({"a/x.py": 2, "b.txt": 1}, table)
+    second = PathCounts.from_mapping({"b.txt": 3, "c.md": 1}, table)
+    first.update(second)
+    assert list(first.items()) == [("a/x.py", 2), ("b.txt", 4), ("c.md", 1)]
+
+    restored_table = PathTable(table.parents, table.names)
+    assert restored_table == table
+    restored = PathCounts(restored_table, first.ids, first.counts)
+    assert restored == first
+    assert restored_table.intern("c.md") == table.lookup("c.md")
+
+
+def test_directory_totals():
+    counts = PathCounts.from_mapping(
+        {"src/app/main.py": 5, "src/lib.py": 2, "docs/index.md": 1, "README": 4}
+    )
+    assert counts.directory_totals() == {"src": 7, "src/app": 5, "docs": 1}
+    assert counts.directory_totals(depth=1) == {"src": 7, "docs": 1}
@@ -0,0 +1,107 @@
+"""Tests for gitstats.profiling – command/phase timing and the --profile report."""
+
+import json
+import os
+
+import pytest
+
+from gitstats import profiling
+
+
+@pytest.fixture
+def profiler():
+    profiling.enable()
+    profiling.reset()
+    yield profiling
+    profiling.enable(False)
+    profiling.reset()
+
+
+def test_commands_are_attributed_to_the_running_phase(profiler):
+    before = profiler.external_time()
+    with profiler.phase("collect:walk"):
+        profiler.record_command("git log --numstat HEAD", 0.5, 0.25, 1000)
+    profiler.record_command("git rev-list HEAD", 0.25, 0.125, 10)
+
+    profile = profiler.get_profile()
+    assert profiler.external_time() == pytest.approx(before + 0.75)
+    assert profile["external_time"] == pytest.approx(0.75)
+    assert [row["phase"] for row in profile["command_records"]] == ["collect:walk", ""]
+    assert [total["name"] for total in profile["commands"]] == ["git log", "git rev-list"]
+    (walk,) = profile["phases"]
+    assert walk["name"] == "collect:walk"
+    assert walk["bytes_read"] == 1000
+    assert walk["processes"] == 1
+
+
+def test_disabled_profiler_only_tracks_external_time():
+    profiling.reset()
+    before = profiling.external_time()
+    with profiling.phase("collect:walk"):
+        profiling.record_command("git log", 0.5, 0.0, 10)
+    assert profiling.external_time() == pytest.approx(before + 0.5)
+    assert profiling.get_profile()["command_records"] == []
+    assert profiling.get_profile()["phases"] == []
+
+
+def test_worker_records_reach_the_parent(profiler, git_repo, monkeypatch):
+    from gitstats.main import parallel_map_with_fallback
+    from gitstats.utils import get_num_of_files_from_rev
+
+    monkeypatch.chdir(git_repo)
+    with profiler.phase("collect:files"):
+        results = parallel_map_with_fallback(get_num_of_files_from_rev, [("1", "HEAD")] * 3)
+    assert [count for _, _, count in results] == [results[0][2]] * 3
+
+    profile = profiler.get_profile()
+    worker_commands = [row for row in profile["command_records"] if row["pid"] != os.getpid()]
+    assert len(worker_commands) == 3
+    assert {row["phase"] for row in worker_commands} == {"collect:files (worker)"}
+    assert all(row["bytes_read"] > 0 for row in worker_commands)
+    assert "collect:files (worker)" in [total["name"] for total in profile["phases"]]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_worker_does_not_inherit_a_held_lock():
+    with profiling._lock:
+        # another thread is recording while the worker is forked
+        pid = os.fork()
+        if pid == 0:
+            profiling.run_in_worker(len, "", "abc")
+            os._exit(0)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+
+def test_run_with_profile_writes_diagnostics(git_repo, temp_dir):
+    import gitstats.main
+
+    gitstats.main.conf["profile"] = True
+    output = os.path.join(temp_dir, "report")
+    try:
+        assert gitstats.main.run([git_repo], output) == 0
+    finally:
+        profiling.enable(False)
+
+    with open(os.path.join(output, "profile.json"), encoding="utf-8") as f:
+        profile = json.load(f)
+    assert profile["version"] == profiling.PROFILE_VERSION
+    phases = {total["name"] for total in profile["phases"]}
+    assert {"collect", "collect:walk", "refine", "render", "render:index"} <= phases
+    assert "git log" in {total["name"] for total in profile["commands"]}
+
+    with open(os.path.join(output, "diagnostics.html"), encoding="utf-8") as f:
+        page = f.read()
+    assert "Run diagnostics" in page
+    assert 'id="phases"' in page
+    with open(os.path.join(output, "index.html"), encoding="utf-8") as f:
+        assert 'href="diagnostics.html"' in f.read()
+
+
+def test_run_without_profile_writes_no_diagnostics(git_repo, temp_dir):
+    import gitstats.main
+
+    output = os.path.join(temp_dir, "report")
+    assert gitstats.main.run([git_repo], output) == 0
+    assert not os.path.exists(os.path.join(output, "profile.json"))
+    assert not os.path.exists(os.path.join(output, "diagnostics.html"))
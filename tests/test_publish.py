@@ -0,0 +1,60 @@
+"""Tests for gitstats.publish – minified and precompressed report output."""
+
+import gzip
+import os
+
+import gitstats
+from gitstats.publish import minify_html, publish
+
+
+def test_minify_html_collapses_whitespace_outside_verbatim_blocks():
+    page = (
+        "<html>\n  <!-- note -->\n  <p>a   b</p>\n"
+        "<pre>  keep\n    this</pre>\n"
+        "<script>\n    var x = 1;\n\n    // comment\n    f(x);\n</script>\n</html>"
+    )
+    assert minify_html(page) == (
+        "<html>\n<p>a b</p>\n<pre>  keep\n    this</pre>\n"
+        "<script>\nvar x = 1;\n// comment\nf(x);\n</script>\n</html>"
+    )
+
+
+def _write(path, name, content):
+    os.makedirs(os.path.dirname(os.path.join(path, name)), exist_ok=True)
+    with open(os.path.join(path, name), "w", encoding="utf-8") as f:
+        f.write(content)
+
+
+def test_publish_compresses_changed_files_only(temp_dir):
+    gitstats._config["minify_html"] = 1
+    gitstats._config["precompress"] = 1
+    _write(temp_dir, "index.html", "<p>\n    hello\n</p>" * 200)
+    _write(temp_dir, "data/chart.js", "chartData(1);" * 200)
+    _write(temp_dir, "small.css", "p {}")
+    _write(temp_dir, "gone.html.gz", "stale")
+
+    publish(temp_dir)
+
+    with open(os.path.join(temp_dir, "index.html"), encoding="utf-8") as f:
+        page = f.read()
+    assert page == "<p>\nhello\n</p>" * 200
+    with gzip.open(os.path.join(temp_dir, "index.html.gz"), "rt", encoding="utf-8") as f:
+        assert f.read() == page
+    assert os.path.exists(os.path.join(temp_dir, "data", "chart.js.gz"))
+    assert not os.path.exists(os.path.join(temp_dir, "small.css.gz"))
+    assert not os.path.exists(os.path.join(temp_dir, "gone.html.gz"))
+
+    # unchanged files keep their siblings, changed ones get new ones
+    sibling = os.path.join(temp_dir, "data", "chart.js.gz")
+    os.utime(sibling, (0, 0))
+    _write(temp_dir, "index.html", "<p>changed</p>" * 200)
+    publish(temp_dir)
+    assert os.path.getmtime(sibling) == 0
+    with gzip.open(os.path.join(temp_dir, "index.html.gz"), "rt", encoding="utf-8") as f:
+        assert f.read() == "<p>changed</p>" * 200
+
+
+def test_publish_does_nothing_by_default(temp_dir):
+    _write(temp_dir, "index.html", "<p>\n    hello\n</p>" * 200)
+    publish(temp_dir)
+    assert os.listdir(temp_dir) == ["index.html"]
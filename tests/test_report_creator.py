@@ -1,11 +1,14 @@
 """Tests for gitstats.report_creator – HTML generation, helpers, chart rendering."""
 
 import datetime
+import json
 import os
+import re
 from io import StringIO
 
 import pytest
 
+from gitstats.path_table import PathCounts, PathTable
 from gitstats.report_creator import (
     HTMLReportCreator,
     ReportCreator,
@@ -251,6 +254,37 @@ def test_render_chartjs_y_label():
     assert "title: { display: true, text: 'Lines of Code' }" in result
 
 
+def test_render_chartjs_builds_lazily_from_inline_data():
+    creator = HTMLReportCreator()
+    result = creator._render_chartjs("chart-lazy", "bar", ["X"], [{"label": "C", "data": [1]}])
+    assert 'lazyChart(\'chart-lazy\', {"labels":["X"]' in result
+    assert "}, null, function(data) {" in result
+
+
+def test_render_chartjs_writes_large_data_to_hashed_file(temp_dir):
+    import gitstats
+
+    gitstats._config["inline_chart_data_max"] = 10
+    creator = HTMLReportCreator()
+    creator.path = temp_dir
+    creator.chart_data = []
+    datasets = [{"label": "C", "data": [1, 2]}]
+    result = creator._render_chartjs("chart-big", "bar", ["X", "Y"], datasets)
+
+    [source] = creator.chart_data
+    assert source.startswith("data/chart-big.") and source.endswith(".js")
+    assert f"lazyChart('chart-big', null, '{source}', function(data) {{" in result
+    assert '"labels"' not in result
+    with open(os.path.join(temp_dir, source), encoding="utf-8") as f:
+        script = f.read()
+    assert script.startswith(f'chartData("{source}",{{"labels":["X","Y"]')
+
+    # the same data keeps its name; files no page uses are removed
+    assert creator._render_chartjs("chart-big", "bar", ["X", "Y"], datasets) == result
+    creator._prune_chart_data(temp_dir, set())
+    assert os.listdir(os.path.join(temp_dir, "data")) == []
+
+
 # ── HTMLReportCreator.print_header ───────────────────────────────────────
 
 
@@ -390,6 +424,53 @@ def test_create_authors_html(mock_data_collector, temp_dir):
     assert "Contributor Growth" in html
 
 
+def test_create_authors_html_ships_large_tables_as_json(mock_data_collector, temp_dir):
+    import gitstats
+
+    gitstats._config["table_page_size"] = 2
+    creator = HTMLReportCreator()
+    creator.title = mock_data_collector.project_name
+    creator.data = mock_data_collector
+    creator.create_authors_html(mock_data_collector, temp_dir)
+
+    with open(f"{temp_dir}/authors.html", encoding="utf-8") as f:
+        html = f.read()
+
+    assert 'id="aom"' in html and '<table class="sortable" id="aom">' not in html
+    match = re.search(r"lazyChart\('aom', (\{.*?\}), null", html)
+    table = json.loads(match.group(1))
+    assert table["rows"] == 6
+    assert table["pageSize"] == 2
+    months, authors, commits = table["data"][:3]
+    assert months[0] == "2023-06"
+    assert authors[months.index("2023-03")] == "Alice Smith"
+    assert commits[months.index("2023-03")] == 8
+    # a single year still fits in a plain table
+    assert '<table class="sortable" id="aoy">' in html
+
+
+def test_create_authors_html_pages_all_other_authors_of_a_large_project(
+    mock_data_collector, temp_dir
+):
+    info = mock_data_collector.authors["Charlie Brown"]
+    for i in range(600):
+        mock_data_collector.authors[f"Author {i:03d}"] = dict(info, commits=1)
+    creator = HTMLReportCreator()
+    creator.title = mock_data_collector.project_name
+    creator.data = mock_data_collector
+    creator.create_authors_html(mock_data_collector, temp_dir)
+
+    with open(f"{temp_dir}/authors.html", encoding="utf-8") as f:
+        html = f.read()
+
+    # with the default settings, every author past the top 20 is listed
+    assert "virtualTable('authors-rest', data)" in html
+    table = json.loads(re.search(r"lazyChart\('authors-rest', (\{.*?\}), null", html).group(1))
+    assert table["rows"] == 603 - 20
+    assert table["data"][0][-1] == "Author 599"
+    assert "more authors" not in html
+
+
 # ── HTMLReportCreator.create_files_html ──────────────────────────────────
 
 
@@ -410,6 +491,9 @@ def test_create_files_html(mock_data_collector, temp_dir):
     assert "Most Changed Files" in html
     assert "main.py" in html
     assert "utils.py" in html
+    # tests/test_main.py is the only file below a directory
+    assert "Most Changed Directories" in html
+    assert '<td class="heat heat4">tests/</td><td>5</td>' in html
 
 
 # ── HTMLReportCreator.create_lines_html ──────────────────────────────────
@@ -428,6 +512,29 @@ def test_create_lines_html(mock_data_collector, temp_dir):
     assert "Total lines" in html
 
 
+def test_create_lines_html_downsamples_keeping_peaks(mock_data_collector, temp_dir):
+    import gitstats
+
+    gitstats._config["chart_max_points"] = 10
+    creator = HTMLReportCreator()
+    creator.title = mock_data_collector.project_name
+    creator.data = mock_data_collector
+    mock_data_collector.changes_by_date = {
+        1670000000 + i * 86400: {"lines": 987654 if i == 33 else 100 + i} for i in range(60)
+    }
+    creator.create_lines_html(mock_data_collector, temp_dir)
+
+    with open(f"{temp_dir}/lines.html", encoding="utf-8") as f:
+        html = f.read()
+
+    match = re.search(r"lazyChart\('chart-lines-of-code', (\{.*?\}), null", html)
+    data = json.loads(match.group(1))
+    assert len(data["labels"]) == 10
+    assert data["datasets"][0]["data"][0] == 100
+    assert data["datasets"][0]["data"][-1] == 159
+    assert 987654 in data["datasets"][0]["data"]
+
+
 # ── HTMLReportCreator.create_tags_html ───────────────────────────────────
 
 
@@ -446,6 +553,36 @@ def test_create_tags_html(mock_data_collector, temp_dir):
     assert "Alice Smith" in html
 
 
+def test_create_tags_html_ships_large_tables_as_json(mock_data_collector, temp_dir):
+    import gitstats
+
+    gitstats._config["table_page_size"] = 1
+    gitstats._config["max_tags_authors"] = 1
+    creator = HTMLReportCreator()
+    creator.title = mock_data_collector.project_name
+    creator.data = mock_data_collector
+    creator.create_tags_html(mock_data_collector, temp_dir)
+
+    with open(f"{temp_dir}/tags.html", encoding="utf-8") as f:
+        html = f.read()
+
+    assert '<table class="tags">' not in html
+    assert "virtualTable('tags', data)" in html
+    table = json.loads(re.search(r"lazyChart\('tags', (\{.*?\}), null", html).group(1))
+    assert [column["title"] for column in table["columns"]] == [
+        "Name",
+        "Date",
+        "Commits",
+        "Authors",
+    ]
+    assert table["data"] == [
+        ["v1.1.0", "v1.0.0"],
+        ["2023-04-05", "2023-02-20"],
+        [4, 2],
+        ["Alice Smith (3), and 1 more authors", "Bob Jones (1), and 1 more authors"],
+    ]
+
+
 # ── HTMLReportCreator.create_ai_insights_html ────────────────────────────
 
 
@@ -564,7 +701,7 @@ def test_build_author_time_series_basic(mock_data_collector):
 
 
 def test_build_author_time_series_downsample(mock_data_collector):
-    """When total_points > MAX_POINTS (500), downsampling kicks in."""
+    """When total_points > chart_max_points (500), downsampling kicks in."""
     creator = HTMLReportCreator()
     creator.data = mock_data_collector
 
@@ -585,7 +722,7 @@ def test_build_author_time_series_downsample(mock_data_collector):
 
     labels, loc_ds, cba_ds = creator._build_author_time_series(mock_data_collector)
 
-    # Should be downsampled to ~500 + 1 (last point ensured)
+    # Should be downsampled to chart_max_points
     assert len(labels) <= 502, f"Expected ≤502 labels, got {len(labels)}"
     assert len(labels) >= 498, f"Expected ≥498 labels, got {len(labels)}"
 
@@ -679,6 +816,28 @@ def test_create_copies_static_files(mock_data_collector, temp_dir):
         assert os.path.exists(f"{temp_dir}/{fname}"), f"Missing static file: {fname}"
 
 
+def test_create_renders_pages_in_workers_like_sequentially(mock_data_collector, temp_dir):
+    import gitstats
+
+    outputs = {}
+    for processes in (1, 4):
+        gitstats._config["render_processes"] = processes
+        out = os.path.join(temp_dir, str(processes))
+        os.makedirs(out)
+        HTMLReportCreator().create(mock_data_collector, out)
+        outputs[processes] = out
+
+    pages = sorted(name for name in os.listdir(outputs[1]) if name.endswith(".html"))
+    assert pages == sorted(name for name in os.listdir(outputs[4]) if name.endswith(".html"))
+    for name in pages:
+        if name == "index.html":
+            continue  # shows the time it was generated
+        with open(os.path.join(outputs[1], name), "rb") as f:
+            sequential = f.read()
+        with open(os.path.join(outputs[4], name), "rb") as f:
+            assert f.read() == sequential, name
+
+
 # ── Code ownership ───────────────────────────────────────────────────────
 
 
@@ -711,12 +870,45 @@ def test_compute_code_ownership_stats():
     assert authors["Bob"]["files_touched"] == 2
 
 
+def test_compute_code_ownership_of_interned_paths():
+    author_files = {
+        "Alice": {"src/a.py": 3, "shared.py": 2},
+        "Bob": {"shared.py": 5, "b.py": 1},
+        "release[bot]": {"shared.py": 99},
+    }
+    table = PathTable()
+    interned = {
+        author: PathCounts.from_mapping(files, table) for author, files in author_files.items()
+    }
+    assert compute_code_ownership(interned) == compute_code_ownership(author_files)
+
+
+def test_compute_code_ownership_limit_keeps_the_top_of_each_ranking():
+    author_files = {
+        f"author{i}": {f"f{j}.py": (i + j) % 4 + 1 for j in range(i, 12)} for i in range(8)
+    }
+    full = compute_code_ownership(author_files)
+    top = compute_code_ownership(author_files, limit=3)
+
+    assert top["files"] == full["files"][:3]
+    assert top["single_owner"] == [fs for fs in full["files"] if fs["contributors"] == 1][:3]
+    shared = [fs for fs in full["files"] if fs["contributors"] >= 2]
+    shared.sort(key=lambda x: (x["contributors"], x["edits"]), reverse=True)
+    assert top["shared"] == shared[:3]
+    assert top["authors"] == full["authors"][:3]
+    assert top["total_files"] == full["total_files"] == 12
+    assert top["total_authors"] == 8
+
+
 def test_compute_code_ownership_empty():
     assert compute_code_ownership({}) == {
         "files": [],
+        "single_owner": [],
+        "shared": [],
         "authors": [],
         "total_files": 0,
         "single_owner_files": 0,
+        "total_authors": 0,
     }
 
 
@@ -956,3 +1148,28 @@ def test_history_page_chronicle_fallback_when_unparseable(mock_data_collector, t
 
     # shown whole rather than dropped
     assert "A free-form narrative without markers." in content
+
+
+# ── page inputs ──────────────────────────────────────────────────────────
+
+
+def test_read_recorder_notes_attributes_read_through_methods():
+    from gitstats.report_creator import _ReadRecorder
+
+    class Collector:
+        def __init__(self):
+            self.commits = 3
+            self.authors = {"a": 1}
+            self.tags = {}
+
+        def get_total_authors(self):
+            return len(self.authors)
+
+    collector = Collector()
+    recorder = _ReadRecorder.wrap(collector)
+    assert recorder.commits == 3
+    assert recorder.get_total_authors() == 1
+    recorder.note = "written"
+    assert collector.note == "written"
+    assert sorted(recorder._recorder_reads) == ["authors", "commits"]
+    assert _ReadRecorder.wrap(object()) is None
@@ -0,0 +1,67 @@
+"""Tests for gitstats.schedule – cost estimates and largest-first scheduling."""
+
+import logging
+import os
+
+from gitstats.schedule import (
+    RepoSchedule,
+    estimate_repo,
+    load_portfolio_summary,
+    write_portfolio_summary,
+)
+
+
+def test_estimate_repo_sizes_up_repository(git_repo, temp_dir):
+    estimate = estimate_repo(git_repo)
+    assert estimate["commits"] > 0
+    assert estimate["files"] > 0
+    assert estimate["objects"] > 0
+
+    not_a_repo = os.path.join(temp_dir, "not_a_repo")
+    os.makedirs(not_a_repo)
+    assert estimate_repo(not_a_repo) == {"commits": 0, "files": 0, "objects": 0, "size_kib": 0}
+
+
+def test_schedule_starts_costliest_first_using_measured_durations(temp_dir):
+    small = {"commits": 10, "files": 0, "size_kib": 0}
+    large = {"commits": 1000, "files": 0, "size_kib": 0}
+    repos = [("/r/a", "a", small), ("/r/b", "b", large), ("/r/c", "c", small)]
+    schedule = RepoSchedule(repos, {})
+    assert not schedule.calibrated
+    # equal costs keep their input order
+    assert schedule.order == [1, 0, 2]
+
+    # "a" took 100 seconds for a cost of 10: estimates are scaled by 10
+    previous = {"/r/a": {"path": "/r/a", "status": "ok", "cost": 10.0, "seconds": 100.0}}
+    schedule = RepoSchedule(repos, previous)
+    assert schedule.calibrated
+    assert schedule.costs == [100.0, 10000.0, 100.0]
+    assert schedule.makespan(1) == 10200.0
+    assert schedule.makespan(2) == 10000.0
+
+
+def test_schedule_logs_progress_and_round_trips_through_summary(temp_dir, caplog):
+    repos = [
+        ("/r/a", "a", {"commits": 30, "files": 0, "size_kib": 0}),
+        ("/r/b", "b", {"commits": 10, "files": 0, "size_kib": 0}),
+    ]
+    schedule = RepoSchedule(repos, {})
+    with caplog.at_level(logging.INFO, logger="gitstats"):
+        for index in schedule.order:
+            schedule.started(index)
+            schedule.finished(index, {"total_commits": 30} if index == 0 else "broken")
+    assert "1 of 2 repositories done" in caplog.text
+    assert "commits/sec" in caplog.text
+    assert "left" in caplog.text
+
+    write_portfolio_summary(schedule.portfolio_summary(), temp_dir)
+    assert not os.path.exists(os.path.join(temp_dir, "summary.json"))
+    previous = load_portfolio_summary(temp_dir)
+    assert previous["/r/a"]["status"] == "ok"
+    assert previous["/r/a"]["cost"] == 30.0
+    assert previous["/r/b"]["status"] == "failed"
+    assert "seconds" in previous["/r/b"]
+
+    # a run from snapshots has no estimates of its own
+    schedule = RepoSchedule([("/r/b", "b", None)], previous)
+    assert schedule.estimates == [{"commits": 10, "files": 0, "size_kib": 0}]
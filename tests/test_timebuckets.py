@@ -0,0 +1,63 @@
+"""Tests for gitstats.timebuckets – memoized local calendar keys of timestamps."""
+
+import datetime
+import os
+import random
+import time
+
+import pytest
+
+from gitstats import timebuckets
+
+
+@pytest.fixture
+def timezone(monkeypatch):
+    """Switch the local timezone for one test."""
+
+    def switch(name):
+        if not os.path.exists(os.path.join("/usr/share/zoneinfo", name)):
+            pytest.skip(f"timezone {name} not available")
+        monkeypatch.setenv("TZ", name)
+        time.tzset()
+        timebuckets.reset()
+
+    yield switch
+    monkeypatch.undo()
+    time.tzset()
+    timebuckets.reset()
+
+
+@pytest.mark.parametrize(
+    "name",
+    # DST on whole hours, on half hours (Lord Howe shifts by 30 minutes) and
+    # a half-hour UTC offset
+    ["Europe/Berlin", "Australia/Lord_Howe", "America/St_Johns", "UTC"],
+)
+def test_keys_match_datetime(timezone, name):
+    timezone(name)
+    rng = random.Random(name)
+    stamps = [rng.randrange(0, 2_000_000_000) for _ in range(2000)]
+    # every minute around DST transitions of the Berlin, Lord Howe and
+    # St. John's rules; the last one is not on a whole UTC hour
+    for transition in (1711846800, 1712415600, 1710048600):
+        stamps.extend(range(transition - 7200, transition + 7200, 60))
+
+    for stamp in stamps:
+        date = datetime.datetime.fromtimestamp(stamp)
+        assert timebuckets.local_day(stamp) == (date.toordinal(), date.hour), stamp
+        assert timebuckets.stamp_keys(stamp) == (
+            date.weekday(),
+            date.month,
+            date.year,
+            date.strftime("%Y-%W"),
+            date.strftime("%Y-%m"),
+            date.strftime("%Y-%m-%d"),
+        )
+        assert timebuckets.date_label(stamp) == date.strftime("%Y-%m-%d")
+
+
+def test_day_keys_are_memoized():
+    day = datetime.date(2024, 5, 8).toordinal()
+    keys = timebuckets.day_keys(day)
+    assert keys == (2, 5, 2024, "2024-19", "2024-05", "2024-05-08")
+    assert timebuckets.day_keys(day) is keys
@@ -0,0 +1,50 @@
+"""Tests for gitstats.topk – bounded top-K selection and Space-Saving counters."""
+
+import random
+from operator import itemgetter
+
+import pytest
+
+from gitstats.topk import SpaceSaving, top_k
+
+
+def test_top_k_matches_a_full_sort_including_ties():
+    rng = random.Random(7)
+    items = [(f"k{i}", rng.randrange(10)) for i in range(500)]
+    key = itemgetter(1)
+    expected = sorted(items, key=key, reverse=True)
+    for k in (0, 1, 25, 500, 600):
+        assert top_k(items, k, key=key) == expected[:k]
+    assert top_k(iter(items), None, key=key) == expected
+
+
+def test_space_saving_is_exact_within_capacity():
+    counters = SpaceSaving(3)
+    for key in "abacab":
+        counters.add(key)
+    assert counters.top() == [("a", 3), ("b", 2), ("c", 1)]
+    assert counters.errors == {"a": 0, "b": 0, "c": 0}
+
+
+def test_space_saving_bounds_the_error_and_keeps_heavy_hitters():
+    rng = random.Random(3)
+    counters = SpaceSaving(20)
+    exact: dict[int, int] = {}
+    for _ in range(20000):
+        key = int(rng.paretovariate(1.1))
+        counters.add(key)
+        exact[key] = exact.get(key, 0) + 1
+
+    assert len(counters.counts) == 20
+    assert counters.total == 20000
+    for key, count in counters.counts.items():
+        assert exact[key] <= count <= exact[key] + counters.errors[key]
+    for key, count in exact.items():
+        if count > counters.total / counters.capacity:
+            assert key in counters.counts
+    assert [key for key, _ in counters.top(3)] == [1, 2, 3]
+
+
+def test_space_saving_needs_a_counter():
+    with pytest.raises(ValueError):
+        SpaceSaving(0)
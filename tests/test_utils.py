@@ -3,14 +3,21 @@
 import pytest
 
 from gitstats.utils import (
+    CatFileBatch,
+    count_lines_in_bytes,
     count_lines_in_text,
     filter_lines_by_pattern,
     format_int,
     get_commit_range,
     get_excluded_extensions,
     get_log_range,
+    get_num_of_files_from_rev,
+    get_num_of_lines_in_blob,
+    get_num_of_lines_in_blobs,
+    get_object_store,
     get_stat_summary_counts,
     get_version,
+    iter_pipe_lines,
     should_exclude_file,
 )
 
@@ -74,6 +81,11 @@ def test_count_lines_in_text_trailing_newline():
     assert count_lines_in_text("a\nb\nc") == 3
 
 
+def test_count_lines_in_bytes_matches_text_rules():
+    for text in ("a\nb\nc\n", "single line", "a\nb\nc", "", "   \n  \n   ", "\n\nx\n\n"):
+        assert count_lines_in_bytes(text.encode()) == count_lines_in_text(text)
+
+
 # ── filter_lines_by_pattern ──────────────────────────────────────────────
 
 
@@ -147,6 +159,118 @@ def test_get_excluded_extensions_values():
     assert get_excluded_extensions() == {"png", "jpg", "class"}
 
 
+# ── blob line counting through `git cat-file --batch` ───────────────────
+
+
+def _blob_ids(repo):
+    import subprocess
+
+    out = subprocess.run(
+        ["git", "ls-tree", "-r", "HEAD"], cwd=repo, check=True, capture_output=True, text=True
+    ).stdout
+    ids = {}
+    for line in out.splitlines():
+        meta, path = line.split("\t", 1)
+        ids[path] = meta.split()[2]
+    return ids
+
+
+def test_cat_file_batch_reads_many_objects(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo)
+    ids = _blob_ids(git_repo)
+    with CatFileBatch() as reader:
+        content = reader.read(ids["main.py"])
+        assert content == b"print('hello, world!')\nprint('foo')\nprint('bar')\n"
+        assert reader.read(ids["utils.py"]).startswith(b"def add")
+        assert reader.read("0" * 40) is None
+        # the process survives a missing object
+        assert reader.read(ids["README.md"]) == b"# Test Repo\n\nHello world.\n"
+
+
+def test_get_num_of_lines_in_blobs(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo)
+    _set_config(exclude_exts="md")
+    ids = _blob_ids(git_repo)
+    batch = [
+        ("py", ids["main.py"]),
+        ("png", ids["logo.png"]),
+        ("md", ids["README.md"]),
+        ("py", ids["utils.py"]),
+    ]
+    assert get_num_of_lines_in_blobs(batch) == [
+        ("py", ids["main.py"], 3),
+        ("png", ids["logo.png"], 0),  # binary
+        ("md", ids["README.md"], 0),  # excluded
+        ("py", ids["utils.py"], 5),
+    ]
+    assert get_num_of_lines_in_blob(("py", ids["main.py"])) == ("py", ids["main.py"], 3)
+    assert get_num_of_lines_in_blobs([]) == []
+
+
+def test_in_process_object_reader_matches_cli(git_repo, monkeypatch):
+    import subprocess
+
+    subprocess.run(["git", "gc", "--quiet"], cwd=git_repo, check=True)
+    monkeypatch.chdir(git_repo)
+    ids = _blob_ids(git_repo)
+    batch = [(name.rsplit(".", 1)[-1], blob_id) for name, blob_id in ids.items()]
+    tree = subprocess.run(
+        ["git", "rev-parse", "HEAD^{tree}"],
+        cwd=git_repo,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+
+    _set_config(object_reader="cli")
+    assert get_object_store() is None
+    expected_lines = get_num_of_lines_in_blobs(batch)
+    expected_files = get_num_of_files_from_rev(("1", tree))
+
+    _set_config(object_reader="python")
+    assert get_object_store() is not None
+    assert get_num_of_lines_in_blobs(batch) == expected_lines
+    assert get_num_of_files_from_rev(("1", tree)) == expected_files == (1, tree, len(ids))
+
+
+# ── iter_pipe_lines ──────────────────────────────────────────────────────
+
+
+def test_iter_pipe_lines_streams_records(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo)
+    lines = list(iter_pipe_lines("git log --pretty=format:%s"))
+    assert len(lines) == 5
+    assert lines[-1] == "Initial commit"
+    # a trailing separator does not yield an empty record
+    paths = list(iter_pipe_lines("git ls-tree -r -z --name-only HEAD", sep=b"\0"))
+    assert "main.py" in paths
+    assert "" not in paths
+
+
+def test_iter_pipe_lines_splits_records_across_chunks(monkeypatch):
+    import gitstats.utils
+
+    monkeypatch.setattr(gitstats.utils, "_PIPE_CHUNK_SIZE", 3)
+    assert list(iter_pipe_lines("printf 'alpha\\nbeta\\n\\ngamma'")) == [
+        "alpha",
+        "beta",
+        "",
+        "gamma",
+    ]
+
+
+def test_iter_pipe_lines_stops_command_when_closed_early(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo)
+    lines = iter_pipe_lines("git log --pretty=format:%H")
+    assert len(next(lines)) == 40
+    lines.close()  # must not hang or leave the process behind
+
+
+def test_get_num_of_files_from_rev(git_repo, monkeypatch):
+    monkeypatch.chdir(git_repo)
+    assert get_num_of_files_from_rev(("42", "HEAD")) == (42, "HEAD", len(_blob_ids(git_repo)))
+
+
 # ── get_version ──────────────────────────────────────────────────────────
 
 